@@ -0,0 +1,11 @@
+from src.benchmark.engines import ENGINES
+from src.benchmark.engines import EngineResult
+from src.benchmark.engines import pipeline
+from src.benchmark.history import append_history
+from src.benchmark.history import compare_runs
+from src.benchmark.history import load_history
+from src.benchmark.instances import FAMILIES
+from src.benchmark.instances import Instance
+from src.benchmark.instances import generate
+from src.benchmark.runner import measure
+from src.benchmark.runner import run_suite
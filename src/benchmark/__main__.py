@@ -0,0 +1,145 @@
+"""
+Замеры производительности решателей на воспроизводимых задачах.
+
+Пример:
+    python -m src.benchmark run --sizes 5 20 100 500 --history benchmark.json
+    python -m src.benchmark compare benchmark.json --threshold 0.2
+    python -m src.benchmark list
+    python -m src.benchmark imports --budget 0.5
+
+run дописывает запуск в историю (JSON), compare сравнивает последний запуск
+с предыдущим (или с запуском --baseline) и завершается с кодом 1,
+если найдены регрессии. imports замеряет время импорта ядра в новом
+процессе и завершается с кодом 1, если оно больше бюджета или ядро
+загрузило Qt, prettytable или multiprocessing (проверка для CI).
+"""
+
+import argparse
+import sys
+
+from src.benchmark.engines import ENGINES
+from src.benchmark.history import append_history
+from src.benchmark.history import compare_runs
+from src.benchmark.history import load_history
+from src.benchmark.imports import FORBIDDEN_MODULES
+from src.benchmark.imports import measure_import
+from src.benchmark.instances import DEFAULT_SIZES
+from src.benchmark.instances import FAMILIES
+from src.benchmark.runner import run_suite
+
+
+def _print_result(result: dict) -> None:
+    phases = ', '.join(f"{phase} {seconds * 1000:.2f}" for phase, seconds in result['phases'].items())
+    print(
+        f"{result['family']:>10} {result['size']:>5} #{result['seed']} {result['engine']:<16} "
+        f"{result['total'] * 1000:10.2f} мс  F = {result['cost']}{'' if result['optimal'] else ' (бюджет)'}"
+        f"  [{phases}]",
+        flush=True
+    )
+
+
+def run_command(args: argparse.Namespace) -> int:
+    results = run_suite(
+        args.families, args.sizes, args.engines, args.seeds,
+        repeat=args.repeat, time_limit=args.time_limit, report=_print_result
+    )
+    if args.history:
+        append_history(args.history, results, args.label)
+    return 0
+
+
+def compare_command(args: argparse.Namespace) -> int:
+    history = load_history(args.history)
+    if len(history) < 2:
+        print('В истории меньше двух запусков', file=sys.stderr)
+        return 2
+    baseline = history[args.baseline]
+    current = history[args.current]
+    rows = compare_runs(baseline, current, args.threshold, args.min_time)
+    regressions = 0
+    for row in rows:
+        regressions += row['regression']
+        marker = 'РЕГРЕССИЯ' if row['regression'] else ''
+        print(
+            f"{row['family']:>10} {row['size']:>5} #{row['seed']} {row['engine']:<16} "
+            f"{row['before'] * 1000:10.2f} -> {row['after'] * 1000:10.2f} мс "
+            f"x{row['ratio']:.2f} {'стоимость изменилась ' if row['cost_changed'] else ''}{marker}"
+        )
+    print(
+        f"Сравнение {baseline.get('commit')} ({baseline['timestamp']}) -> "
+        f"{current.get('commit')} ({current['timestamp']}): "
+        f"задач {len(rows)}, регрессий {regressions} (порог {args.threshold * 100:.0f}%)"
+    )
+    return 1 if regressions else 0
+
+
+def list_command(args: argparse.Namespace) -> int:
+    print('Семейства задач:')
+    for key, (name, _) in FAMILIES.items():
+        print(f"  {key:<12} {name}")
+    print('Решатели:')
+    for key, (name, _) in ENGINES.items():
+        print(f"  {key:<16} {name}")
+    return 0
+
+
+def imports_command(args: argparse.Namespace) -> int:
+    forbidden = tuple(module for module in FORBIDDEN_MODULES if module not in args.allow)
+    result = measure_import(args.module, args.repeat, forbidden)
+    over = result['median'] > args.budget
+    print(
+        f"Импорт {result['module']}: медиана {result['median'] * 1000:.1f} мс, "
+        f"минимум {result['min'] * 1000:.1f} мс (бюджет {args.budget * 1000:.0f} мс)"
+        f"{' ПРЕВЫШЕН' if over else ''}"
+    )
+    if result['loaded']:
+        print(f"Загружены лишние модули: {', '.join(result['loaded'])}")
+    return 1 if over or result['loaded'] else 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog='python -m src.benchmark',
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run = commands.add_parser('run', help='замер решателей')
+    run.add_argument('--families', nargs='+', choices=list(FAMILIES), default=list(FAMILIES))
+    run.add_argument('--sizes', nargs='+', type=int, default=list(DEFAULT_SIZES))
+    run.add_argument('--engines', nargs='+', choices=list(ENGINES), default=list(ENGINES))
+    run.add_argument('--seeds', nargs='+', type=int, default=[0])
+    run.add_argument('--repeat', type=int, default=3, help='повторов на замер (берется минимум)')
+    run.add_argument('--time-limit', type=float, default=None, help='ограничение метода потенциалов, с')
+    run.add_argument('--history', default=None, help='файл истории JSON')
+    run.add_argument('--label', default=None, help='метка запуска в истории')
+    run.set_defaults(handler=run_command)
+
+    compare = commands.add_parser('compare', help='сравнение запусков из истории')
+    compare.add_argument('history', help='файл истории JSON')
+    compare.add_argument('--baseline', type=int, default=-2, help='индекс базового запуска')
+    compare.add_argument('--current', type=int, default=-1, help='индекс сравниваемого запуска')
+    compare.add_argument('--threshold', type=float, default=0.2, help='допустимый рост времени (доля)')
+    compare.add_argument('--min-time', type=float, default=0.001, help='замеры быстрее (с) не сравниваются')
+    compare.set_defaults(handler=compare_command)
+
+    listing = commands.add_parser('list', help='семейства задач и решатели')
+    listing.set_defaults(handler=list_command)
+
+    imports = commands.add_parser('imports', help='время импорта ядра решателя (проверка для CI)')
+    imports.add_argument('--module', default='src.model.transport_solution', help='импортируемый модуль')
+    imports.add_argument('--budget', type=float, default=0.5, help='допустимое время импорта (медиана), с')
+    imports.add_argument('--repeat', type=int, default=5, help='число запусков')
+    imports.add_argument(
+        '--allow', nargs='+', choices=list(FORBIDDEN_MODULES), default=[],
+        help='модули, которые этому модулю разрешено загружать'
+    )
+    imports.set_defaults(handler=imports_command)
+
+    args = parser.parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,97 @@
+from dataclasses import dataclass, field
+from typing import Callable
+
+from src.benchmark.instances import Instance
+from src.model.transport_solution import FLOW_ENGINES
+from src.model.transport_solution import INITIAL_STRATEGIES
+from src.model.transport_solution import PRICING_RULES
+from src.model.transport_solution import SolveStats
+from src.model.transport_solution import prepare_table
+from src.model.transport_solution import solve_table
+
+
+@dataclass
+class EngineResult:
+    """
+    Результат одного запуска: время этапов (с), стоимость и число итераций
+    """
+    phases: dict[str, float] = field(default_factory=dict)
+    cost: int | float | None = None
+    pivots: int = 0
+    optimal: bool = True
+
+    @property
+    def total(self) -> float:
+        return sum(self.phases.values())
+
+
+def _measure(instance: Instance, initial: str, pricing: str, engine: str, time_limit: float | None) -> EngineResult:
+    """
+    Замер решения задачи теми же этапами, что и профиль решения (SolveStats):
+    построение таблицы, подготовка (prepare_table) и метод потенциалов (solve_table)
+
+    :param instance:
+    :param initial: ключ из INITIAL_STRATEGIES
+    :param pricing: ключ из PRICING_RULES
+    :param engine: ключ из FLOW_ENGINES
+    :param time_limit: ограничение времени метода потенциалов, с
+    :return:
+    """
+    stats = SolveStats()
+    with stats.phase('build'):
+        table = instance.table()
+    prepare_table(table, initial, stats, engine)
+    solution = solve_table(table, pricing, time_limit=time_limit, stats=stats)
+    return EngineResult(stats.phases, solution.cost, solution.pivots, solution.optimal)
+
+
+def pipeline(initial: str = 'nwc', pricing: str = 'dantzig') -> Callable[[Instance, float | None], EngineResult]:
+    """
+    Конвейер окна программы: таблица, балансировка, опорный план,
+    устранение вырожденности и метод потенциалов (NetworkSimplex)
+
+    :param initial: ключ из INITIAL_STRATEGIES
+    :param pricing: ключ из PRICING_RULES
+    :return:
+    """
+    def run(instance: Instance, time_limit: float | None = None) -> EngineResult:
+        return _measure(instance, initial, pricing, 'simplex', time_limit)
+
+    return run
+
+
+def flow_pipeline(engine: str, pricing: str = 'dantzig') -> Callable[[Instance, float | None], EngineResult]:
+    """
+    Оптимальный план другим методом (FLOW_ENGINES) с проверкой методом
+    потенциалов. Если метод не применим к задаче - опорный план СЗУ
+
+    :param engine: ключ из FLOW_ENGINES
+    :param pricing: ключ из PRICING_RULES
+    :return:
+    """
+    def run(instance: Instance, time_limit: float | None = None) -> EngineResult:
+        return _measure(instance, 'nwc', pricing, engine, time_limit)
+
+    return run
+
+
+# Решатели для сравнения: ключ -> (название, функция(instance, time_limit))
+ENGINES: dict[str, tuple[str, Callable[[Instance, float | None], EngineResult]]] = {
+    f'{initial}/{pricing}': (
+        f'{INITIAL_STRATEGIES[initial][0]}, {PRICING_RULES[pricing][0]}',
+        pipeline(initial, pricing)
+    )
+    for initial, pricing in [
+        ('nwc', 'dantzig'),
+        ('nwc', 'block'),
+        ('lcm', 'block'),
+        ('vam', 'dantzig'),
+        ('vam', 'candidates'),
+        ('russell', 'block'),
+    ]
+}
+ENGINES.update({
+    engine: (name, flow_pipeline(engine))
+    for engine, (name, _) in FLOW_ENGINES.items()
+    if engine != 'simplex'
+})
@@ -0,0 +1,106 @@
+import json
+import os
+import platform
+import subprocess
+import time
+
+import numpy as np
+
+
+def environment() -> dict:
+    """
+    Описание окружения запуска: коммит git (если доступен), версии Python и NumPy
+
+    :return:
+    """
+    try:
+        commit = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, timeout=5
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {
+        'commit': commit,
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'machine': platform.machine(),
+    }
+
+
+def load_history(path: str) -> list[dict]:
+    """
+    Записи истории замеров (пустой список, если файла нет)
+
+    :param path:
+    :return:
+    """
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding='utf-8') as file:
+        return json.load(file)
+
+
+def append_history(path: str, results: list[dict], label: str | None = None) -> dict:
+    """
+    Добавление запуска в историю
+
+    :param path:
+    :param results: записи run_suite
+    :param label: произвольная метка запуска
+    :return: добавленная запись
+    """
+    history = load_history(path)
+    entry = {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'label': label,
+        **environment(),
+        'results': results,
+    }
+    history.append(entry)
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump(history, file, ensure_ascii=False, indent=1, default=str)
+    return entry
+
+
+def _key(result: dict) -> tuple:
+    return result['family'], result['size'], result['seed'], result['engine']
+
+
+def compare_runs(baseline: dict, current: dict, threshold: float = 0.2, min_time: float = 0.001) -> list[dict]:
+    """
+    Сравнение двух запусков по общим задачам и решателям.
+
+    Регрессия - рост общего времени больше чем на threshold (доля)
+    при времени не меньше min_time (быстрые замеры слишком шумные)
+    либо отличие стоимости оптимального плана.
+
+    :param baseline: запись истории
+    :param current: запись истории
+    :param threshold:
+    :param min_time: с
+    :return: строки сравнения с полями ratio и regression
+    """
+    previous = {_key(result): result for result in baseline['results']}
+    rows = []
+    for result in current['results']:
+        before = previous.get(_key(result))
+        if before is None:
+            continue
+        ratio = result['total'] / before['total'] if before['total'] > 0 else float('inf')
+        slower = ratio > 1 + threshold and max(result['total'], before['total']) >= min_time
+        cost_changed = result['optimal'] and before['optimal'] and str(result['cost']) != str(before['cost'])
+        rows.append({
+            'family': result['family'],
+            'size': result['size'],
+            'seed': result['seed'],
+            'engine': result['engine'],
+            'before': before['total'],
+            'after': result['total'],
+            'ratio': ratio,
+            'phases': {
+                phase: (before['phases'].get(phase), seconds) for phase, seconds in result['phases'].items()
+            },
+            'cost_changed': cost_changed,
+            'regression': slower or cost_changed,
+        })
+    return rows
@@ -0,0 +1,53 @@
+import json
+import statistics
+import subprocess
+import sys
+
+# Модули, которые ядро решателя не должно загружать при импорте: Qt (окно программы),
+# prettytable (протокол) и multiprocessing (пулы процессов загружаются по требованию)
+FORBIDDEN_MODULES: tuple[str, ...] = ('PyQt6', 'prettytable', 'multiprocessing')
+
+# Замер в новом интерпретаторе: время импорта и загруженные запрещенные модули
+_SCRIPT = '''
+import json, sys, time
+started = time.perf_counter()
+__import__(sys.argv[1])
+elapsed = time.perf_counter() - started
+forbidden = sys.argv[2].split(',')
+print(json.dumps({
+    'seconds': elapsed,
+    'loaded': sorted({name.split('.')[0] for name in sys.modules if name.split('.')[0] in forbidden}),
+}))
+'''
+
+
+def measure_import(
+        module: str = 'src.model.transport_solution',
+        repeat: int = 5,
+        forbidden: tuple[str, ...] = FORBIDDEN_MODULES
+) -> dict:
+    """
+    Время импорта модуля в новом процессе Python (без уже загруженных
+    модулей; файлы .pyc при этом могут быть в кэше)
+
+    :param module: импортируемый модуль
+    :param repeat: число запусков
+    :param forbidden: модули, загрузка которых считается ошибкой
+    :return: минимум и медиана времени, с, и загруженные запрещенные модули
+    """
+    times = []
+    loaded = set()
+    for _ in range(max(repeat, 1)):
+        completed = subprocess.run(
+            [sys.executable, '-c', _SCRIPT, module, ','.join(forbidden)],
+            capture_output=True, text=True, check=True
+        )
+        result = json.loads(completed.stdout)
+        times.append(result['seconds'])
+        loaded.update(result['loaded'])
+    return {
+        'module': module,
+        'min': min(times),
+        'median': statistics.median(times),
+        'loaded': sorted(loaded),
+    }
@@ -0,0 +1,124 @@
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from src.model.transport_solution import SparseTable
+from src.model.transport_solution import Table
+
+# Размеры задач (rows = columns) по умолчанию и полный ряд
+DEFAULT_SIZES = (5, 20, 100)
+SIZES = (5, 20, 100, 500, 2000)
+
+
+@dataclass
+class Instance:
+    """
+    Сгенерированная задача. allowed - маска разрешенных маршрутов
+    (None - разрешены все)
+    """
+    family: str
+    size: int
+    seed: int
+    a: list[int]
+    b: list[int]
+    c: np.ndarray = field(repr=False)
+    allowed: np.ndarray | None = field(default=None, repr=False)
+
+    @property
+    def key(self) -> str:
+        return f"{self.family}/{self.size}/{self.seed}"
+
+    def table(self) -> Table | SparseTable:
+        """
+        Новая таблица задачи (Table или SparseTable для задач с запретами)
+
+        :return:
+        """
+        if self.allowed is None:
+            return Table(self.a, self.b, self.c)
+        indptr = np.concatenate([[0], np.cumsum(self.allowed.sum(axis=1))])
+        rows, columns = np.nonzero(self.allowed)
+        return SparseTable.from_csr(self.a, self.b, indptr, columns, self.c[rows, columns])
+
+
+def _balanced(rng: np.random.Generator, rows: int, columns: int, low: int, high: int) -> tuple[list[int], list[int]]:
+    """
+    Ресурсы и потребности с равными суммами
+    """
+    a = rng.integers(low, high, rows)
+    b = rng.integers(low, high, columns)
+    difference = a.sum() - b.sum()
+    if difference > 0:
+        b[-1] += difference
+    else:
+        a[-1] -= difference
+    return a.tolist(), b.tolist()
+
+
+def dense(size: int, rng: np.random.Generator) -> tuple:
+    a, b = _balanced(rng, size, size, 1, 100)
+    return a, b, rng.integers(0, 100, (size, size)), None
+
+
+def sparse(size: int, rng: np.random.Generator) -> tuple:
+    """
+    Около 10% разрешенных маршрутов (не меньше трех в строке)
+    и гарантированная допустимость: диагональ и соседняя с ней полоса разрешены
+    """
+    a, b = _balanced(rng, size, size, 1, 100)
+    allowed = rng.random((size, size)) < max(0.1, 3 / size)
+    index = np.arange(size)
+    allowed[index, index] = True
+    allowed[index[:-1], index[1:]] = True
+    return a, b, rng.integers(0, 100, (size, size)), allowed
+
+
+def degenerate(size: int, rng: np.random.Generator) -> tuple:
+    """
+    Одинаковые ресурсы и потребности: частичные суммы совпадают,
+    опорные планы сильно вырождены
+    """
+    value = int(rng.integers(1, 10))
+    return [value] * size, [value] * size, rng.integers(0, 100, (size, size)), None
+
+
+def unbalanced(size: int, rng: np.random.Generator) -> tuple:
+    """
+    Ресурсы втрое превышают потребности (фиктивный потребитель)
+    """
+    a = rng.integers(30, 300, size)
+    b = rng.integers(1, 100, size)
+    return a.tolist(), b.tolist(), rng.integers(0, 100, (size, size)), None
+
+
+def assignment(size: int, rng: np.random.Generator) -> tuple:
+    """
+    Задача о назначениях: все ресурсы и потребности равны 1
+    """
+    return [1] * size, [1] * size, rng.integers(0, 1000, (size, size)), None
+
+
+# Семейства задач: ключ -> (название, генератор)
+FAMILIES: dict[str, tuple[str, callable]] = {
+    'dense': ('Плотные случайные', dense),
+    'sparse': ('Разреженные (запреты маршрутов)', sparse),
+    'degenerate': ('Вырожденные', degenerate),
+    'unbalanced': ('Сильно несбалансированные', unbalanced),
+    'assignment': ('Задача о назначениях', assignment),
+}
+
+
+def generate(family: str, size: int, seed: int = 0) -> Instance:
+    """
+    Воспроизводимая задача семейства family размера size x size
+
+    :param family: ключ из FAMILIES
+    :param size:
+    :param seed:
+    :return:
+    """
+    if family not in FAMILIES:
+        raise ValueError(f'Неизвестное семейство задач: {family}')
+    rng = np.random.default_rng([seed, size, list(FAMILIES).index(family)])
+    a, b, c, allowed = FAMILIES[family][1](size, rng)
+    return Instance(family, size, seed, a, b, c, allowed)
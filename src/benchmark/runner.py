@@ -0,0 +1,74 @@
+from typing import Callable, Iterable
+
+from src.benchmark.engines import ENGINES
+from src.benchmark.engines import EngineResult
+from src.benchmark.instances import generate
+
+
+def measure(engine: str, instance, repeat: int = 3, time_limit: float | None = None) -> EngineResult:
+    """
+    Замер решателя на задаче: для каждого этапа берется минимум по повторам
+
+    :param engine: ключ из ENGINES
+    :param instance:
+    :param repeat:
+    :param time_limit: ограничение времени метода потенциалов, с
+    :return:
+    """
+    if engine not in ENGINES:
+        raise ValueError(f'Неизвестный решатель: {engine}')
+    run = ENGINES[engine][1]
+    best = None
+    for _ in range(max(repeat, 1)):
+        result = run(instance, time_limit)
+        if best is None:
+            best = result
+            continue
+        for phase, seconds in result.phases.items():
+            best.phases[phase] = min(best.phases.get(phase, seconds), seconds)
+    return best
+
+
+def run_suite(
+        families: Iterable[str],
+        sizes: Iterable[int],
+        engines: Iterable[str],
+        seeds: Iterable[int] = (0,),
+        repeat: int = 3,
+        time_limit: float | None = None,
+        report: Callable[[dict], None] | None = None
+) -> list[dict]:
+    """
+    Замер всех сочетаний семейство x размер x зерно x решатель
+
+    :param families: ключи из FAMILIES
+    :param sizes:
+    :param engines: ключи из ENGINES
+    :param seeds:
+    :param repeat:
+    :param time_limit:
+    :param report: получает каждую запись по мере готовности
+    :return: записи для истории
+    """
+    results = []
+    for family in families:
+        for size in sizes:
+            for seed in seeds:
+                instance = generate(family, size, seed)
+                for engine in engines:
+                    measured = measure(engine, instance, repeat, time_limit)
+                    result = {
+                        'family': family,
+                        'size': size,
+                        'seed': seed,
+                        'engine': engine,
+                        'phases': measured.phases,
+                        'total': measured.total,
+                        'cost': measured.cost,
+                        'pivots': measured.pivots,
+                        'optimal': measured.optimal,
+                    }
+                    results.append(result)
+                    if report is not None:
+                        report(result)
+    return results
@@ -0,0 +1,362 @@
+"""
+Пакетное решение транспортных задач из командной строки (без GUI).
+
+Задачи читаются потоком из файлов JSONL или CSV либо из stdin и
+решаются в пуле процессов. Результаты записываются в JSONL по мере
+готовности, поэтому потребление памяти не зависит от размера пакета.
+
+JSONL: одна задача в строке - {"id": ..., "a": [...], "b": [...], "c": [[...]]},
+null в матрице стоимостей - запрещенный маршрут.
+
+CSV: задачи в формате таблицы окна программы, разделенные пустой строкой:
+первая строка - пустая клетка и потребности B, далее строки "A_i, C_i1, ..., C_in".
+
+Пример: python -m src.cli problems.jsonl -o results.jsonl --workers 8 --chunksize 64
+
+Одна большая задача из файлов (матрица стоимостей .npy или двоичная
+отображается в память, план выводится ненулевыми перевозками):
+python -m src.cli --costs c.npy --supply a.txt --demand b.txt -o result.json
+"""
+
+import argparse
+import csv
+import itertools
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, as_completed, wait
+from typing import Iterable, Iterator, TextIO
+
+from src.model.transport_solution import CachedSolution
+from src.model.transport_solution import FLOW_ENGINES
+from src.model.transport_solution import INITIAL_STRATEGIES
+from src.model.transport_solution import PRICING_RULES
+from src.model.transport_solution import SolutionCache
+from src.model.transport_solution import SolveStats
+from src.model.transport_solution import load_vector
+from src.model.transport_solution import normalize_input_table
+from src.model.transport_solution import solve
+from src.model.transport_solution import solve_decomposed
+from src.model.transport_solution import solve_mapped
+
+
+def read_jsonl(stream: TextIO) -> Iterator[dict]:
+    for number, line in enumerate(stream):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            problem = json.loads(line)
+            if not isinstance(problem, dict):
+                raise ValueError('Ожидается объект JSON')
+        except ValueError as error:
+            # некорректная строка не прерывает пакет: ошибка попадает в результаты
+            yield {'id': number, 'error': f'Некорректная задача: {error}'}
+            continue
+        problem.setdefault('id', number)
+        yield problem
+
+
+def read_csv(stream: TextIO) -> Iterator[dict]:
+    rows = []
+    number = 0
+    for row in itertools.chain(csv.reader(stream), [[]]):
+        if any(cell.strip() for cell in row):
+            rows.append([cell.strip() or None for cell in row])
+            continue
+        if rows:
+            yield {'id': number, 'table': rows}
+            number += 1
+            rows = []
+
+
+def read_problems(paths: list[str], input_format: str | None) -> Iterator[dict]:
+    """
+    Поток задач из файлов (или stdin для "-")
+
+    :param paths:
+    :param input_format: jsonl, csv или None (по расширению файла)
+    :return:
+    """
+    for path in paths:
+        file_format = input_format or ('csv' if path.endswith('.csv') else 'jsonl')
+        reader = read_csv if file_format == 'csv' else read_jsonl
+        if path == '-':
+            yield from reader(sys.stdin)
+            continue
+        with open(path, newline='', encoding='utf-8') as stream:
+            for problem in reader(stream):
+                if len(paths) > 1:
+                    problem['id'] = f"{os.path.basename(path)}:{problem['id']}"
+                yield problem
+
+
+def parse_problem(problem: dict, exact: bool = False) -> tuple[list, list, list[list]]:
+    """
+    Ресурсы, потребности и стоимости задачи.
+    Значения разбираются так же, как ввод в окне программы.
+
+    :param problem:
+    :param exact: без округления дробей (точный режим)
+    :return:
+    """
+    if 'table' in problem:
+        width = max(len(row) for row in problem['table'])
+        table = normalize_input_table([row + [None] * (width - len(row)) for row in problem['table']], exact)
+    else:
+        table = normalize_input_table(
+            [[None, *problem['b']]] + [[a, *row] for a, row in zip(problem['a'], problem['c'])], exact
+        )
+    a = [row[0] for row in table[1:]]
+    b = table[0][1:]
+    c = [row[1:] for row in table[1:]]
+    if None in a or None in b:
+        raise ValueError('Ресурсы и потребности должны быть числами')
+    return a, b, c
+
+
+# Кэши решений процесса по каталогу хранения
+_caches: dict[str, SolutionCache] = {}
+
+
+def get_cache(path: str) -> SolutionCache:
+    if path not in _caches:
+        _caches[path] = SolutionCache(path=path)
+    return _caches[path]
+
+
+def solve_problem(problem: dict, options: dict) -> dict:
+    options = dict(options)
+    stats = SolveStats(memory=True) if options.pop('profile', False) else None
+    cache_path = options.pop('cache', None)
+    cache = get_cache(cache_path) if cache_path else None
+    decompose = options.pop('decompose', False)
+    if 'error' in problem:
+        return {'id': problem['id'], 'error': problem['error']}
+    try:
+        a, b, c = parse_problem(problem, options.get('exact', False))
+        cached = cache.get(a, b, c) if cache is not None else None
+        if cached is not None:
+            return {
+                'id': problem['id'],
+                'cost': cached.cost,
+                'optimal': True,
+                'feasible': True,
+                'pivots': 0,
+                'lower_bound': cached.cost,
+                'gap': 0,
+                'plan': [[amount or 0 for amount in row[1:][:len(b)]] for row in cached.matrix[1:][:len(a)]],
+                # решение не выполнялось: метод неизвестен
+                'engine': None,
+                'cached': True,
+            }
+        if decompose:
+            solution = solve_decomposed(a, b, c, **options)
+        else:
+            solution = solve(a, b, c, stats=stats, **options)
+    except Exception as error:
+        return {'id': problem['id'], 'error': str(error)}
+
+    if decompose:
+        return {
+            'id': problem['id'],
+            'cost': solution.cost,
+            'optimal': solution.optimal,
+            'feasible': solution.feasible,
+            'pivots': solution.pivots,
+            'lower_bound': solution.lower_bound,
+            'gap': solution.gap,
+            'plan': solution.plan(len(a), len(b)),
+            'engine': None,
+            'cached': False,
+            'components': solution.components,
+        }
+
+    if cache is not None and solution.optimal and solution.feasible:
+        cache.put(a, b, c, CachedSolution(solution.cost, solution.matrix, *solution.potentials))
+
+    result = {
+        'id': problem['id'],
+        'cost': solution.cost,
+        'optimal': solution.optimal,
+        'feasible': solution.feasible,
+        'pivots': solution.pivots,
+        'lower_bound': solution.lower_bound,
+        'gap': solution.gap,
+        'plan': solution.plan(len(a), len(b)),
+        'engine': solution.engine,
+        'cached': False,
+    }
+    if stats is not None:
+        result['stats'] = stats.as_dict()
+    return result
+
+
+def solve_chunk(chunk: list[dict], options: dict) -> list[dict]:
+    return [solve_problem(problem, options) for problem in chunk]
+
+
+def chunked(problems: Iterable[dict], size: int) -> Iterator[list[dict]]:
+    iterator = iter(problems)
+    while chunk := list(itertools.islice(iterator, size)):
+        yield chunk
+
+
+def solve_stream(
+        problems: Iterable[dict],
+        options: dict,
+        workers: int,
+        chunksize: int
+) -> Iterator[dict]:
+    """
+    Решение потока задач в пуле процессов.
+    Одновременно в работе не более 4 * workers пачек, результаты
+    возвращаются по мере готовности (не в порядке ввода).
+
+    :param problems:
+    :param options: параметры solve()
+    :param workers: количество процессов (1 - без пула)
+    :param chunksize: количество задач в пачке
+    :return:
+    """
+    if workers <= 1:
+        for problem in problems:
+            yield solve_problem(problem, options)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = set()
+        for chunk in chunked(problems, chunksize):
+            pending.add(executor.submit(solve_chunk, chunk, options))
+            if len(pending) >= 4 * workers:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield from future.result()
+        for future in as_completed(pending):
+            yield from future.result()
+
+
+def solve_files(costs: str, supply: str, demand: str, dtype: str | None, options: dict) -> dict:
+    """
+    Решение одной задачи из файлов (см. solve_mapped)
+
+    :param costs: файл стоимостей .npy или двоичный
+    :param supply: файл ресурсов
+    :param demand: файл потребностей
+    :param dtype: тип двоичных файлов
+    :param options: параметры решения
+    :return: результат с планом в виде ненулевых перевозок
+    """
+    stats = SolveStats(memory=True) if options.get('profile') else None
+    try:
+        rows, columns = len(load_vector(supply, dtype)), len(load_vector(demand, dtype))
+        solution = solve_mapped(
+            costs, supply, demand, dtype=dtype, pricing=options['pricing'],
+            max_pivots=options['max_pivots'], time_limit=options['time_limit'], stats=stats
+        )
+    except Exception as error:
+        return {'id': costs, 'error': str(error)}
+
+    result = {
+        'id': costs,
+        'cost': solution.cost,
+        'optimal': solution.optimal,
+        'feasible': solution.feasible,
+        'pivots': solution.pivots,
+        'lower_bound': solution.lower_bound,
+        'gap': solution.gap,
+        'shipments': solution.shipments(rows, columns),
+    }
+    if stats is not None:
+        result['stats'] = stats.as_dict()
+    return result
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description='Пакетное решение транспортных задач')
+    parser.add_argument('inputs', nargs='*', default=['-'], help='файлы JSONL/CSV ("-" - stdin)')
+    parser.add_argument('-o', '--output', default='-', help='файл результатов JSONL ("-" - stdout)')
+    parser.add_argument('-f', '--format', choices=['jsonl', 'csv'], help='формат ввода')
+    parser.add_argument('-w', '--workers', type=int, default=os.cpu_count() or 1, help='количество процессов')
+    parser.add_argument('-c', '--chunksize', type=int, default=16, help='задач в одной пачке')
+    parser.add_argument('--initial', choices=list(INITIAL_STRATEGIES), default='nwc', help='метод опорного плана')
+    parser.add_argument(
+        '--pricing', choices=list(PRICING_RULES),
+        help='правило выбора клетки (по умолчанию dantzig, для --costs - block)'
+    )
+    parser.add_argument(
+        '--engine', choices=[*FLOW_ENGINES, 'auto'], default='simplex',
+        help='метод оптимального плана (auto - по размеру задачи)'
+    )
+    parser.add_argument('--max-pivots', type=int, help='ограничение числа итераций')
+    parser.add_argument('--time-limit', type=float, help='ограничение времени на задачу, с')
+    parser.add_argument('--exact', action='store_true', help='точный режим: дроби без округления')
+    parser.add_argument('--cache', help='каталог кэша решений (общий для процессов и запусков)')
+    parser.add_argument('--profile', action='store_true', help='статистика решения: время этапов, итерации, память')
+    parser.add_argument(
+        '--decompose', action='store_true',
+        help='решать независимые части задачи (связные компоненты маршрутов) по отдельности'
+    )
+    parser.add_argument('--costs', help='файл стоимостей одной задачи (.npy или двоичный, отображается в память)')
+    parser.add_argument('--supply', help='файл ресурсов для --costs (.npy, .txt, .csv или двоичный)')
+    parser.add_argument('--demand', help='файл потребностей для --costs')
+    parser.add_argument('--dtype', help='тип двоичных файлов для --costs (например, int32, float64)')
+    args = parser.parse_args(argv)
+
+    if args.costs is not None:
+        if args.supply is None or args.demand is None:
+            parser.error('для --costs нужны --supply и --demand')
+        options = {
+            'pricing': args.pricing or 'block',
+            'max_pivots': args.max_pivots,
+            'time_limit': args.time_limit,
+            'profile': args.profile,
+        }
+        result = solve_files(args.costs, args.supply, args.demand, args.dtype, options)
+        output = sys.stdout if args.output == '-' else open(args.output, 'w', encoding='utf-8')
+        try:
+            output.write(json.dumps(result, ensure_ascii=False, default=str) + '\n')
+        finally:
+            if output is not sys.stdout:
+                output.close()
+        return 1 if 'error' in result else 0
+
+    options = {
+        'initial': args.initial,
+        'pricing': args.pricing or 'dantzig',
+        'engine': args.engine,
+        'max_pivots': args.max_pivots,
+        'time_limit': args.time_limit,
+        'exact': args.exact,
+        'profile': args.profile,
+        'cache': args.cache,
+        'decompose': args.decompose,
+    }
+    problems = read_problems(args.inputs, args.format)
+    output = sys.stdout if args.output == '-' else open(args.output, 'w', encoding='utf-8')
+
+    started = time.perf_counter()
+    solved = failed = 0
+    try:
+        for result in solve_stream(problems, options, args.workers, max(args.chunksize, 1)):
+            # Дроби точного режима (Fraction) записываются строкой "p/q"
+            output.write(json.dumps(result, ensure_ascii=False, default=str) + '\n')
+            output.flush()
+            solved += 1
+            failed += 'error' in result
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+    elapsed = time.perf_counter() - started
+    print(
+        f'Решено задач: {solved} (с ошибкой: {failed}) за {elapsed:.2f} с, '
+        f'{solved / elapsed if elapsed else 0:.1f} задач/с',
+        file=sys.stderr
+    )
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,124 @@
+"""
+Клиент сервера решения (src.server) без зависимостей от ядра решателя:
+импортирует только стандартную библиотеку и запускается быстро.
+
+    with SolveClient('unix:/tmp/transport.sock') as client:
+        result = client.solve([10, 20], [15, 15], [[1, 2], [3, 1]])
+        for result in client.solve_many(problems):
+            ...
+        print(client.stats()['latency_ms'])
+"""
+
+import itertools
+import json
+import socket
+from typing import Iterable, Iterator
+
+
+class SolveClient:
+    """
+    Синхронный клиент: одно соединение, задачи передаются
+    без ожидания ответов (конвейером), ответы сопоставляются по id
+    """
+
+    def __init__(self, address: str = '127.0.0.1:8765', timeout: float | None = None):
+        """
+        :param address: "unix:/path/to.sock" или "host:port"
+        :param timeout: ограничение ожидания ответа, с (None - без ограничения)
+        """
+        if address.startswith('unix:'):
+            self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self._socket.connect(address[len('unix:'):])
+        else:
+            host, _, port = address.rpartition(':')
+            self._socket = socket.create_connection((host or '127.0.0.1', int(port)))
+        self._socket.settimeout(timeout)
+        self._reader = self._socket.makefile('r', encoding='utf-8', newline='\n')
+        self._ids = itertools.count()
+        # ответы, пришедшие раньше ожидаемого
+        self._early: dict = {}
+
+    def _send(self, message: dict) -> None:
+        self._socket.sendall((json.dumps(message, ensure_ascii=False) + '\n').encode('utf-8'))
+
+    def _receive(self) -> dict:
+        line = self._reader.readline()
+        if not line:
+            raise ConnectionError('Сервер закрыл соединение')
+        return json.loads(line)
+
+    def _wait(self, request_id) -> dict:
+        while request_id not in self._early:
+            message = self._receive()
+            self._early[message.get('id')] = message
+        return self._early.pop(request_id)
+
+    def solve(
+            self,
+            a: list[int | float],
+            b: list[int | float],
+            c: list[list[int | float | None]]
+    ) -> dict:
+        """
+        Решение одной задачи
+
+        :param a: ресурсы
+        :param b: потребности
+        :param c: стоимости (None - запрещенный маршрут)
+        :return: результат (см. src.cli.solve_problem); при ошибке - поле error
+        """
+        request_id = f'c{next(self._ids)}'
+        self._send({'id': request_id, 'a': a, 'b': b, 'c': c})
+        return self._wait(request_id)
+
+    def solve_many(self, problems: Iterable[dict], window: int = 64) -> Iterator[dict]:
+        """
+        Решение потока задач {"id", "a", "b", "c"}: до window задач
+        передаются без ожидания ответов. Результаты - по мере готовности
+
+        :param problems:
+        :param window: наибольшее число задач без ответа
+        :return:
+        """
+        waiting = set()
+        for problem in problems:
+            problem = dict(problem)
+            problem.setdefault('id', f'c{next(self._ids)}')
+            self._send(problem)
+            waiting.add(problem['id'])
+            while len(waiting) >= window:
+                yield self._take(waiting)
+        while waiting:
+            yield self._take(waiting)
+
+    def _take(self, waiting: set) -> dict:
+        for request_id in list(waiting):
+            if request_id in self._early:
+                waiting.discard(request_id)
+                return self._early.pop(request_id)
+        while True:
+            message = self._receive()
+            if message.get('id') in waiting:
+                waiting.discard(message['id'])
+                return message
+            self._early[message.get('id')] = message
+
+    def stats(self) -> dict:
+        """
+        Статистика сервера: решенные задачи, пачки, очередь, процентили задержки (мс)
+
+        :return:
+        """
+        request_id = f'c{next(self._ids)}'
+        self._send({'op': 'stats', 'id': request_id})
+        return self._wait(request_id)['stats']
+
+    def close(self) -> None:
+        self._reader.close()
+        self._socket.close()
+
+    def __enter__(self) -> 'SolveClient':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
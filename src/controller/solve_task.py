@@ -0,0 +1,47 @@
+import threading
+
+from PyQt6.QtCore import QObject, QRunnable, pyqtSignal
+
+from src.model.transport_solution import SolveJob
+
+
+class SolveSignals(QObject):
+    """
+    Сигналы фонового решения: номер поколения и данные.
+    Создаются в главном потоке, поэтому слоты вызываются в нем же.
+    """
+    progress = pyqtSignal(int, int)
+    finished = pyqtSignal(int, object)
+
+
+class SolveTask(QRunnable):
+    """
+    Выполнение SolveJob в пуле потоков.
+
+    Отмена кооперативная: флаг проверяется перед каждой итерацией
+    метода потенциалов, отмененное задание результат не отправляет.
+    """
+
+    def __init__(self, job: SolveJob, generation: int):
+        super().__init__()
+        self.signals = SolveSignals()
+        self._job = job
+        self._generation = generation
+        self._cancelled = threading.Event()
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def cancel(self):
+        self._cancelled.set()
+
+    def run(self):
+        if self._cancelled.is_set():
+            return
+        result = self._job.run(
+            cancelled=self._cancelled.is_set,
+            progress=lambda pivots: self.signals.progress.emit(self._generation, pivots),
+        )
+        if result is not None and not self._cancelled.is_set():
+            self.signals.finished.emit(self._generation, result)
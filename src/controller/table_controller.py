@@ -1,5 +1,8 @@
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import QThreadPool, QTimer
 
+from src.controller.solve_task import SolveTask
+from src.model.transport_solution import SolveJob
+from src.model.transport_solution import SolveResult
 from src.view import TransportSolutionView
 
 
@@ -7,37 +10,113 @@ class TableController():
     """
     Класс TableController представляет реализацию контроллера.
     Согласовывает работу представления с моделью.
+
+    Задача решается в фоновом потоке. Правки таблицы копятся, пока
+    пользователь не сделает паузу (debounce_interval), и решаются одним
+    заданием; незавершенное решение при новой правке отменяется.
     """
 
+    # Пауза после последней правки перед решением, мс
+    debounce_interval = 300
+
     def __init__(self, model):
         self.model = model
+
+        self._generation = 0
+        self._task: SolveTask | None = None
+        self._pool = QThreadPool()
+        self._pool.setMaxThreadCount(1)
+        self._debounce = QTimer()
+        self._debounce.setSingleShot(True)
+        self._debounce.setInterval(self.debounce_interval)
+        self._debounce.timeout.connect(self.input_table)
+        self.model.scheduler = self.schedule_solve
+
         self.view = TransportSolutionView(self, self.model)
 
         self.view.show()
 
+    def table_edited(self):
+        """
+        Правка клетки: текущее решение устарело, новое - после паузы
+        """
+        self._cancel_solve()
+        self._debounce.start()
+
     def input_table(self):
-        model = self.view.ui.inputTable.model()
-        table_data = []
-        for row in range(model.rowCount()):
-            row_data = []
-            for column in range(model.columnCount()):
-                index = model.index(row, column)
-                value = model.data(index, Qt.ItemDataRole.DisplayRole)
-                row_data.append(value)
-            table_data.append(row_data)
-        self.model.input_table = table_data
+        self.model.input_table = self.view.input_model.table()
+
+    def flush_edits(self):
+        """
+        Немедленная передача в модель правок, ожидающих паузы
+        """
+        if self._debounce.isActive():
+            self._debounce.stop()
+            self.input_table()
 
     def resize_table(self):
-        model = self.view.ui.inputTable.model()
+        self.flush_edits()
 
         width = self.view.ui.tableWidth.value() + 1
         height = self.view.ui.tableHeight.value() + 1
 
         if self.model.height != height:
             self.model.height = height
-            model.setRowCount(height)
 
         if self.model.width != width:
             self.model.width = width
-            model.setColumnCount(width)
 
+    def change_initial_strategy(self):
+        self.flush_edits()
+        self.model.initial_strategy = self.view.ui.initialStrategy.currentData()
+
+    def change_pricing_rule(self):
+        self.flush_edits()
+        self.model.pricing_rule = self.view.ui.pricingRule.currentData()
+
+    def change_trace_level(self):
+        self.flush_edits()
+        self.model.trace_level = self.view.ui.traceLevel.currentData()
+
+    def change_profile(self):
+        self.flush_edits()
+        self.model.profile = self.view.ui.profileSolve.isChecked()
+
+    def change_exact(self):
+        self.flush_edits()
+        self.model.exact = self.view.ui.exactSolve.isChecked()
+
+    def change_sensitivity(self):
+        self.flush_edits()
+        self.model.sensitivity_enabled = self.view.ui.sensitivitySolve.isChecked()
+
+    def schedule_solve(self, job: SolveJob):
+        """
+        Запуск решения в фоновом потоке (TransportSolutionModel.scheduler)
+
+        :param job:
+        :return:
+        """
+        self._cancel_solve()
+        self._task = SolveTask(job, self._generation)
+        self._task.signals.progress.connect(self.solve_progress)
+        self._task.signals.finished.connect(self.solve_finished)
+        self.view.solve_started()
+        self._pool.start(self._task)
+
+    def solve_progress(self, generation: int, pivots: int):
+        if generation == self._generation:
+            self.view.solve_progress(pivots)
+
+    def solve_finished(self, generation: int, result: SolveResult):
+        if generation != self._generation:
+            return
+        self._task = None
+        self.model.apply_result(result)
+        self.view.solve_finished()
+
+    def _cancel_solve(self):
+        self._generation += 1
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
@@ -10,6 +10,8 @@ def main():
     app = QApplication(sys.argv)
 
     model = TransportSolutionModel()
+    # в интерфейсе дроби по умолчанию не округляются (см. TransportSolutionModel.exact)
+    model.exact = True
     controller = TableController(model)
 
     app.exec()
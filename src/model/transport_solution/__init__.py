@@ -1,18 +1,90 @@
 import copy
-
+import importlib
+from typing import Callable
+
+from src.model.transport_solution.batch import BatchSolution
+from src.model.transport_solution.batch import solve_batch
+from src.model.transport_solution.cache import CachedSolution
+from src.model.transport_solution.cache import SolutionCache
+from src.model.transport_solution.cache import problem_key
+from src.model.transport_solution.comparison import compare_initial_strategies
+from src.model.transport_solution.comparison import compare_pricing_rules
+from src.model.transport_solution.exact import from_fraction
+from src.model.transport_solution.exact import scale_problem
+from src.model.transport_solution.exact import to_fraction
+from src.model.transport_solution.flow import FLOW_ENGINES
+from src.model.transport_solution.flow import cost_scaling
+from src.model.transport_solution.flow import get_flow_engine
+from src.model.transport_solution.flow import select_engine
+from src.model.transport_solution.flow import successive_shortest_paths
+from src.model.transport_solution.initial import INITIAL_STRATEGIES
+from src.model.transport_solution.initial import get_initial_strategy
+from src.model.transport_solution.job import SolveJob
+from src.model.transport_solution.job import SolveResult
+from src.model.transport_solution.mapped import MappedTable
+from src.model.transport_solution.mapped import load_costs
+from src.model.transport_solution.mapped import load_table
+from src.model.transport_solution.mapped import load_vector
 from src.model.transport_solution.nwc import north_west_corner
 from src.model.transport_solution.pm import potential_method
+from src.model.transport_solution.pricing import PRICING_RULES
+from src.model.transport_solution.pricing import get_pricing_rule
+from src.model.transport_solution.sensitivity import CostRange
+from src.model.transport_solution.sensitivity import RhsRange
+from src.model.transport_solution.sensitivity import Sensitivity
+from src.model.transport_solution.sensitivity import analyze_sensitivity
+from src.model.transport_solution.sensitivity import cost_ranges
+from src.model.transport_solution.sensitivity import rhs_range
+from src.model.transport_solution.simplex import NetworkSimplex
+from src.model.transport_solution.solver import Solution
+from src.model.transport_solution.solver import initial_plan
+from src.model.transport_solution.solver import make_table
+from src.model.transport_solution.solver import prepare_table
+from src.model.transport_solution.solver import solve
+from src.model.transport_solution.solver import solve_mapped
+from src.model.transport_solution.solver import solve_table
+from src.model.transport_solution.sparse import SparseTable
+from src.model.transport_solution.stats import PHASES
+from src.model.transport_solution.stats import SolveStats
+from src.model.transport_solution.stats import measure
 
 from src.model.transport_solution.table import Table
+from src.model.transport_solution.trace import TRACE_LEVELS
+from src.model.transport_solution.trace import Trace
+from src.model.transport_solution.trace import get_trace_level
 from src.model.transport_solution.utils import is_balanced
 from src.model.transport_solution.utils import balance_table
 from src.model.transport_solution.utils import calculate_minimal_cost
 from src.model.transport_solution.utils import is_degenerate
 from src.model.transport_solution.utils import remove_degenerate
 from src.model.transport_solution.utils import table_to_html
-
-from model.transport_solution.translators import from_fraction_to_float
-from model.transport_solution.validators import is_fractional, is_float
+from src.model.transport_solution.warm import dual_simplex
+from src.model.transport_solution.warm import warm_start
+
+from src.model.transport_solution.translators import from_fraction_to_float
+from src.model.transport_solution.validators import is_fractional, is_float
+
+# Части ядра, которым нужен multiprocessing (пулы процессов, разделяемая память),
+# загружаются при первом обращении, чтобы импорт пакета оставался быстрым:
+# имя -> модуль пакета
+_LAZY_EXPORTS: dict[str, str] = {
+    'Component': 'decompose',
+    'DecomposedSolution': 'decompose',
+    'find_components': 'decompose',
+    'solve_decomposed': 'decompose',
+    'Scenario': 'sweep',
+    'ScenarioResult': 'sweep',
+    'ScenarioSweep': 'sweep',
+    'SweepSummary': 'sweep',
+}
+
+
+def __getattr__(name: str):
+    if name not in _LAZY_EXPORTS:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    value = getattr(importlib.import_module(f'{__name__}.{_LAZY_EXPORTS[name]}'), name)
+    globals()[name] = value
+    return value
 
 
 class TransportSolutionModel:
@@ -37,7 +109,29 @@ class TransportSolutionModel:
 
         self._input_table: list[list[int | None]] = [[None]]
         self._solution: list[list[int | None]] = [[None]]
-        self._console_output: str = ''
+        self._trace: Trace = Trace('off')
+        self._trace_level: str = 'full'
+        # бюджет оптимизации: время, с, и число итераций (None - без ограничения)
+        self._time_limit: float | None = 10.0
+        self._max_pivots: int | None = None
+        # точный режим: дробные данные решаются в целых числах без округления
+        # (по умолчанию выключен, включается интерфейсом или --exact)
+        self._exact: bool = False
+        # сбор статистики решения (SolveStats) и ее вывод в протокол
+        self._profile: bool = False
+        self._stats: SolveStats | None = None
+        # анализ чувствительности оптимального плана (Sensitivity)
+        self._sensitivity_enabled: bool = False
+        self._sensitivity: Sensitivity | None = None
+        self._initial_strategy: str = 'nwc'
+        self._pricing_rule: str = 'dantzig'
+        # метод получения оптимального плана (FLOW_ENGINES или 'auto')
+        self._engine: str = 'auto'
+        # последняя решенная таблица для теплого старта после правки ввода
+        self._warm_table: Table | SparseTable | None = None
+        self._scheduler: Callable[[SolveJob], None] | None = None
+        # оптимальные решения уже решенных задач (в памяти, см. SolutionCache)
+        self._cache: SolutionCache | None = SolutionCache()
 
         # список наблюдателей
         self._mObservers = []
@@ -70,73 +164,274 @@ class TransportSolutionModel:
         return self._solution
 
     @property
-    def console_output(self):
+    def console_output(self) -> str:
         """
-        Выходное решение
+        Протокол решения в HTML (целиком, см. trace для вывода по частям)
+
+        :return:
+        """
+        return self._trace.render()
+
+    @property
+    def trace(self) -> Trace:
+        """
+        Протокол решения
+
+        :return:
+        """
+        return self._trace
+
+    @property
+    def trace_level(self) -> str:
+        """
+        Ключ уровня протокола решения (см. TRACE_LEVELS)
+
+        :return:
+        """
+        return self._trace_level
+
+    @trace_level.setter
+    def trace_level(self, value: str):
+        get_trace_level(value)
+        self._trace_level = value
+        self._warm_table = None
+        self.solve(refresh=True)
+
+    @property
+    def initial_strategy(self) -> str:
+        """
+        Ключ метода построения опорного плана (см. INITIAL_STRATEGIES)
+
+        :return:
+        """
+        return self._initial_strategy
+
+    @initial_strategy.setter
+    def initial_strategy(self, value: str):
+        get_initial_strategy(value)
+        self._initial_strategy = value
+        self._warm_table = None
+        self.solve(refresh=True)
+
+    @property
+    def pricing_rule(self) -> str:
+        """
+        Ключ правила выбора вводимой клетки (см. PRICING_RULES)
+
+        :return:
+        """
+        return self._pricing_rule
+
+    @pricing_rule.setter
+    def pricing_rule(self, value: str):
+        get_pricing_rule(value)
+        self._pricing_rule = value
+        self._warm_table = None
+        self.solve(refresh=True)
+
+    @property
+    def time_limit(self) -> float | None:
+        """
+        Ограничение времени оптимизации, с (None - без ограничения)
+
+        :return:
+        """
+        return self._time_limit
+
+    @time_limit.setter
+    def time_limit(self, value: float | None):
+        self._time_limit = value
+        self.solve()
+
+    @property
+    def max_pivots(self) -> int | None:
+        """
+        Ограничение числа итераций метода потенциалов (None - без ограничения)
+
+        :return:
+        """
+        return self._max_pivots
+
+    @max_pivots.setter
+    def max_pivots(self, value: int | None):
+        self._max_pivots = value
+        self.solve()
+
+    @property
+    def exact(self) -> bool:
+        """
+        Точный режим: дроби и десятичные не округляются, задача
+        решается в целых числах (см. scale_problem)
+
+        :return:
+        """
+        return self._exact
+
+    @exact.setter
+    def exact(self, value: bool):
+        self._exact = value
+        # базис предыдущего решения хранит значения в других единицах
+        self._warm_table = None
+        self.input_table = self.input_table
+
+    @property
+    def profile(self) -> bool:
+        """
+        Сбор статистики решения: время этапов, счетчики итераций, пиковая память
 
         :return:
         """
+        return self._profile
 
-        return self._console_output
+    @profile.setter
+    def profile(self, value: bool):
+        self._profile = value
+        self.solve(refresh=True)
+
+    @property
+    def sensitivity_enabled(self) -> bool:
+        """
+        Анализ чувствительности: диапазоны стоимостей, ресурсов и потребностей
+
+        :return:
+        """
+        return self._sensitivity_enabled
+
+    @sensitivity_enabled.setter
+    def sensitivity_enabled(self, value: bool):
+        self._sensitivity_enabled = value
+        self.solve(refresh=True)
+
+    @property
+    def sensitivity(self) -> Sensitivity | None:
+        """
+        Анализ чувствительности последнего решения
+        (None, если не выполнялся или план не оптимален)
+
+        :return:
+        """
+        return self._sensitivity
+
+    @property
+    def engine(self) -> str:
+        """
+        Метод получения оптимального плана: ключ FLOW_ENGINES или 'auto'
+        (выбор по размеру и плотности задачи, см. select_engine)
+
+        :return:
+        """
+        return self._engine
+
+    @engine.setter
+    def engine(self, value: str):
+        if value != 'auto':
+            get_flow_engine(value)
+        self._engine = value
+        self._warm_table = None
+        self.solve(refresh=True)
+
+    @property
+    def stats(self) -> SolveStats | None:
+        """
+        Статистика последнего решения (None, если не собиралась)
+
+        :return:
+        """
+        return self._stats
 
     @input_table.setter
     def input_table(self, value: list[list[str | None]]):
-        value = normalize_input_table(value)
+        value = normalize_input_table(value, exact=self._exact)
         self._input_table = value
 
         self._b = value[0][1:]
         self._a = []
         self._matrix = []
 
-        can_solve = True
         for el in value[1:]:
             self._a.append(el[0])
             self._matrix.append(el[1:])
-            if None in el[1:]:
-                can_solve = False
-        if None in self._b or len(self._b) == 0:
-            can_solve = False
-        if None in self._a or len(self._a) == 0:
-            can_solve = False
-
-        if not can_solve:
-            self._solution = []
-            for i in range(self._height):
-                self._solution.append([None for _ in range(self._width)])
-
-        if can_solve:
-            table = Table(self._a, self._b, self._matrix)
-            console_output = []
-            if not is_balanced(table):
-                balance_table(table)
-                console_output.append(f"Таблица не сбалансирована (Открытая задача), произведена балансировка<br/>")
-            north_west_corner(table)
-
-            console_output.append(f"Расчет стоимости опорного плана:<br/>")
-            console_output.append(f" > F = {calculate_minimal_cost(table)}<br/>")
-
-            if is_degenerate(table):
-                console_output.append("Таблица вырождена<br/>Добавляем нулевые элементы")
-                remove_degenerate(table)
-                console_output.append(f'{table_to_html(table, item=lambda t, r, c: t.items[r][c].amount)}<br/>')
-            else:
-                console_output.append(f"Таблица не вырождена<br/>")
-
-            new_table = copy.deepcopy(table)
-            count = 1
-            while potential_method(new_table):
-                remove_degenerate(new_table)
-                console_output.append(f"<br/> Оптимизация плана методом потенциалов Шаг {count}:")
-                console_output.append(f"{table_to_html(new_table, item=lambda t, r, c: t.items[r][c].amount)}")
-                console_output.append(f" > Fmin = {int(calculate_minimal_cost(new_table))}<br/>")
-                count += 1
-                if count > 20:
-                    console_output.append(f" > Превышено количество итераций<br/>")
-                    break
-
-            self._solution = table.as_matrix()
-            self._console_output = '<br/>'.join(console_output)
 
+        self.solve()
+
+    @property
+    def scheduler(self) -> Callable[[SolveJob], None] | None:
+        """
+        Функция, которой передается задание на решение (например, для
+        выполнения в фоновом потоке). Результат задания передается в apply_result.
+        None - решать сразу, в вызывающем потоке.
+
+        :return:
+        """
+        return self._scheduler
+
+    @scheduler.setter
+    def scheduler(self, value: Callable[[SolveJob], None] | None):
+        self._scheduler = value
+
+    @property
+    def cache(self) -> SolutionCache | None:
+        """
+        Кэш решений (None - без кэша). Для хранения на диске между запусками
+        можно задать SolutionCache(path=...)
+
+        :return:
+        """
+        return self._cache
+
+    @cache.setter
+    def cache(self, value: SolutionCache | None):
+        self._cache = value
+
+    def solve_job(self, refresh: bool = False) -> SolveJob:
+        """
+        Задание на решение текущей задачи (снимок данных модели)
+
+        :param refresh: не брать решение из кэша (решить заново и обновить кэш)
+        :return:
+        """
+        return SolveJob(
+            self._a, self._b, self._matrix, self._height, self._width,
+            initial=self._initial_strategy,
+            pricing=self._pricing_rule,
+            warm_table=self._warm_table,
+            trace_level=self._trace_level,
+            time_limit=self._time_limit,
+            max_pivots=self._max_pivots,
+            exact=self._exact,
+            profile=self._profile,
+            cache=self._cache,
+            refresh=refresh,
+            engine=self._engine,
+            sensitivity=self._sensitivity_enabled,
+        )
+
+    def solve(self, refresh: bool = False):
+        """
+        Решение текущей задачи: через scheduler, если он задан, иначе сразу
+
+        :param refresh: не брать решение из кэша (например, после смены метода,
+            чтобы протокол показал ход решения)
+        """
+        if self._scheduler is not None:
+            self._scheduler(self.solve_job(refresh))
+        else:
+            self.apply_result(self.solve_job(refresh).run())
+
+    def apply_result(self, result: SolveResult):
+        """
+        Сохранение результата решения и оповещение наблюдателей
+
+        :param result:
+        :return:
+        """
+        self._solution = result.solution
+        self._stats = result.stats
+        self._sensitivity = result.sensitivity
+        if result.trace is not None:
+            self._trace = result.trace
+        if result.table is not None:
+            self._warm_table = result.table
         self.notify_observers()
 
     @width.setter
@@ -181,7 +476,17 @@ class TransportSolutionModel:
             observer.model_changed()
 
 
-def normalize_input_table(table: list[list[str | None]]) -> list[list[int | None]]:
+def normalize_input_table(table: list[list[str | None]], exact: bool = False) -> list[list[int | None]]:
+    """
+    Перевод строк таблицы в числа (None - пустая клетка или не число).
+    Без точного режима дроби и десятичные округляются до 3 знаков,
+    в точном - сохраняются без потерь (float для конечных десятичных
+    дробей, Fraction для остальных)
+
+    :param table:
+    :param exact:
+    :return:
+    """
     table = copy.deepcopy(table)
     for i in range(len(table)):
         for j in range(len(table[0])):
@@ -189,6 +494,9 @@ def normalize_input_table(table: list[list[str | None]]) -> list[list[int | None
 
             if cell.replace('-', '').isdigit():
                 table[i][j] = int(cell)
+            elif exact and (is_fractional(cell) or is_float(cell)):
+                value = to_fraction(cell)
+                table[i][j] = from_fraction(value) if value is not None else None
             elif is_fractional(cell):
                 table[i][j] = round(from_fraction_to_float(cell), 3)
             elif is_float(cell):
@@ -0,0 +1,272 @@
+import math
+import time
+from dataclasses import dataclass
+
+import numpy as np
+
+
+@dataclass
+class BatchSolution:
+    """
+    Решения пакета задач одного размера: планы k×m×n, стоимости k,
+    потенциалы k×m и k×n, признаки оптимальности и числа итераций k
+    """
+    plans: np.ndarray
+    costs: np.ndarray
+    u: np.ndarray
+    v: np.ndarray
+    optimal: np.ndarray
+    pivots: np.ndarray
+
+
+def _stack(a, b, c) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Приведение пакета к массивам NumPy общего типа (int64 или float64)
+
+    :param a: ресурсы k×m
+    :param b: потребности k×n
+    :param c: стоимости k×m×n
+    :return:
+    """
+    a, b, c = np.asarray(a), np.asarray(b), np.asarray(c)
+    if a.ndim != 2 or b.ndim != 2 or c.shape != (a.shape[0], a.shape[1], b.shape[1]) or b.shape[0] != a.shape[0]:
+        raise ValueError('Ожидаются массивы a (k×m), b (k×n) и c (k×m×n)')
+    dtype = np.result_type(a, b, c)
+    if not np.issubdtype(dtype, np.number) or np.issubdtype(dtype, np.complexfloating):
+        raise ValueError('Пакетный решатель принимает только числа')
+    dtype = np.int64 if np.issubdtype(dtype, np.integer) or dtype == np.bool_ else np.float64
+    a, b, c = a.astype(dtype), b.astype(dtype), c.astype(dtype)
+    if not np.isfinite(c).all():
+        raise ValueError('Пакетный решатель не поддерживает запрещенные маршруты')
+    if (a < 0).any() or (b < 0).any():
+        raise ValueError('Ресурсы и потребности должны быть неотрицательными')
+    return a, b, c
+
+
+def _balance(a: np.ndarray, b: np.ndarray, c: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray, bool]:
+    """
+    Балансировка пакета: фиктивный столбец, если хотя бы в одной задаче
+    ресурсов больше, и фиктивная строка, если больше потребностей.
+    Задачам без избытка достается фиктивная строка (столбец) с нулем.
+
+    Фиктивная строка ставится первой: строка с нулевым ресурсом допустима
+    только в корне сильно допустимого дерева (см. _north_west_corner)
+
+    :return: a, b, c и признак добавленной фиктивной строки
+    """
+    surplus = a.sum(axis=1) - b.sum(axis=1)
+    if (surplus > 0).any():
+        b = np.concatenate([b, np.maximum(surplus, 0)[:, None]], axis=1)
+        c = np.concatenate([c, np.zeros((*c.shape[:2], 1), dtype=c.dtype)], axis=2)
+    dummy_row = bool((surplus < 0).any())
+    if dummy_row:
+        a = np.concatenate([np.maximum(-surplus, 0)[:, None], a], axis=1)
+        c = np.concatenate([np.zeros((c.shape[0], 1, c.shape[2]), dtype=c.dtype), c], axis=1)
+    return a, b, c, dummy_row
+
+
+def _north_west_corner(a: np.ndarray, b: np.ndarray, c: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Опорный план методом северо-западного угла сразу для всего пакета.
+
+    Базис хранится деревом: узлы 0..m-1 - строки, m..m+n-1 - столбцы,
+    корень - строка 0. Клетка базиса хранится в узле-потомке: parent[x],
+    перевозка flow[x] и стоимость cost[x]. При равенстве остатков
+    выбирается следующий столбец, поэтому нулевые перевозки направлены
+    от корня (сильно допустимое дерево) и метод потенциалов не зацикливается
+
+    :return: parent, flow, cost (k×(m+n))
+    """
+    k, m, n = c.shape
+    batch = np.arange(k)
+    parent = np.zeros((k, m + n), dtype=np.int64)
+    flow = np.zeros((k, m + n), dtype=c.dtype)
+    cost = np.zeros((k, m + n), dtype=c.dtype)
+    rest_a, rest_b = a.copy(), b.copy()
+    i = np.zeros(k, dtype=np.int64)
+    j = np.zeros(k, dtype=np.int64)
+    child = np.full(k, m, dtype=np.int64)
+    for step in range(m + n - 1):
+        amount = np.minimum(rest_a[batch, i], rest_b[batch, j])
+        rest_a[batch, i] -= amount
+        rest_b[batch, j] -= amount
+        flow[batch, child] = amount
+        cost[batch, child] = c[batch, i, j]
+        if step == m + n - 2:
+            break
+
+        move_row = np.where(
+            i == m - 1, False,
+            (j == n - 1) | ((rest_a[batch, i] == 0) & (rest_b[batch, j] != 0))
+        )
+        i = np.where(move_row, i + 1, i)
+        j = np.where(move_row, j, j + 1)
+        child = np.where(move_row, i, m + j)
+        parent[batch, child] = np.where(move_row, m + j, i)
+    return parent, flow, cost
+
+
+def _potentials(parent: np.ndarray, flow_cost: np.ndarray, m: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Потенциалы и глубины узлов дерева удвоением указателей (log(m+n) шагов).
+
+    Для w = (u, -v) выполняется w[x] = w[parent] + cost[x] для строки
+    и w[x] = w[parent] - cost[x] для столбца, то есть w - сумма по пути к корню
+
+    :param parent: k×(m+n)
+    :param flow_cost: стоимости клеток дерева k×(m+n)
+    :param m: число строк
+    :return: потенциалы (u, v подряд) и глубины
+    """
+    nodes = parent.shape[1]
+    sign = np.ones(nodes, dtype=flow_cost.dtype)
+    sign[m:] = -1
+    total = flow_cost * sign
+    total[:, 0] = 0
+    depth = np.ones_like(parent)
+    depth[:, 0] = 0
+    # плоские индексы: выборка по ним быстрее take_along_axis
+    pointer = (parent + np.arange(parent.shape[0])[:, None] * nodes).ravel()
+    total, depth = total.ravel(), depth.ravel()
+    for _ in range(max(math.ceil(math.log2(nodes)), 1)):
+        total = total + total[pointer]
+        depth = depth + depth[pointer]
+        pointer = pointer[pointer]
+    return (total.reshape(parent.shape) * sign), depth.reshape(parent.shape)
+
+
+def solve_batch(
+        a,
+        b,
+        c,
+        max_pivots: int | None = None,
+        time_limit: float | None = None
+) -> BatchSolution:
+    """
+    Решение пакета транспортных задач одного размера методом потенциалов,
+    векторизованным по пакету: балансировка, опорный план (северо-западный
+    угол), потенциалы, выбор вводимой клетки (правило Данцига) и пересчет
+    плана выполняются операциями NumPy сразу для всех еще не решенных задач.
+
+    Подходит для десятков тысяч небольших задач (5×5 - 20×20), где время
+    одиночного решения уходит на накладные расходы Python.
+    Запрещенные маршруты не поддерживаются.
+
+    :param a: ресурсы k×m
+    :param b: потребности k×n
+    :param c: стоимости k×m×n
+    :param max_pivots: ограничение числа итераций каждой задачи
+    :param time_limit: ограничение времени решения пакета, с
+    :return: планы и стоимости в размерах исходных задач
+    """
+    a, b, c = _stack(a, b, c)
+    k, rows, columns = c.shape
+    a, b, c, dummy_row = _balance(a, b, c)
+    m, n = c.shape[1:]
+    nodes = m + n
+    tolerance = 0 if c.dtype == np.int64 else 1e-9 * max(float(np.abs(c).max(initial=0)), 1)
+    limit = np.iinfo(np.int64).max if c.dtype == np.int64 else np.inf
+
+    parent, flow, cost = _north_west_corner(a, b, c)
+    potentials = np.zeros((k, nodes), dtype=c.dtype)
+    optimal = np.zeros(k, dtype=bool)
+    pivots = np.zeros(k, dtype=np.int64)
+    active = np.arange(k)
+    deadline = time.perf_counter() + time_limit if time_limit is not None else None
+
+    while active.size:
+        current, depth = _potentials(parent[active], cost[active], m)
+        potentials[active] = current
+        deltas = c[active]
+        deltas -= current[:, :m, None]
+        deltas -= current[:, None, m:]
+        deltas = deltas.reshape(active.size, -1)
+        entering = np.argmin(deltas, axis=1)
+        finished = deltas[np.arange(active.size), entering] >= -tolerance
+        optimal[active[finished]] = True
+        if max_pivots is not None:
+            finished |= pivots[active] >= max_pivots
+        if deadline is not None and time.perf_counter() > deadline:
+            finished[:] = True
+        keep = ~finished
+        active, entering, depth = active[keep], entering[keep], depth[keep]
+        if not active.size:
+            break
+        pivots[active] += 1
+        batch = np.arange(active.size)
+        tree = parent[active]
+        p, q = np.divmod(entering, n)
+
+        # путь в дереве между строкой p и столбцом q: поднимается более глубокий конец
+        ends = np.stack([p, m + q])
+        edges, q_side = [], []
+        while True:
+            open_ = ends[0] != ends[1]
+            if not open_.any():
+                break
+            lift_q = depth[batch, ends[1]] > depth[batch, ends[0]]
+            node = np.where(lift_q, ends[1], ends[0])
+            edges.append(np.where(open_, node, 0))
+            q_side.append(lift_q & open_)
+            lifted = np.where(open_, tree[batch, node], node)
+            ends[0] = np.where(lift_q, ends[0], lifted)
+            ends[1] = np.where(lift_q, lifted, ends[1])
+        edges = np.stack(edges, axis=1)
+        q_side = np.stack(q_side, axis=1)
+        on_path = edges != 0
+
+        # перевозка уменьшается на клетках, пройденных против направления
+        # строка -> столбец при обходе цикла p -> q -> ... -> p
+        minus = on_path & np.where(q_side, edges >= m, edges < m)
+        amounts = flow[active[:, None], edges]
+        theta = np.where(minus, amounts, limit).min(axis=1)
+
+        # выводится последняя блокирующая клетка при обходе от вершины цикла:
+        # на стороне q - ближайшая к вершине, на стороне p - ближайшая к p
+        steps = np.arange(edges.shape[1])
+        order = np.where(q_side, edges.shape[1] + steps, edges.shape[1] - steps)
+        blocking = minus & (amounts == theta[:, None])
+        chosen = np.argmax(np.where(blocking, order, -1), axis=1)
+        leaving = edges[batch, chosen]
+        leaving_q = q_side[batch, chosen]
+
+        change = np.where(minus, -theta[:, None], np.where(on_path, theta[:, None], 0))
+        flow[active[:, None], edges] = amounts + change
+
+        # переподвешивание: путь от конца вводимой клетки до выводимой
+        # клетки разворачивается, вводимая клетка становится ребром дерева
+        node = np.where(leaving_q, m + q, p)
+        new_parent = np.where(leaving_q, p, m + q)
+        new_flow = theta
+        new_cost = c[active, p, q]
+        moving = np.ones(active.size, dtype=bool)
+        while moving.any():
+            following = parent[active, node]
+            old_flow = flow[active, node]
+            old_cost = cost[active, node]
+            parent[active, node] = np.where(moving, new_parent, following)
+            flow[active, node] = np.where(moving, new_flow, old_flow)
+            cost[active, node] = np.where(moving, new_cost, old_cost)
+            moving &= node != leaving
+            new_parent, new_flow, new_cost = node, old_flow, old_cost
+            node = np.where(moving, following, node)
+
+    # план из клеток дерева: узел-потомок и его родитель
+    child = np.arange(1, nodes)
+    upper = parent[:, 1:]
+    row = np.where(child < m, child, upper)
+    column = np.where(child < m, upper, child) - m
+    plans = np.zeros((k, m, n), dtype=c.dtype)
+    plans[np.arange(k)[:, None], row, column] = flow[:, 1:]
+
+    first = 1 if dummy_row else 0
+    plans = plans[:, first:first + rows, :columns]
+    costs = (plans * c[:, first:first + rows, :columns]).sum(axis=(1, 2))
+    return BatchSolution(
+        plans=plans,
+        costs=costs,
+        u=potentials[:, first:first + rows],
+        v=potentials[:, m:m + columns],
+        optimal=optimal,
+        pivots=pivots,
+    )
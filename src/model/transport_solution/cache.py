@@ -0,0 +1,247 @@
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from fractions import Fraction
+
+
+def _order_key(value) -> tuple:
+    """
+    Ключ сортировки значения: None (запрещенный маршрут) - после чисел
+    """
+    return (1, 0) if value is None else (0, value)
+
+
+def canonical_order(a: list, b: list, c: list[list]) -> tuple[list[int], list[int]]:
+    """
+    Порядок строк и столбцов, не зависящий от их перестановки во входных данных.
+
+    Строки сортируются по ресурсу и набору стоимостей строки, столбцы - по
+    потребности и набору стоимостей столбца; равные по этим признакам строки
+    упорядочиваются по стоимостям в порядке столбцов, и наоборот.
+    Для задач, отличающихся только перестановкой строк и столбцов, порядок
+    дает одинаковые таблицы (кроме редких случаев с полностью совпадающими
+    признаками - тогда кэш просто промахивается).
+
+    :param a: ресурсы
+    :param b: потребности
+    :param c: стоимости (None - запрещенный маршрут)
+    :return: номера строк и столбцов в каноническом порядке
+    """
+    row_keys = [(_order_key(a[i]), sorted(map(_order_key, c[i]))) for i in range(len(a))]
+    column_keys = [
+        (_order_key(b[j]), sorted(_order_key(row[j]) for row in c)) for j in range(len(b))
+    ]
+    rows = sorted(range(len(a)), key=row_keys.__getitem__)
+    columns = sorted(range(len(b)), key=column_keys.__getitem__)
+    rows = sorted(rows, key=lambda i: (row_keys[i], [_order_key(c[i][j]) for j in columns]))
+    columns = sorted(columns, key=lambda j: (column_keys[j], [_order_key(c[i][j]) for i in rows]))
+    return rows, columns
+
+
+def problem_key(a: list, b: list, c: list[list]) -> tuple[str, list[int], list[int]]:
+    """
+    Хэш задачи в каноническом порядке строк и столбцов (см. canonical_order)
+
+    :param a:
+    :param b:
+    :param c:
+    :return: хэш, порядок строк и порядок столбцов
+    """
+    rows, columns = canonical_order(a, b, c)
+    content = repr((
+        [a[i] for i in rows],
+        [b[j] for j in columns],
+        [[c[i][j] for j in columns] for i in rows],
+    ))
+    return hashlib.sha256(content.encode()).hexdigest(), rows, columns
+
+
+def _inverse(order: list[int]) -> list[int]:
+    inverse = [0] * len(order)
+    for position, index in enumerate(order):
+        inverse[index] = position
+    return inverse
+
+
+def _permute(values: list, order: list[int]) -> list:
+    """
+    Перестановка первых len(order) значений; фиктивные строки
+    и столбцы сбалансированной таблицы остаются в конце
+    """
+    return [values[index] for index in order] + values[len(order):]
+
+
+def _encode(value):
+    return {'fraction': str(value)} if isinstance(value, Fraction) else value
+
+
+def _decode(value):
+    return Fraction(value['fraction']) if isinstance(value, dict) else value
+
+
+@dataclass
+class CachedSolution:
+    """
+    Оптимальное решение из кэша в порядке строк и столбцов задачи:
+    выходная таблица (как Table.as_matrix(), с фиктивными строками
+    и столбцами), стоимость и потенциалы
+    """
+    cost: int | float | Fraction
+    matrix: list[list[int | float | Fraction | None]]
+    u: list[int | float | Fraction]
+    v: list[int | float | Fraction]
+
+
+class SolutionCache:
+    """
+    Кэш оптимальных решений по содержимому задачи (a, b, c).
+
+    Ключ не зависит от перестановки строк и столбцов: решения хранятся
+    в каноническом порядке и переставляются под порядок запроса.
+    В памяти - LRU с ограничением объема (max_bytes, по размеру
+    сериализованной записи); если задан path, записи дублируются в каталог
+    и переживают перезапуск. Потокобезопасен.
+    """
+
+    def __init__(self, max_bytes: int = 32 * 1024 * 1024, path: str | None = None):
+        """
+        :param max_bytes: ограничение объема записей в памяти
+        :param path: каталог для хранения на диске (None - только в памяти)
+        """
+        self._max_bytes = max_bytes
+        self._path = path
+        self._entries: OrderedDict[str, tuple[dict, int]] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        if path is not None:
+            os.makedirs(path, exist_ok=True)
+
+    @property
+    def path(self) -> str | None:
+        return self._path
+
+    @property
+    def size(self) -> int:
+        """
+        Объем записей в памяти
+
+        :return:
+        """
+        return self._bytes
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, a: list, b: list, c: list[list]) -> CachedSolution | None:
+        """
+        Решение задачи из кэша
+
+        :param a: ресурсы
+        :param b: потребности
+        :param c: стоимости (None - запрещенный маршрут)
+        :return: None, если решения нет
+        """
+        key, rows, columns = problem_key(a, b, c)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                entry = entry[0]
+        if entry is None:
+            entry = self._load(key)
+            if entry is not None:
+                self._remember(key, entry)
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+
+        # запись хранится в каноническом порядке: позиция в ней -> номер в задаче
+        row_order = _inverse(rows)
+        column_order = _inverse(columns)
+        matrix = [[_decode(value) for value in row] for row in entry['matrix']]
+        body = _permute([row[0:1] + _permute(row[1:], column_order) for row in matrix[1:]], row_order)
+        header = matrix[0][0:1] + _permute(matrix[0][1:], column_order)
+        return CachedSolution(
+            cost=_decode(entry['cost']),
+            matrix=[header, *body],
+            u=_permute([_decode(value) for value in entry['u']], row_order),
+            v=_permute([_decode(value) for value in entry['v']], column_order),
+        )
+
+    def put(self, a: list, b: list, c: list[list], solution: CachedSolution) -> None:
+        """
+        Сохранение оптимального решения
+
+        :param a:
+        :param b:
+        :param c:
+        :param solution: решение в порядке строк и столбцов задачи
+        :return:
+        """
+        key, rows, columns = problem_key(a, b, c)
+        matrix = solution.matrix
+        body = _permute([row[0:1] + _permute(row[1:], columns) for row in matrix[1:]], rows)
+        header = matrix[0][0:1] + _permute(matrix[0][1:], columns)
+        entry = {
+            'cost': _encode(solution.cost),
+            'matrix': [[_encode(value) for value in row] for row in [header, *body]],
+            'u': [_encode(value) for value in _permute(solution.u, rows)],
+            'v': [_encode(value) for value in _permute(solution.v, columns)],
+        }
+        self._remember(key, entry)
+        self._store(key, entry)
+
+    def clear(self) -> None:
+        """
+        Очистка кэша в памяти и на диске
+
+        :return:
+        """
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+        if self._path is not None:
+            for name in os.listdir(self._path):
+                if name.endswith('.json'):
+                    os.remove(os.path.join(self._path, name))
+
+    def _remember(self, key: str, entry: dict) -> None:
+        size = len(json.dumps(entry))
+        if size > self._max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._bytes -= self._entries.pop(key)[1]
+            self._entries[key] = (entry, size)
+            self._bytes += size
+            while self._bytes > self._max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._bytes -= evicted
+
+    def _file(self, key: str) -> str:
+        return os.path.join(self._path, f'{key}.json')
+
+    def _load(self, key: str) -> dict | None:
+        if self._path is None:
+            return None
+        try:
+            with open(self._file(key), encoding='utf-8') as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return None
+
+    def _store(self, key: str, entry: dict) -> None:
+        if self._path is None:
+            return
+        # запись через временный файл: параллельные процессы не читают половину записи
+        temporary = f'{self._file(key)}.{os.getpid()}.{threading.get_ident()}.tmp'
+        with open(temporary, 'w', encoding='utf-8') as file:
+            json.dump(entry, file)
+        os.replace(temporary, self._file(key))
@@ -0,0 +1,126 @@
+import time
+from dataclasses import dataclass
+
+from src.model.transport_solution.initial import INITIAL_STRATEGIES
+from src.model.transport_solution.initial import get_initial_strategy
+from src.model.transport_solution.pricing import PRICING_RULES
+from src.model.transport_solution.simplex import NetworkSimplex
+from src.model.transport_solution.table import Table
+from src.model.transport_solution.utils import balance_table
+from src.model.transport_solution.utils import calculate_minimal_cost
+from src.model.transport_solution.utils import remove_degenerate
+
+
+@dataclass(frozen=True)
+class StrategyReport:
+    """
+    Результат сравнения стратегий построения опорного плана
+    """
+    strategy: str
+    initial_cost: int | float
+    optimal_cost: int | float
+    iterations: int
+    initial_time: float
+    optimization_time: float
+
+    @property
+    def total_time(self) -> float:
+        return self.initial_time + self.optimization_time
+
+
+def compare_initial_strategies(
+        a: list[int],
+        b: list[int],
+        c: list[list[int]],
+        strategies: list[str] | None = None
+) -> list[StrategyReport]:
+    """
+    Решение задачи с каждой стратегией построения опорного плана:
+    стоимость опорного плана, число итераций метода потенциалов
+    и время (в секундах) построения плана и оптимизации.
+
+    :param a: ресурсы
+    :param b: потребности
+    :param c: стоимости
+    :param strategies: ключи стратегий (по умолчанию - все)
+    :return:
+    """
+    reports = []
+    for name in strategies or INITIAL_STRATEGIES:
+        strategy = get_initial_strategy(name)
+        table = Table(a, b, c)
+        balance_table(table)
+
+        started = time.perf_counter()
+        strategy(table)
+        remove_degenerate(table)
+        initial_time = time.perf_counter() - started
+        initial_cost = calculate_minimal_cost(table)
+
+        started = time.perf_counter()
+        simplex = NetworkSimplex(table)
+        simplex.run()
+        iterations = simplex.pivots
+        optimization_time = time.perf_counter() - started
+
+        reports.append(StrategyReport(
+            strategy=name,
+            initial_cost=initial_cost,
+            optimal_cost=calculate_minimal_cost(table),
+            iterations=iterations,
+            initial_time=initial_time,
+            optimization_time=optimization_time,
+        ))
+    return reports
+
+
+@dataclass(frozen=True)
+class PricingReport:
+    """
+    Результат сравнения правил выбора вводимой клетки
+    """
+    pricing: str
+    optimal_cost: int | float
+    pivots: int
+    degenerate_pivots: int
+    pivot_counts: dict[str, int]
+    time: float
+
+
+def compare_pricing_rules(
+        a: list[int],
+        b: list[int],
+        c: list[list[int]],
+        rules: list[str] | None = None,
+        initial: str = 'nwc'
+) -> list[PricingReport]:
+    """
+    Решение задачи сетевым симплекс-методом с каждым правилом
+    выбора вводимой клетки от одного и того же опорного плана
+
+    :param a: ресурсы
+    :param b: потребности
+    :param c: стоимости
+    :param rules: ключи правил (по умолчанию - все)
+    :param initial: метод построения опорного плана
+    :return:
+    """
+    table = Table(a, b, c)
+    balance_table(table)
+    get_initial_strategy(initial)(table)
+    remove_degenerate(table)
+
+    reports = []
+    for rule in rules or PRICING_RULES:
+        simplex = NetworkSimplex(table.copy(), pricing=rule)
+        started = time.perf_counter()
+        simplex.run()
+        reports.append(PricingReport(
+            pricing=rule,
+            optimal_cost=calculate_minimal_cost(simplex.table),
+            pivots=simplex.pivots,
+            degenerate_pivots=simplex.degenerate_pivots,
+            pivot_counts=dict(simplex.pivot_counts),
+            time=time.perf_counter() - started,
+        ))
+    return reports
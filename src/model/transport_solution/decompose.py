@@ -0,0 +1,205 @@
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+
+from src.model.transport_solution.dsu import DisjointSet
+from src.model.transport_solution.solver import solve
+
+
+@dataclass
+class Component:
+    """
+    Связная компонента графа разрешенных маршрутов:
+    номера ее строк и столбцов в исходной задаче
+    """
+    rows: list[int]
+    columns: list[int]
+
+    @property
+    def size(self) -> int:
+        return len(self.rows) * len(self.columns)
+
+
+@dataclass
+class DecomposedSolution:
+    """
+    Решение задачи по компонентам, собранное в одну таблицу.
+    matrix - в формате Table.as_matrix(): фиктивный столбец (строка)
+    добавляется, если избыток ресурсов (потребностей) есть хотя бы в одной компоненте
+    """
+    cost: int | float
+    lower_bound: int | float
+    optimal: bool
+    feasible: bool
+    pivots: int
+    components: int
+    elapsed: float
+    matrix: list[list[int | float | None]] = field(repr=False)
+
+    @property
+    def gap(self) -> int | float:
+        """
+        Абсолютный разрыв между стоимостью плана и нижней границей
+
+        :return:
+        """
+        return self.cost - self.lower_bound
+
+    def plan(self, rows: int | None = None, columns: int | None = None) -> list[list[int | float]]:
+        """
+        Объемы перевозок (0 для свободных клеток)
+
+        :param rows: количество строк исходной задачи (без фиктивных)
+        :param columns: количество столбцов исходной задачи
+        :return:
+        """
+        return [
+            [amount or 0 for amount in row[1:][:columns]]
+            for row in self.matrix[1:][:rows]
+        ]
+
+
+def find_components(c: list[list[int | float | None]]) -> list[Component]:
+    """
+    Связные компоненты двудольного графа строк и столбцов,
+    соединенных разрешенными маршрутами (стоимость не None).
+    Строка или столбец без маршрутов - отдельная компонента
+
+    :param c: стоимости
+    :return: компоненты по убыванию числа клеток
+    """
+    rows = len(c)
+    columns = len(c[0]) if rows else 0
+    components = DisjointSet(rows + columns)
+    for i, line in enumerate(c):
+        for j, cost in enumerate(line):
+            if cost is not None:
+                components.union(i, rows + j)
+
+    groups: dict[int, Component] = {}
+    for node in range(rows + columns):
+        group = groups.setdefault(components.find(node), Component([], []))
+        if node < rows:
+            group.rows.append(node)
+        else:
+            group.columns.append(node - rows)
+    return sorted(groups.values(), key=lambda group: group.size, reverse=True)
+
+
+def _solve_component(a: list, b: list, c: list[list], options: dict) -> dict:
+    """
+    Решение задачи одной компоненты (выполняется в процессе пула)
+
+    :return: стоимость, признаки, число итераций и план в формате as_matrix
+    """
+    solution = solve(a, b, c, **options)
+    return {
+        'cost': solution.cost,
+        'lower_bound': solution.lower_bound,
+        'optimal': solution.optimal,
+        'feasible': solution.feasible,
+        'pivots': solution.pivots,
+        'matrix': solution.matrix,
+    }
+
+
+def solve_decomposed(
+        a: list[int | float],
+        b: list[int | float],
+        c: list[list[int | float | None]],
+        workers: int = 1,
+        **options
+) -> DecomposedSolution:
+    """
+    Решение задачи с запрещенными маршрутами по связным компонентам.
+
+    Если граф разрешенных маршрутов распадается на независимые части
+    (например, по странам), каждая часть балансируется отдельно и решается
+    как самостоятельная задача - в пуле процессов, начиная с самых больших.
+    Планы и стоимости собираются обратно в одну таблицу.
+
+    Перевозки между компонентами невозможны, поэтому единая задача
+    разрешима, только если избыток во всех компонентах одного знака
+    (все с избытком ресурсов или все с избытком потребностей); иначе
+    недостаток компоненты покрывает ее фиктивный поставщик (потребитель),
+    а решение отмечается как недопустимое (feasible=False)
+
+    :param a: ресурсы
+    :param b: потребности
+    :param c: стоимости (None - запрещенный маршрут)
+    :param workers: количество процессов (1 - решение в текущем процессе)
+    :param options: параметры solve() (initial, pricing, max_pivots, time_limit, exact, engine)
+    :return:
+    """
+    started = time.perf_counter()
+    components = find_components(c)
+    rows, columns = len(a), len(b)
+
+    # избыток ресурсов компонент уходит в общий фиктивный столбец,
+    # избыток потребностей покрывает общая фиктивная строка
+    tasks = []
+    surplus = deficit = 0
+    isolated: list[tuple[int | None, int | None, int | float]] = []
+    for component in components:
+        balance = sum(a[i] for i in component.rows) - sum(b[j] for j in component.columns)
+        surplus += max(balance, 0)
+        deficit += max(-balance, 0)
+        if component.rows and component.columns:
+            tasks.append((
+                component,
+                [a[i] for i in component.rows],
+                [b[j] for j in component.columns],
+                [[c[i][j] for j in component.columns] for i in component.rows],
+            ))
+            continue
+        # строка или столбец без маршрутов целиком связаны с фиктивным узлом
+        isolated.extend((i, None, a[i]) for i in component.rows if a[i])
+        isolated.extend((None, j, b[j]) for j in component.columns if b[j])
+
+    dummy_row = rows if deficit else None
+    dummy_column = columns if surplus else None
+    resources = [*a, *([deficit] if deficit else [])]
+    matrix = [
+        [None, *b, *([surplus] if surplus else [])],
+        *[[resource, *[None] * (columns + bool(surplus))] for resource in resources],
+    ]
+    for row, column, amount in isolated:
+        row = dummy_row if row is None else row
+        column = dummy_column if column is None else column
+        matrix[row + 1][column + 1] = amount
+
+    if workers <= 1 or len(tasks) <= 1:
+        results = [(task[0], _solve_component(*task[1:], options)) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as executor:
+            futures = {executor.submit(_solve_component, *task[1:], options): task[0] for task in tasks}
+            results = [(futures[future], future.result()) for future in as_completed(futures)]
+
+    cost = lower_bound = 0
+    optimal = feasible = True
+    pivots = 0
+    for component, result in results:
+        cost += result['cost']
+        lower_bound += result['lower_bound']
+        optimal &= result['optimal']
+        feasible &= result['feasible']
+        pivots += result['pivots']
+        # фиктивные строка и столбец компоненты - последние в ее таблице
+        local_rows = [*component.rows, dummy_row]
+        local_columns = [*component.columns, dummy_column]
+        for p, line in enumerate(result['matrix'][1:]):
+            for q, amount in enumerate(line[1:]):
+                if amount is not None:
+                    matrix[local_rows[p] + 1][local_columns[q] + 1] = amount
+
+    return DecomposedSolution(
+        cost=cost,
+        lower_bound=lower_bound,
+        optimal=optimal,
+        # перевозки между компонентами невозможны: избытки разных знаков неустранимы
+        feasible=feasible and not (surplus and deficit),
+        pivots=pivots,
+        components=len(components),
+        elapsed=time.perf_counter() - started,
+        matrix=matrix,
+    )
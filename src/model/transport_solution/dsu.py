@@ -0,0 +1,31 @@
+class DisjointSet:
+    """
+    Система непересекающихся множеств (union-find)
+    со сжатием путей и объединением по размеру.
+    """
+
+    def __init__(self, size: int):
+        self._parent = list(range(size))
+        self._size = [1] * size
+
+    def find(self, node: int) -> int:
+        parent = self._parent
+        while parent[node] != node:
+            parent[node] = parent[parent[node]]
+            node = parent[node]
+        return node
+
+    def union(self, first: int, second: int) -> bool:
+        """
+        Объединение множеств
+
+        :return: False, если элементы уже были в одном множестве
+        """
+        first, second = self.find(first), self.find(second)
+        if first == second:
+            return False
+        if self._size[first] < self._size[second]:
+            first, second = second, first
+        self._parent[second] = first
+        self._size[first] += self._size[second]
+        return True
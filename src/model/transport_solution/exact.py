@@ -0,0 +1,129 @@
+import math
+from dataclasses import dataclass
+from fractions import Fraction
+
+import numpy as np
+
+# Граница значений, при которой вычисления еще помещаются в int64
+INT64_LIMIT = 2 ** 62
+
+
+def to_fraction(value) -> Fraction | None:
+    """
+    Точное рациональное значение: целые, десятичные ("2.5", "1e-3",
+    десятичная запятая) и обыкновенные дроби ("1/3")
+
+    :param value:
+    :return: None, если значение не число
+    """
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, (int, Fraction)):
+        return Fraction(value)
+    try:
+        # float переводится через строку: Fraction(0.1) != 1/10
+        return Fraction(str(value).strip().replace(',', '.'))
+    except (ValueError, ZeroDivisionError):
+        return None
+
+
+def from_fraction(value: Fraction) -> int | float | Fraction:
+    """
+    Значение для отображения: целое, десятичная дробь, если она конечна,
+    иначе обыкновенная дробь
+
+    :param value:
+    :return:
+    """
+    if value.denominator == 1:
+        return value.numerator
+    denominator = value.denominator
+    for factor in (2, 5):
+        while denominator % factor == 0:
+            denominator //= factor
+    if denominator == 1:
+        return float(value)
+    return value
+
+
+def _common_denominator(values: list[Fraction]) -> int:
+    return math.lcm(*(value.denominator for value in values)) if values else 1
+
+
+@dataclass
+class ScaledProblem:
+    """
+    Задача в целых числах: ресурсы и потребности умножены на amount_scale,
+    стоимости - на cost_scale (наименьшие общие знаменатели).
+    Стоимость плана в исходных единицах - стоимость / (amount_scale * cost_scale).
+    """
+    a: list[int]
+    b: list[int]
+    c: list[list[int | None]]
+    amount_scale: int
+    cost_scale: int
+    dtype: np.dtype
+
+    def amount(self, value: int) -> int | float | Fraction:
+        """
+        Объем в исходных единицах
+
+        :param value:
+        :return:
+        """
+        return from_fraction(Fraction(value, self.amount_scale))
+
+    def potential(self, value: int | float) -> int | float | Fraction:
+        """
+        Потенциал в исходных единицах стоимости
+
+        :param value:
+        :return:
+        """
+        if isinstance(value, float):
+            return value / self.cost_scale
+        return from_fraction(Fraction(value, self.cost_scale))
+
+    def cost(self, value: int | float) -> int | float | Fraction:
+        """
+        Стоимость в исходных единицах
+
+        :param value:
+        :return:
+        """
+        if isinstance(value, float):
+            return value / (self.amount_scale * self.cost_scale)
+        return from_fraction(Fraction(value, self.amount_scale * self.cost_scale))
+
+
+def scale_problem(a: list, b: list, c: list[list]) -> ScaledProblem:
+    """
+    Перевод задачи с дробными данными в целые числа.
+
+    Буферы int64, если стоимость любого плана, потенциалы и штраф
+    искусственных маршрутов заведомо помещаются в int64, иначе - целые
+    Python (dtype object): медленнее, но без переполнения.
+
+    :param a: ресурсы
+    :param b: потребности
+    :param c: стоимости (None - запрещенный маршрут)
+    :return:
+    """
+    a = [to_fraction(value) for value in a]
+    b = [to_fraction(value) for value in b]
+    c = [[to_fraction(cost) if cost is not None else None for cost in row] for row in c]
+    costs = [cost for row in c for cost in row if cost is not None]
+
+    amount_scale = _common_denominator(a + b)
+    cost_scale = _common_denominator(costs)
+
+    scaled_a = [int(value * amount_scale) for value in a]
+    scaled_b = [int(value * amount_scale) for value in b]
+    scaled_c = [[int(cost * cost_scale) if cost is not None else None for cost in row] for row in c]
+
+    largest = max((abs(int(cost * cost_scale)) for cost in costs), default=0) + 1
+    total = max(sum(abs(value) for value in scaled_a), sum(abs(value) for value in scaled_b), 1)
+    nodes = len(a) + len(b) + 1
+    dtype = np.dtype(np.int64) if 2 * nodes * largest * total < INT64_LIMIT else np.dtype(object)
+
+    return ScaledProblem(scaled_a, scaled_b, scaled_c, amount_scale, cost_scale, dtype)
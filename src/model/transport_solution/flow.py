@@ -0,0 +1,434 @@
+from collections import deque
+from typing import Callable
+
+import numpy as np
+
+from src.model.transport_solution.dsu import DisjointSet
+from src.model.transport_solution.sparse import SparseTable
+from src.model.transport_solution.table import Table
+from src.model.transport_solution.utils import remove_degenerate
+
+
+class _Arcs:
+    """
+    Маршруты таблицы как списки дуг двудольного графа: дуга k - клетка
+    с плоским номером k (table.amounts.reshape(-1)), с индексами дуг
+    по строкам (CSR) и по столбцам (CSC)
+    """
+
+    def __init__(self, table: Table | SparseTable):
+        self.rows = table.rows
+        self.columns = table.columns
+        if isinstance(table, SparseTable):
+            self.tails = table.arc_rows.copy()
+            self.heads = table.arc_columns.copy()
+        else:
+            self.tails = np.repeat(np.arange(self.rows), self.columns)
+            self.heads = np.tile(np.arange(self.columns), self.rows)
+        self.costs = table.costs.reshape(-1)
+
+        self.row_order = np.argsort(self.tails, kind='stable')
+        self.row_start = np.searchsorted(self.tails[self.row_order], np.arange(self.rows + 1))
+        self.column_order = np.argsort(self.heads, kind='stable')
+        self.column_start = np.searchsorted(self.heads[self.column_order], np.arange(self.columns + 1))
+
+    def of_row(self, row: int) -> np.ndarray:
+        return self.row_order[self.row_start[row]:self.row_start[row + 1]]
+
+    def of_column(self, column: int) -> np.ndarray:
+        return self.column_order[self.column_start[column]:self.column_start[column + 1]]
+
+
+def _numeric(table: Table | SparseTable) -> bool:
+    """
+    Буферы таблицы - машинные числа (не целые Python точного режима)
+    """
+    return table.costs.dtype != object and table.amounts.dtype != object
+
+
+def _integral(values: np.ndarray) -> bool:
+    return np.issubdtype(values.dtype, np.integer) or bool(np.all(values == np.round(values)))
+
+
+def successive_shortest_paths(table: Table | SparseTable) -> bool:
+    """
+    Оптимальный план методом последовательных кратчайших путей (прямо-двойственный вариант).
+
+    Потенциалы узлов поддерживают неотрицательность приведенных стоимостей,
+    поэтому расстояния от строк с остатком ресурса ищутся алгоритмом Дейкстры
+    (по массивам, до первого столбца с остатком потребности). После пересчета
+    потенциалов объем переносится по всем путям из дуг с нулевой приведенной
+    стоимостью (поиск в глубину), пока такие пути есть.
+
+    :param table: сбалансированная таблица без плана
+    :return: False, если метод неприменим (целые Python точного режима)
+        или маршрутов недостаточно для вывоза ресурсов
+    """
+    if not _numeric(table):
+        return False
+    arcs = _Arcs(table)
+    rows, columns = arcs.rows, arcs.columns
+    costs = arcs.costs.astype(np.float64)
+    supply = np.array(table.resources, dtype=table.amounts.dtype)
+    demand = np.array(table.needs, dtype=table.amounts.dtype)
+    flows = np.zeros(len(costs), dtype=table.amounts.dtype)
+    # дуги с положительным объемом по столбцам (обратные дуги остаточной сети)
+    loaded: list[set[int]] = [set() for _ in range(columns)]
+
+    # Потенциалы узлов (строки 0..rows-1, столбцы rows..): приведенная стоимость
+    # дуги c + p[i] - p[j] >= 0, для дуг с положительным объемом - 0
+    potentials = np.zeros(rows + columns)
+    column_minimum = np.full(columns, np.inf)
+    np.minimum.at(column_minimum, arcs.heads, costs)
+    potentials[rows:] = np.where(np.isinf(column_minimum), 0, column_minimum)
+    heads = arcs.heads + rows
+
+    tolerance = 0 if _integral(costs) else 1e-9 * max(float(np.abs(costs).max(initial=0)), 1)
+    while np.any(supply > tolerance):
+        distance = np.concatenate([np.where(supply > tolerance, 0.0, np.inf), np.full(columns, np.inf)])
+        keys = distance.copy()
+        settled = np.zeros(rows + columns, dtype=bool)
+        target = None
+        while True:
+            node = int(np.argmin(keys))
+            if np.isinf(keys[node]):
+                break
+            keys[node] = np.inf
+            settled[node] = True
+            if node < rows:
+                out = arcs.of_row(node)
+                reached = heads[out]
+                candidate = distance[node] + costs[out] + potentials[node] - potentials[reached]
+            else:
+                if demand[node - rows] > tolerance:
+                    target = node
+                    break
+                out = np.fromiter(loaded[node - rows], dtype=np.intp)
+                reached = arcs.tails[out]
+                candidate = distance[node] - costs[out] - potentials[reached] + potentials[node]
+            # закрытые узлы не пересматриваются: для float ошибки округления
+            # дают слегка отрицательные приведенные стоимости и бесконечный цикл
+            better = (candidate < distance[reached]) & ~settled[reached]
+            distance[reached[better]] = candidate[better]
+            keys[reached[better]] = candidate[better]
+
+        if target is None:
+            return False
+        potentials += np.minimum(distance, distance[target])
+
+        # Перенос объема по путям из дуг с нулевой приведенной стоимостью
+        reduced = costs + potentials[arcs.tails] - potentials[heads]
+        admissible: list[list[int]] = [[] for _ in range(rows)]
+        for arc in np.flatnonzero(np.abs(reduced) <= tolerance).tolist():
+            admissible[arcs.tails[arc]].append(arc)
+        dead = np.zeros(rows + columns, dtype=bool)
+        for source in np.flatnonzero(supply > tolerance).tolist():
+            while supply[source] > tolerance and not dead[source]:
+                path = _admissible_path(source, arcs, admissible, loaded, demand, flows, dead, tolerance)
+                if path is None:
+                    break
+                forward, backward, sink = path
+                theta = min(supply[source], demand[sink], *(flows[arc] for arc in backward))
+                for arc in forward:
+                    flows[arc] += theta
+                    loaded[arcs.heads[arc]].add(arc)
+                for arc in backward:
+                    flows[arc] -= theta
+                    if flows[arc] <= tolerance:
+                        loaded[arcs.heads[arc]].discard(arc)
+                supply[source] -= theta
+                demand[sink] -= theta
+
+    _set_plan(table, arcs, flows, costs + potentials[arcs.tails] - potentials[heads])
+    return True
+
+
+def _admissible_path(
+        source: int,
+        arcs: _Arcs,
+        admissible: list[list[int]],
+        loaded: list[set[int]],
+        demand: np.ndarray,
+        flows: np.ndarray,
+        dead: np.ndarray,
+        tolerance: float
+) -> tuple[list[int], list[int], int] | None:
+    """
+    Путь в глубину от строки source до столбца с остатком потребности
+    по дугам с нулевой приведенной стоимостью (прямым) и дугам
+    с положительным объемом (обратным). Узлы, из которых путь не найден,
+    помечаются в dead и больше не просматриваются.
+
+    :return: прямые дуги, обратные дуги и столбец-сток или None
+    """
+    rows = arcs.rows
+    visited = {source}
+    # стек: (узел, итератор дуг, дуга, по которой узел достигнут)
+    stack = [(source, iter(admissible[source]), -1)]
+    while stack:
+        node, candidates, _ = stack[-1]
+        following = None
+        for arc in candidates:
+            if node < rows:
+                following = rows + int(arcs.heads[arc])
+            elif flows[arc] > tolerance:
+                following = int(arcs.tails[arc])
+            else:
+                continue
+            if dead[following] or following in visited:
+                following = None
+                continue
+            break
+        if following is None:
+            dead[node] = True
+            stack.pop()
+            continue
+
+        visited.add(following)
+        if following >= rows and demand[following - rows] > tolerance:
+            forward = [entry[2] for entry in stack[1:] if entry[0] >= rows] + [arc]
+            backward = [entry[2] for entry in stack[1:] if entry[0] < rows]
+            return forward, backward, following - rows
+        arcs_of = admissible[following] if following < rows else list(loaded[following - rows])
+        stack.append((following, iter(arcs_of), arc))
+    return None
+
+
+def cost_scaling(table: Table | SparseTable, alpha: int = 4) -> bool:
+    """
+    Оптимальный план методом масштабирования стоимостей (push-relabel Голдберга).
+
+    Стоимости умножаются на число узлов + 1; на каждой фазе план
+    eps-оптимален, eps уменьшается в alpha раз до 1, что для целых
+    стоимостей дает оптимальный план. Граф двудольный, поэтому все строки
+    с избытком проталкивают и меняют цены одновременно (строки не смежны
+    друг с другом), затем так же все столбцы - операциями над матрицами NumPy.
+
+    :param table: сбалансированная таблица без плана
+    :param alpha: во сколько раз уменьшается eps на фазе
+    :return: False, если метод неприменим: дробные стоимости или объемы,
+        целые Python точного режима, таблица с запретами маршрутов,
+        стоимости, при которых расчет цен переполняет int64
+    """
+    if isinstance(table, SparseTable) or not _numeric(table):
+        return False
+    resources = np.array(table.resources)
+    needs = np.array(table.needs)
+    if not (_integral(table.costs) and _integral(resources) and _integral(needs)):
+        return False
+
+    rows, columns = table.rows, table.columns
+    scale = rows + columns + 1
+    # цены узлов и приведенные стоимости по модулю - порядка (число узлов) *
+    # наибольшая масштабированная стоимость (с запасом 8): если они не
+    # помещаются в int64, план строит метод потенциалов
+    largest = max(int(table.costs.max(initial=0)), -int(table.costs.min(initial=0)))
+    if 8 * scale * scale * largest > np.iinfo(np.int64).max:
+        return False
+    costs = table.costs.astype(np.int64) * scale
+    resources = resources.astype(np.int64)
+    needs = needs.astype(np.int64)
+    capacity = np.minimum(resources[:, None], needs[None, :])
+    flows = np.zeros((rows, columns), dtype=np.int64)
+    row_prices = np.zeros(rows, dtype=np.int64)
+    column_prices = np.zeros(columns, dtype=np.int64)
+
+    epsilon = max(int(np.abs(costs).max(initial=0)), 1)
+    while True:
+        epsilon = max(epsilon // alpha, 1)
+
+        reduced = costs + row_prices[:, None] - column_prices[None, :]
+        flows = np.where(reduced < 0, capacity, np.where(reduced > 0, 0, flows))
+        row_excess = resources - flows.sum(axis=1)
+        column_excess = flows.sum(axis=0) - needs
+
+        while True:
+            active = np.flatnonzero(row_excess > 0)
+            if len(active):
+                residual = capacity[active] - flows[active]
+                reduced = costs[active] + row_prices[active, None] - column_prices[None, :]
+                open_arcs = np.where((residual > 0) & (reduced < 0), residual, 0)
+                before = np.cumsum(open_arcs, axis=1) - open_arcs
+                pushed = np.minimum(open_arcs, np.maximum(row_excess[active, None] - before, 0))
+                flows[active] += pushed
+                row_excess[active] -= pushed.sum(axis=1)
+                column_excess += pushed.sum(axis=0)
+
+                stuck = ~open_arcs.any(axis=1)
+                if stuck.any():
+                    candidates = np.where(
+                        residual[stuck] > 0, column_prices[None, :] - costs[active[stuck]], np.iinfo(np.int64).min
+                    )
+                    row_prices[active[stuck]] = candidates.max(axis=1) - epsilon
+
+            active = np.flatnonzero(column_excess > 0)
+            if len(active):
+                residual = flows[:, active]
+                reduced = column_prices[None, active] - costs[:, active] - row_prices[:, None]
+                open_arcs = np.where((residual > 0) & (reduced < 0), residual, 0)
+                before = np.cumsum(open_arcs, axis=0) - open_arcs
+                pushed = np.minimum(open_arcs, np.maximum(column_excess[None, active] - before, 0))
+                flows[:, active] -= pushed
+                column_excess[active] -= pushed.sum(axis=0)
+                row_excess += pushed.sum(axis=1)
+
+                stuck = ~open_arcs.any(axis=0)
+                if stuck.any():
+                    candidates = np.where(
+                        residual[:, stuck] > 0, row_prices[:, None] + costs[:, active[stuck]], np.iinfo(np.int64).min
+                    )
+                    column_prices[active[stuck]] = candidates.max(axis=0) - epsilon
+
+            if not (row_excess > 0).any() and not (column_excess > 0).any():
+                break
+
+        if epsilon == 1:
+            break
+
+    # приведенные стоимости в исходном масштабе для выбора базиса
+    reduced = (costs + row_prices[:, None] - column_prices[None, :]) / scale
+    _set_plan(table, _Arcs(table), flows.reshape(-1).astype(table.amounts.dtype), reduced.reshape(-1))
+    return True
+
+
+def _set_plan(table: Table | SparseTable, arcs: _Arcs, flows: np.ndarray, reduced: np.ndarray) -> None:
+    """
+    Перевод оптимального потока в базисный план таблицы.
+
+    Циклы из дуг с положительным объемом устраняются переносом объема
+    по циклу (стоимость не растет), получившийся лес достраивается до
+    остовного дерева дугами с наименьшей приведенной стоимостью, чтобы
+    потенциалы дерева были оптимальны и метод потенциалов сразу
+    подтвердил оптимальность.
+
+    :param table:
+    :param arcs:
+    :param flows: объемы по дугам
+    :param reduced: приведенные стоимости дуг по потенциалам метода
+    :return:
+    """
+    rows = arcs.rows
+    flows = flows.copy()
+    components = DisjointSet(rows + arcs.columns)
+    # лес из дуг с положительным объемом: узел -> {соседний узел: дуга}
+    forest: list[dict[int, int]] = [{} for _ in range(rows + arcs.columns)]
+    for arc in np.flatnonzero(flows > 0).tolist():
+        tail, head = int(arcs.tails[arc]), rows + int(arcs.heads[arc])
+        if components.union(tail, head):
+            forest[tail][head] = arc
+            forest[head][tail] = arc
+            continue
+
+        # Цикл: дуга arc и путь по лесу от head к tail. Знаки чередуются:
+        # дуга arc и дуги, пройденные от строки к столбцу, - "+"
+        path = _forest_path(forest, head, tail)
+        plus = [arc] + [forest[node][following] for node, following in zip(path, path[1:]) if node < rows]
+        minus = [forest[node][following] for node, following in zip(path, path[1:]) if node >= rows]
+        if arcs.costs[plus].sum() - arcs.costs[minus].sum() > 0:
+            plus, minus = minus, plus
+        theta = flows[minus].min()
+        flows[plus] += theta
+        flows[minus] -= theta
+        # Из леса выводится одна обнулившаяся дуга, остальные остаются
+        # в нем с нулевым объемом, чтобы лес оставался связным
+        emptied = [removed for removed in minus if flows[removed] == 0]
+        if arc in emptied:
+            continue
+        removed = emptied[0]
+        tail_node, head_node = int(arcs.tails[removed]), rows + int(arcs.heads[removed])
+        del forest[tail_node][head_node]
+        del forest[head_node][tail_node]
+        forest[tail][head] = arc
+        forest[head][tail] = arc
+
+    basic = {arc for node in forest for arc in node.values()}
+    missing = rows + arcs.columns - 1 - len(basic)
+    for arc in np.argsort(np.abs(reduced), kind='stable').tolist():
+        if missing == 0:
+            break
+        if arc in basic:
+            continue
+        if components.union(int(arcs.tails[arc]), rows + int(arcs.heads[arc])):
+            basic.add(arc)
+            missing -= 1
+
+    for arc in sorted(basic):
+        cell = table.cell_at(arc)
+        if isinstance(table, SparseTable):
+            table.set_basic(cell, flows[arc])
+        else:
+            table.set_basic(*cell, flows[arc])
+    remove_degenerate(table)
+
+
+def _forest_path(forest: list[dict[int, int]], start: int, stop: int) -> list[int]:
+    """
+    Путь между узлами одного дерева леса (поиск в ширину)
+    """
+    previous = {start: None}
+    queue = deque([start])
+    while queue:
+        node = queue.popleft()
+        if node == stop:
+            break
+        for following in forest[node]:
+            if following not in previous:
+                previous[following] = node
+                queue.append(following)
+    path = [stop]
+    while previous[path[-1]] is not None:
+        path.append(previous[path[-1]])
+    return path[::-1]
+
+
+# Методы оптимизации: ключ -> (название, функция, строящая оптимальный план).
+# Для simplex функции нет: план оптимизирует метод потенциалов (NetworkSimplex)
+FLOW_ENGINES: dict[str, tuple[str, Callable[[Table | SparseTable], bool] | None]] = {
+    'simplex': ('Метод потенциалов', None),
+    'ssp': ('Последовательные кратчайшие пути', successive_shortest_paths),
+    'cost_scaling': ('Масштабирование стоимостей (push-relabel)', cost_scaling),
+}
+
+
+def get_flow_engine(name: str) -> Callable[[Table | SparseTable], bool] | None:
+    """
+    Функция метода оптимизации по ключу
+
+    :param name: ключ из FLOW_ENGINES
+    :return:
+    """
+    if name not in FLOW_ENGINES:
+        raise ValueError(f'Неизвестный метод оптимизации: {name}')
+    return FLOW_ENGINES[name][1]
+
+
+def select_engine(table: Table | SparseTable) -> str:
+    """
+    Метод оптимизации по размеру и плотности таблицы.
+
+    Метод потенциалов быстрее на небольших таблицах (примерно до 150 x 150
+    для плотных и до 500 x 500 для разреженных, см. python -m src.benchmark),
+    на больших - последовательные кратчайшие пути.
+
+    :param table: сбалансированная таблица
+    :return: ключ из FLOW_ENGINES
+    """
+    if not _numeric(table):
+        return 'simplex'
+    nodes = table.rows + table.columns
+    density = table.size / max(table.rows * table.columns, 1)
+    return 'ssp' if nodes >= (300 if density >= 0.5 else 1000) else 'simplex'
+
+
+def resolve_engine(name: str, table: Table | SparseTable) -> str:
+    """
+    Ключ метода оптимизации с учетом автоматического выбора ('auto')
+
+    :param name: ключ из FLOW_ENGINES или 'auto'
+    :param table: сбалансированная таблица
+    :return:
+    """
+    if name == 'auto':
+        return select_engine(table)
+    get_flow_engine(name)
+    return name
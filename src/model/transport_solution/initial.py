@@ -0,0 +1,27 @@
+from typing import Callable
+
+from src.model.transport_solution.lcm import least_cost
+from src.model.transport_solution.nwc import north_west_corner
+from src.model.transport_solution.russell import russell_approximation
+from src.model.transport_solution.table import Table
+from src.model.transport_solution.vam import vogel_approximation
+
+# Методы построения опорного плана: ключ -> (название, функция)
+INITIAL_STRATEGIES: dict[str, tuple[str, Callable[[Table], None]]] = {
+    'nwc': ('Метод северо-западного угла', north_west_corner),
+    'lcm': ('Метод минимального элемента', least_cost),
+    'vam': ('Метод аппроксимации Фогеля', vogel_approximation),
+    'russell': ('Метод аппроксимации Рассела', russell_approximation),
+}
+
+
+def get_initial_strategy(name: str) -> Callable[[Table], None]:
+    """
+    Функция построения опорного плана по ключу стратегии
+
+    :param name: ключ из INITIAL_STRATEGIES
+    :return:
+    """
+    if name not in INITIAL_STRATEGIES:
+        raise ValueError(f'Неизвестный метод построения опорного плана: {name}')
+    return INITIAL_STRATEGIES[name][1]
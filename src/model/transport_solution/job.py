@@ -0,0 +1,215 @@
+import time
+from dataclasses import dataclass, field
+from typing import Callable
+
+from src.model.transport_solution.cache import CachedSolution
+from src.model.transport_solution.cache import SolutionCache
+from src.model.transport_solution.exact import scale_problem
+from src.model.transport_solution.sensitivity import Sensitivity
+from src.model.transport_solution.solver import make_table
+from src.model.transport_solution.solver import prepare_table
+from src.model.transport_solution.solver import solve_table
+from src.model.transport_solution.sparse import SparseTable
+from src.model.transport_solution.stats import SolveStats
+from src.model.transport_solution.table import Table
+from src.model.transport_solution.trace import Trace
+from src.model.transport_solution.utils import calculate_minimal_cost
+from src.model.transport_solution.warm import warm_start
+
+
+@dataclass
+class SolveResult:
+    """
+    Результат решения для модели: выходная таблица, протокол решения,
+    решенная таблица для следующего теплого старта, статистика решения
+    и анализ чувствительности
+    """
+    solution: list[list[int | None]]
+    trace: Trace | None = None
+    table: Table | SparseTable | None = field(default=None, repr=False)
+    stats: SolveStats | None = None
+    sensitivity: Sensitivity | None = None
+
+
+class SolveJob:
+    """
+    Решение задачи из снимка данных модели.
+
+    Не изменяет модель и может выполняться в другом потоке: результат
+    передается модели через TransportSolutionModel.apply_result.
+    Отмена - кооперативная: функция cancelled проверяется между итерациями.
+    Бюджет (time_limit, max_pivots) ограничивает оптимизацию; при его
+    исчерпании выводится лучший найденный план, нижняя граница и разрыв.
+    С profile=True собирается статистика решения (SolveStats) и выводится в протокол.
+    Если передан cache, решение сначала ищется в нем (кроме refresh=True),
+    а найденное оптимальное решение сохраняется.
+    С sensitivity=True для оптимального плана выполняется анализ
+    чувствительности (кэш тогда не читается: нужен базис).
+    """
+
+    # Интервал между вызовами progress, с
+    progress_interval = 0.1
+
+    def __init__(
+            self,
+            a: list[int | None],
+            b: list[int | None],
+            matrix: list[list[int | None]],
+            height: int,
+            width: int,
+            initial: str = 'nwc',
+            pricing: str = 'dantzig',
+            warm_table: Table | SparseTable | None = None,
+            trace_level: str = 'full',
+            time_limit: float | None = None,
+            max_pivots: int | None = None,
+            exact: bool = False,
+            profile: bool = False,
+            cache: SolutionCache | None = None,
+            refresh: bool = False,
+            engine: str = 'simplex',
+            sensitivity: bool = False
+    ):
+        self._a = a
+        self._b = b
+        self._matrix = matrix
+        self._height = height
+        self._width = width
+        self._initial = initial
+        self._pricing = pricing
+        self._warm_table = warm_table
+        self._trace_level = trace_level
+        self._time_limit = time_limit
+        self._max_pivots = max_pivots
+        self._exact = exact
+        self._profile = profile
+        self._cache = cache
+        self._refresh = refresh
+        self._engine = engine
+        self._sensitivity = sensitivity
+
+    @property
+    def can_solve(self) -> bool:
+        """
+        Достаточно ли данных для решения
+
+        :return:
+        """
+        if all(cost is None for row in self._matrix for cost in row):
+            return False
+        if None in self._b or len(self._b) == 0:
+            return False
+        if None in self._a or len(self._a) == 0:
+            return False
+        return True
+
+    def run(
+            self,
+            cancelled: Callable[[], bool] | None = None,
+            progress: Callable[[int], None] | None = None
+    ) -> SolveResult | None:
+        """
+        Решение задачи
+
+        :param cancelled: функция, возвращающая True, если решение больше не нужно
+        :param progress: получает число выполненных итераций
+        :return: результат или None, если решение отменено
+        """
+        if not self.can_solve:
+            return SolveResult([[None for _ in range(self._width)] for _ in range(self._height)])
+
+        if self._cache is not None and not self._refresh and not self._sensitivity:
+            cached = self._cache.get(self._a, self._b, self._matrix)
+            if cached is not None:
+                trace = Trace(self._trace_level)
+                trace.message(f"Решение найдено в кэше, пересчет не выполнялся<br/>")
+                trace.message(f"План оптимален, Fmin = {cached.cost}<br/>")
+                trace.message(
+                    f" > Потенциалы: U = {[str(value) for value in cached.u]}, "
+                    f"V = {[str(value) for value in cached.v]}<br/>",
+                    level='pivots'
+                )
+                return SolveResult(cached.matrix, trace)
+
+        if not self._profile:
+            return self._run(cancelled, progress, None)
+        stats = SolveStats(memory=True)
+        with stats.tracking():
+            result = self._run(cancelled, progress, stats)
+        if result is not None:
+            result.trace.message(stats.render())
+            result.stats = stats
+        return result
+
+    def _run(
+            self,
+            cancelled: Callable[[], bool] | None,
+            progress: Callable[[int], None] | None,
+            stats: SolveStats | None
+    ) -> SolveResult | None:
+        # Пустая клетка стоимости - запрещенный маршрут
+        is_sparse = any(None in row for row in self._matrix)
+
+        a, b, matrix = self._a, self._b, self._matrix
+        scale = scale_problem(a, b, matrix) if self._exact else None
+        if scale is not None:
+            a, b, matrix = scale.a, scale.b, scale.c
+
+        trace = Trace(self._trace_level, scale)
+        table = None
+        if self._warm_table is not None:
+            started = time.perf_counter()
+            table = warm_start(self._warm_table, a, b, matrix)
+            if stats is not None:
+                stats.add('warm_start', time.perf_counter() - started)
+            if table is not None:
+                trace.message(
+                    f"Теплый старт от базиса предыдущего решения "
+                    f"({(time.perf_counter() - started) * 1000:.1f} мс)<br/>"
+                )
+                trace.message(f" > F = {trace.cost(calculate_minimal_cost(table))}<br/>")
+
+        engine = 'simplex'
+        if table is None:
+            table = make_table(a, b, matrix, dtype=scale.dtype if scale is not None else None)
+            if is_sparse:
+                trace.message(f"Маршрутов разрешено: {table.size} из {table.rows * table.columns}<br/>")
+            engine = prepare_table(table, self._initial, stats, self._engine, trace)
+
+        solution = solve_table(
+            table, self._pricing, self._max_pivots, self._time_limit, stats,
+            trace=trace, cancelled=cancelled, progress=progress, progress_interval=self.progress_interval
+        )
+        if solution is None:
+            return None
+        solution.engine = engine
+
+        if scale is not None:
+            solution.set_scale(scale)
+            if scale.amount_scale > 1 or scale.cost_scale > 1:
+                trace.message(
+                    f"Точный режим: объемы умножены на {scale.amount_scale}, "
+                    f"стоимости - на {scale.cost_scale}, результаты приведены к исходным единицам<br/>"
+                )
+
+        cost = solution.cost
+        if solution.optimal:
+            trace.message(f"План оптимален, Fmin = {cost}<br/>")
+        else:
+            trace.message(
+                f"Бюджет решения исчерпан, выведен лучший найденный план: F = {cost}<br/>"
+                f" > Нижняя граница по потенциалам: {float(solution.lower_bound):g}, "
+                f"разрыв: {float(solution.gap):g} ({float(solution.gap) / max(abs(cost), 1) * 100:.2f}%)<br/>"
+            )
+
+        if not solution.feasible:
+            trace.message(" > Задача неразрешима: запреты маршрутов не позволяют вывезти все ресурсы<br/>")
+
+        matrix = solution.matrix
+        if self._cache is not None and solution.optimal and solution.feasible:
+            u, v = solution.potentials
+            self._cache.put(self._a, self._b, self._matrix, CachedSolution(cost, matrix, u, v))
+        sensitivity = None
+        if self._sensitivity and solution.optimal and solution.feasible:
+            sensitivity = solution.sensitivity(len(self._a), len(self._b))
+        return SolveResult(matrix, trace, solution.table, sensitivity=sensitivity)
@@ -0,0 +1,32 @@
+import numpy as np
+
+from src.model.transport_solution.table import Table
+
+
+def least_cost(table: Table) -> None:
+    """
+    Метод минимального элемента (матричный минимум).
+    Клетки заполняются в порядке возрастания стоимости.
+
+    :param table:
+    :return:
+    """
+    needs = table.needs
+    resources = table.resources
+
+    order = np.argsort(table.costs, axis=None, kind='stable')
+    rows, columns = np.unravel_index(order, table.costs.shape)
+    remaining = table.rows + table.columns
+
+    for i, j in zip(rows.tolist(), columns.tolist()):
+        if resources[i] == 0 or needs[j] == 0:
+            continue
+
+        amount = min(resources[i], needs[j])
+        table.set_basic(i, j, amount)
+        resources[i] -= amount
+        needs[j] -= amount
+
+        remaining -= (resources[i] == 0) + (needs[j] == 0)
+        if remaining <= 1:
+            break
@@ -0,0 +1,256 @@
+import os
+from typing import Iterator
+
+import numpy as np
+
+from src.model.transport_solution.numeric import noise_tolerance
+from src.model.transport_solution.numeric import scalar
+from src.model.transport_solution.table import Table
+
+
+class MappedTable(Table):
+    """
+    Транспортная таблица с матрицей стоимостей, отображенной в память
+    (np.load(mmap_mode='r') или np.memmap): стоимости не копируются
+    и читаются с диска по мере обращения.
+
+    Дельты считаются блоками строк (не более block_cells клеток), поэтому
+    временные массивы не зависят от размера задачи. Балансировка дописывает
+    фиктивную строку (столбец) в копию стоимостей во временном файле.
+    Объемы перевозок, маска базиса и дельты хранятся в памяти: np.zeros
+    не занимает страницы, пока в них нет записей.
+    """
+
+    def __init__(self, a: list[int], b: list[int], costs: np.ndarray, block_cells: int = 1 << 20):
+        """
+        :param a: ресурсы
+        :param b: потребности
+        :param costs: матрица стоимостей len(a) x len(b) (обычно np.memmap)
+        :param block_cells: наибольшее число клеток в блоке строк при расчете дельт
+        """
+        if costs.shape != (len(a), len(b)):
+            raise ValueError(f'Размер матрицы стоимостей {costs.shape} не совпадает с ({len(a)}, {len(b)})')
+        if costs.dtype.kind not in 'iuf':
+            raise ValueError('Стоимости должны быть целыми или вещественными числами')
+        if not costs.flags.c_contiguous:
+            raise ValueError('Матрица стоимостей должна храниться по строкам (C order)')
+
+        self._allocate(a, b, costs)
+        self._block_cells = block_cells
+
+    def row_blocks(self, rows: int | None = None) -> Iterator[tuple[int, int]]:
+        """
+        Границы блоков строк [start, stop) для потокового просмотра стоимостей
+
+        :param rows: количество строк (по умолчанию - все строки таблицы)
+        :return:
+        """
+        rows = self._costs.shape[0] if rows is None else rows
+        step = max(self._block_cells // max(self._costs.shape[1], 1), 1)
+        for start in range(0, rows, step):
+            yield start, min(start + step, rows)
+
+    def _grow(self, rows: int, columns: int) -> None:
+        """
+        Расширение таблицы (балансировка): стоимости копируются
+        блоками строк во временный файл, отображенный в память
+
+        :param rows:
+        :param columns:
+        :return:
+        """
+        # tempfile нужен только при балансировке: не загружается при импорте ядра
+        import tempfile
+
+        old_rows, old_columns = self._costs.shape
+        with tempfile.TemporaryFile() as scratch:
+            # файл удаляется при закрытии, отображение остается доступным
+            costs = np.memmap(
+                scratch, dtype=self._costs.dtype, mode='w+',
+                shape=(old_rows + rows, old_columns + columns)
+            )
+        for start, stop in self.row_blocks(old_rows):
+            costs[start:stop, :old_columns] = self._costs[start:stop]
+        self._costs = costs
+
+        def pad(buffer: np.ndarray) -> np.ndarray:
+            result = np.zeros(costs.shape, dtype=buffer.dtype)
+            result[:old_rows, :old_columns] = buffer
+            return result
+
+        self._amounts = pad(self._amounts).astype(np.result_type(self._resources, self._needs), copy=False)
+        self._basis = pad(self._basis)
+        self._deltas = np.zeros(costs.shape, dtype=self._deltas.dtype)
+        self._tree = None
+        self._tolerance = None
+
+    def update(self, a: list[int], b: list[int], c: list[list[int]] | None = None) -> None:
+        raise ValueError('Стоимости таблицы, отображенной в память, не заменяются')
+
+    def change_costs(self, factor: int | float = 1, changes: dict | None = None) -> None:
+        raise ValueError('Стоимости таблицы, отображенной в память, не заменяются')
+
+    def copy(self) -> 'MappedTable':
+        raise ValueError('Таблица, отображенная в память, не копируется')
+
+    def _snap(self, deltas: np.ndarray) -> None:
+        """
+        Обнуление дельт, меньших порога шума (см. noise_tolerance).
+        Порог считается по блокам строк
+
+        :param deltas:
+        :return:
+        """
+        if self._tolerance is None:
+            self._tolerance = max(
+                (noise_tolerance(self._costs[start:stop]) for start, stop in self.row_blocks()), default=0
+            )
+        if self._tolerance:
+            deltas[np.abs(deltas) <= self._tolerance] = 0
+
+    def reduced_costs(self, u: np.ndarray, v: np.ndarray, start: int = 0, stop: int | None = None) -> np.ndarray:
+        """
+        Дельты клеток с плоскими индексами [start, stop).
+        Полный расчет выполняется блоками строк и сохраняется в deltas,
+        окно читает из файла только свои строки
+
+        :param u: потенциалы строк
+        :param v: потенциалы столбцов
+        :param start:
+        :param stop:
+        :return:
+        """
+        if start == 0 and stop is None:
+            for first, last in self.row_blocks():
+                deltas = self._costs[first:last] - u[first:last, None] - v[None, :]
+                deltas[self._basis[first:last]] = 0
+                self._snap(deltas)
+                self._deltas[first:last] = deltas
+            return self._deltas.reshape(-1)
+
+        stop = self.size if stop is None else stop
+        rows, columns = np.divmod(np.arange(start, stop), self.columns)
+        deltas = self._costs.reshape(-1)[start:stop] - u[rows] - v[columns]
+        deltas[self._basis.reshape(-1)[start:stop]] = 0
+        self._snap(deltas)
+        return deltas
+
+    def reduced_costs_of(self, u: np.ndarray, v: np.ndarray, cells: np.ndarray) -> np.ndarray:
+        rows, columns = np.divmod(cells, self.columns)
+        deltas = self._costs.reshape(-1)[cells] - u[rows] - v[columns]
+        deltas[self._basis.reshape(-1)[cells]] = 0
+        self._snap(deltas)
+        return deltas
+
+    def lower_bound(self, u: np.ndarray, v: np.ndarray) -> int | float:
+        """
+        Нижняя граница стоимости оптимального плана (см. Table.lower_bound),
+        рассчитанная блоками строк
+
+        :param u: потенциалы строк
+        :param v: потенциалы столбцов
+        :return:
+        """
+        resources = np.array(self.resources)
+        needs = np.array(self.needs)
+        bounds = []
+        for row_potentials, column_potentials in ((u, v), (np.zeros(self.rows), np.zeros(self.columns))):
+            # U' по V, затем V' по U'
+            fixed_u = np.empty(self.rows)
+            fixed_v = np.full(self.columns, np.inf)
+            for start, stop in self.row_blocks():
+                fixed_u[start:stop] = (self._costs[start:stop] - column_potentials).min(axis=1)
+            for start, stop in self.row_blocks():
+                np.minimum(fixed_v, (self._costs[start:stop] - fixed_u[start:stop, None]).min(axis=0), out=fixed_v)
+            bounds.append(resources @ fixed_u + needs @ fixed_v)
+
+            # V' по U, затем U' по V'
+            fixed_v = np.full(self.columns, np.inf)
+            for start, stop in self.row_blocks():
+                np.minimum(
+                    fixed_v, (self._costs[start:stop] - row_potentials[start:stop, None]).min(axis=0), out=fixed_v
+                )
+            for start, stop in self.row_blocks():
+                fixed_u[start:stop] = (self._costs[start:stop] - fixed_v).min(axis=1)
+            bounds.append(resources @ fixed_u + needs @ fixed_v)
+        return scalar(max(bounds))
+
+
+def load_vector(path: str | os.PathLike, dtype: str | np.dtype | None = None) -> list[int | float]:
+    """
+    Ресурсы или потребности из файла: .npy, текст (.txt, .csv - числа
+    через пробел, запятую или с новой строки) или двоичный файл с типом dtype
+
+    :param path:
+    :param dtype: тип двоичного файла (например, 'int64', '<f8')
+    :return:
+    """
+    path = os.fspath(path)
+    if path.endswith('.npy'):
+        values = np.load(path)
+    elif path.endswith(('.txt', '.csv')):
+        with open(path, encoding='utf-8') as stream:
+            values = np.array(stream.read().replace(',', ' ').split(), dtype=np.float64)
+        if np.all(values == np.round(values)):
+            values = values.astype(np.int64)
+    elif dtype is not None:
+        values = np.fromfile(path, dtype=np.dtype(dtype))
+    else:
+        raise ValueError(f'Для двоичного файла {path} нужно указать тип (dtype)')
+
+    if values.ndim != 1 or values.dtype.kind not in 'iuf':
+        raise ValueError(f'Файл {path} должен содержать одномерный массив чисел')
+    return values.tolist()
+
+
+def load_costs(
+        path: str | os.PathLike,
+        rows: int,
+        columns: int,
+        dtype: str | np.dtype | None = None
+) -> np.ndarray:
+    """
+    Матрица стоимостей из файла без чтения в память: .npy открывается
+    через np.load(mmap_mode='r'), двоичный файл (по строкам, без заголовка) -
+    через np.memmap с типом dtype
+
+    :param path:
+    :param rows: количество строк (ресурсов)
+    :param columns: количество столбцов (потребностей)
+    :param dtype: тип двоичного файла
+    :return: массив только для чтения
+    """
+    path = os.fspath(path)
+    if path.endswith('.npy'):
+        costs = np.load(path, mmap_mode='r')
+    elif dtype is not None:
+        costs = np.memmap(path, dtype=np.dtype(dtype), mode='r', shape=(rows, columns))
+    else:
+        raise ValueError(f'Для двоичного файла {path} нужно указать тип (dtype)')
+
+    if costs.shape != (rows, columns):
+        raise ValueError(f'Размер матрицы стоимостей {costs.shape} не совпадает с ({rows}, {columns})')
+    return costs
+
+
+def load_table(
+        costs: str | os.PathLike,
+        supply: str | os.PathLike,
+        demand: str | os.PathLike,
+        dtype: str | np.dtype | None = None,
+        block_cells: int = 1 << 20
+) -> MappedTable:
+    """
+    Таблица задачи из файлов: матрица стоимостей отображается в память
+    (см. load_costs), ресурсы и потребности читаются целиком (см. load_vector)
+
+    :param costs: файл стоимостей (.npy или двоичный)
+    :param supply: файл ресурсов
+    :param demand: файл потребностей
+    :param dtype: тип двоичных файлов
+    :param block_cells: наибольшее число клеток в блоке строк
+    :return:
+    """
+    a = load_vector(supply, dtype)
+    b = load_vector(demand, dtype)
+    return MappedTable(a, b, load_costs(costs, len(a), len(b), dtype), block_cells)
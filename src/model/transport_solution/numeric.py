@@ -0,0 +1,27 @@
+import numpy as np
+
+
+def scalar(value) -> int | float:
+    """
+    Число Python из элемента буфера NumPy.
+    Элементы буферов object (целые произвольной длины) возвращаются как есть
+
+    :param value:
+    :return:
+    """
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def noise_tolerance(costs: np.ndarray) -> int | float:
+    """
+    Порог шума дельт: для целых стоимостей 0, для float - доля наибольшей
+    по модулю стоимости. Дельты, меньшие порога по модулю, считаются нулевыми:
+    иначе ошибки округления потенциалов дают "улучшающие" клетки
+    и метод потенциалов не останавливается
+
+    :param costs:
+    :return:
+    """
+    if costs.dtype.kind != 'f':
+        return 0
+    return 1e-9 * max(float(np.abs(costs).max(initial=0)), 1)
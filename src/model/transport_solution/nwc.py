@@ -5,17 +5,22 @@ def north_west_corner(table: Table) -> None:
     needs = table.needs
     resources = table.resources
 
-    for i in range(table.rows):
-        for j in range(table.columns):
-            item = table.items[i][j]
-            if resources[i] == 0 or needs[j] == 0:
-                continue
+    i, j = 0, 0
+    while i < table.rows and j < table.columns:
+        if resources[i] == 0:
+            i += 1
+            continue
+        if needs[j] == 0:
+            j += 1
+            continue
 
-            if resources[i] > needs[j]:
-                item.amount = needs[j]
-                resources[i] -= needs[j]
-                needs[j] = 0
-            else:
-                item.amount = resources[i]
-                needs[j] -= resources[i]
-                resources[i] = 0
+        if resources[i] > needs[j]:
+            table.set_basic(i, j, needs[j])
+            resources[i] -= needs[j]
+            needs[j] = 0
+            j += 1
+        else:
+            table.set_basic(i, j, resources[i])
+            needs[j] -= resources[i]
+            resources[i] = 0
+            i += 1
@@ -0,0 +1,184 @@
+import math
+
+import numpy as np
+
+from src.model.transport_solution.table import Table
+
+
+class PricingRule:
+    """
+    Правило выбора вводимой в базис клетки.
+    Метод select возвращает свободную клетку с отрицательной дельтой
+    или None, если таких клеток нет (план оптимален).
+    """
+
+    def __init__(self, table: Table):
+        self._table = table
+
+    @property
+    def size(self) -> int:
+        return self._table.size
+
+    def select(self, u: np.ndarray, v: np.ndarray) -> tuple[int, int] | None:
+        raise NotImplementedError
+
+
+class DantzigPricing(PricingRule):
+    """
+    Правило Данцига: полный просмотр, клетка с наименьшей дельтой
+    """
+
+    def select(self, u: np.ndarray, v: np.ndarray) -> tuple[int, int] | None:
+        deltas = self._table.reduced_costs(u, v)
+        cell = int(np.argmin(deltas))
+        if deltas[cell] >= 0:
+            return None
+        return self._table.cell_at(cell)
+
+
+class BlockSearchPricing(PricingRule):
+    """
+    Блочный поиск: клетки просматриваются циклически блоками,
+    выбирается наименьшая дельта в первом блоке, где есть отрицательные.
+    Размер блока по умолчанию - корень из числа клеток.
+    """
+
+    def __init__(self, table: Table, block_size: int | None = None):
+        super().__init__(table)
+        self._block_size = block_size or max(int(math.sqrt(self.size)), 10)
+        self._next = 0
+
+    def select(self, u: np.ndarray, v: np.ndarray) -> tuple[int, int] | None:
+        size = self.size
+        start = self._next
+        scanned = 0
+        while scanned < size:
+            stop = min(start + self._block_size, size)
+            deltas = self._table.reduced_costs(u, v, start, stop)
+            best = int(np.argmin(deltas))
+            scanned += stop - start
+            if deltas[best] < 0:
+                self._next = stop % size
+                return self._table.cell_at(start + best)
+            start = stop % size
+        return None
+
+
+class FirstEligiblePricing(BlockSearchPricing):
+    """
+    Первая подходящая клетка: циклический просмотр с места
+    предыдущего выбора до первой отрицательной дельты.
+    """
+
+    def __init__(self, table: Table):
+        super().__init__(table, block_size=max(int(math.sqrt(table.size)), 1))
+
+    def select(self, u: np.ndarray, v: np.ndarray) -> tuple[int, int] | None:
+        size = self.size
+        start = self._next
+        scanned = 0
+        while scanned < size:
+            stop = min(start + self._block_size, size)
+            negative = np.flatnonzero(self._table.reduced_costs(u, v, start, stop) < 0)
+            scanned += stop - start
+            if len(negative):
+                cell = start + int(negative[0])
+                self._next = (cell + 1) % size
+                return self._table.cell_at(cell)
+            start = stop % size
+        return None
+
+
+class CandidateListPricing(BlockSearchPricing):
+    """
+    Список кандидатов (частичный просмотр).
+
+    Большая итерация просматривает клетки блоками и запоминает до
+    list_length клеток с наименьшими отрицательными дельтами.
+    Малые итерации (не более minor_limit) выбирают лучшую клетку
+    только среди кандидатов, пересчитывая их дельты.
+    """
+
+    def __init__(self, table: Table, list_length: int | None = None, minor_limit: int | None = None):
+        super().__init__(table)
+        self._list_length = list_length or max(int(0.25 * math.sqrt(self.size)), 10)
+        self._minor_limit = minor_limit or max(int(0.1 * self._list_length), 3)
+        self._candidates = np.empty(0, dtype=np.intp)
+        self._minor = 0
+
+    def select(self, u: np.ndarray, v: np.ndarray) -> tuple[int, int] | None:
+        if len(self._candidates) and self._minor < self._minor_limit:
+            self._minor += 1
+            deltas = self._table.reduced_costs_of(u, v, self._candidates)
+            negative = deltas < 0
+            self._candidates = self._candidates[negative]
+            if len(self._candidates):
+                return self._table.cell_at(self._candidates[np.argmin(deltas[negative])])
+
+        # Большая итерация: новый список кандидатов
+        self._minor = 0
+        size = self.size
+        start = self._next
+        scanned = 0
+        cells, values = [], []
+        collected = 0
+        while scanned < size and collected < self._list_length:
+            stop = min(start + self._block_size, size)
+            deltas = self._table.reduced_costs(u, v, start, stop)
+            negative = np.flatnonzero(deltas < 0)
+            cells.append(start + negative)
+            values.append(deltas[negative])
+            collected += len(negative)
+            scanned += stop - start
+            start = stop % size
+        self._next = start
+
+        if not collected:
+            self._candidates = np.empty(0, dtype=np.intp)
+            return None
+
+        cells, values = np.concatenate(cells), np.concatenate(values)
+        if len(cells) > self._list_length:
+            keep = np.argpartition(values, self._list_length - 1)[:self._list_length]
+            cells, values = cells[keep], values[keep]
+        self._candidates = cells
+        return self._table.cell_at(cells[np.argmin(values)])
+
+
+def bland_entering(table: Table, u: np.ndarray, v: np.ndarray) -> tuple[int, int] | None:
+    """
+    Правило Бланда: свободная клетка с наименьшим индексом
+    среди клеток с отрицательной дельтой
+
+    :param table:
+    :param u:
+    :param v:
+    :return:
+    """
+    block = 1 << 16
+    for start in range(0, table.size, block):
+        negative = np.flatnonzero(table.reduced_costs(u, v, start, min(start + block, table.size)) < 0)
+        if len(negative):
+            return table.cell_at(start + int(negative[0]))
+    return None
+
+
+# Правила выбора вводимой клетки: ключ -> (название, класс)
+PRICING_RULES: dict[str, tuple[str, type[PricingRule]]] = {
+    'dantzig': ('Правило Данцига (полный просмотр)', DantzigPricing),
+    'first': ('Первая подходящая клетка', FirstEligiblePricing),
+    'block': ('Блочный поиск', BlockSearchPricing),
+    'candidates': ('Список кандидатов', CandidateListPricing),
+}
+
+
+def get_pricing_rule(name: str) -> type[PricingRule]:
+    """
+    Класс правила выбора вводимой клетки по ключу
+
+    :param name: ключ из PRICING_RULES
+    :return:
+    """
+    if name not in PRICING_RULES:
+        raise ValueError(f'Неизвестное правило выбора вводимой клетки: {name}')
+    return PRICING_RULES[name][1]
@@ -0,0 +1,39 @@
+import numpy as np
+
+from src.model.transport_solution.table import Table
+
+
+def russell_approximation(table: Table) -> None:
+    """
+    Метод аппроксимации Рассела.
+    Для оставшихся клеток рассчитывается C[i][j] - max(C[i]) - max(C[:, j]),
+    заполняется клетка с наименьшим значением.
+
+    :param table:
+    :return:
+    """
+    needs = table.needs
+    resources = table.resources
+
+    costs = table.costs.astype(np.float64)
+    active_rows = np.array(resources) != 0
+    active_columns = np.array(needs) != 0
+
+    while active_rows.any() and active_columns.any():
+        rows = np.flatnonzero(active_rows)
+        columns = np.flatnonzero(active_columns)
+
+        block = costs[np.ix_(rows, columns)]
+        estimates = block - block.max(axis=1)[:, None] - block.max(axis=0)[None, :]
+        k, l = np.unravel_index(np.argmin(estimates), estimates.shape)
+        i, j = int(rows[k]), int(columns[l])
+
+        amount = min(resources[i], needs[j])
+        table.set_basic(i, j, amount)
+        resources[i] -= amount
+        needs[j] -= amount
+
+        if resources[i] == 0:
+            active_rows[i] = False
+        if needs[j] == 0:
+            active_columns[j] = False
@@ -0,0 +1,189 @@
+from dataclasses import dataclass
+from fractions import Fraction
+
+import numpy as np
+
+from src.model.transport_solution.exact import ScaledProblem
+from src.model.transport_solution.numeric import scalar
+from src.model.transport_solution.sparse import SparseTable
+from src.model.transport_solution.table import Table
+
+Number = int | float | Fraction
+
+
+@dataclass
+class CostRange:
+    """
+    Диапазон стоимости клетки, в котором текущий базис остается
+    оптимальным (None - без ограничения). При вырожденном базисе
+    диапазон может быть уже, чем диапазон оптимальности самого плана
+    """
+    cost: Number
+    lower: Number | None
+    upper: Number | None
+    basic: bool
+
+
+@dataclass
+class RhsRange:
+    """
+    Диапазон ресурса (потребности), в котором текущий базис остается
+    допустимым, если на ту же величину меняется потребность (ресурс)
+    партнера - фиктивного столбца (строки) открытой задачи, иначе
+    последнего столбца (строки). price - изменение стоимости плана
+    на единицу изменения (U[i] + V[j])
+    """
+    value: Number
+    lower: Number | None
+    upper: Number | None
+    price: Number
+    partner: int
+
+
+@dataclass
+class Sensitivity:
+    """
+    Анализ чувствительности оптимального плана: диапазоны стоимостей
+    клеток (None - запрещенный маршрут), ресурсов и потребностей
+    """
+    costs: list[list[CostRange | None]]
+    supply: list[RhsRange]
+    demand: list[RhsRange]
+
+
+def cost_ranges(table: Table | SparseTable) -> tuple[list, list]:
+    """
+    Диапазоны стоимостей клеток по оптимальному базису и потенциалам.
+
+    Свободная клетка остается свободной, пока ее дельта неотрицательна:
+    стоимость можно уменьшить на дельту. Изменение стоимости базисной
+    клетки на t меняет потенциалы части дерева, отрезанной этой клеткой,
+    и дельты клеток между частями - на +t или -t
+
+    :param table: таблица с оптимальным базисом
+    :return: нижние и верхние границы по плоским индексам клеток (None - без ограничения)
+    """
+    tree = table.tree
+    deltas = table.reduced_costs(tree.u, tree.v).copy()
+    costs = table.costs.reshape(-1)
+    basis = table.basis.reshape(-1)
+    real = ~table.artificial if isinstance(table, SparseTable) else np.ones(table.size, dtype=bool)
+    free = ~basis & real
+    lower: list = [None] * table.size
+    upper: list = [None] * table.size
+
+    for index in np.flatnonzero(free).tolist():
+        lower[index] = scalar(costs[index] - deltas[index])
+
+    rows = table.rows
+    for index in np.flatnonzero(basis & real).tolist():
+        row, column = table.endpoints(table.cell_at(index))
+        child = rows + column if tree.parent[rows + column] == row else row
+        inner = np.zeros(rows + table.columns, dtype=bool)
+        inner[tree.subtree(child)] = True
+        # часть дерева, содержащая столбец клетки: ее потенциалы V растут на t, U - убывают
+        side = inner if child == rows + column else ~inner
+        growing = free & table.crossing(side[:rows], ~side[rows:])
+        falling = free & table.crossing(~side[:rows], side[rows:])
+        if growing.any():
+            lower[index] = scalar(costs[index] - deltas[growing].min())
+        if falling.any():
+            upper[index] = scalar(costs[index] + deltas[falling].min())
+    return lower, upper
+
+
+def rhs_range(table: Table | SparseTable, row: int, column: int) -> tuple:
+    """
+    Допустимые изменения t ресурса строки row и потребности столбца column
+    (обоих на t), при которых перевозки базиса остаются неотрицательными.
+    Перевозки меняются на +-t вдоль пути дерева от строки к столбцу
+
+    :param table: таблица с оптимальным базисом
+    :param row:
+    :param column:
+    :return: наименьшее и наибольшее t (None - без ограничения)
+    """
+    resources = [0] * table.rows
+    needs = [0] * table.columns
+    resources[row] = 1
+    needs[column] = 1
+    artificial = table.artificial if isinstance(table, SparseTable) else None
+    lower = upper = None
+    for cell, change in table.tree.flows(resources, needs).items():
+        if change == 0:
+            continue
+        amount = scalar(table.amounts[cell])
+        if artificial is not None and artificial[cell]:
+            # искусственная клетка (запрещенный маршрут) должна остаться пустой
+            amount = 0
+        if change > 0:
+            lower = -amount if lower is None else max(lower, -amount)
+        else:
+            upper = amount if upper is None else min(upper, amount)
+    return lower, upper
+
+
+def analyze_sensitivity(
+        table: Table | SparseTable,
+        scale: ScaledProblem | None = None,
+        rows: int | None = None,
+        columns: int | None = None
+) -> Sensitivity:
+    """
+    Анализ чувствительности по оптимальному базису без повторного решения
+
+    :param table: сбалансированная таблица с оптимальным базисом
+    :param scale: масштаб точного режима (значения таблицы приводятся к исходным единицам)
+    :param rows: количество строк исходной задачи (без фиктивных)
+    :param columns: количество столбцов исходной задачи
+    :return:
+    """
+    rows = table.rows if rows is None else rows
+    columns = table.columns if columns is None else columns
+
+    def cost(value):
+        return scale.potential(value) if scale is not None and value is not None else value
+
+    def amount(value):
+        return scale.amount(value) if scale is not None and value is not None else value
+
+    tree = table.tree
+    lower, upper = cost_ranges(table)
+    basis = table.basis
+    real = ~table.artificial if isinstance(table, SparseTable) else None
+    matrix = []
+    for i in range(rows):
+        line = []
+        for j in range(columns):
+            if isinstance(table, SparseTable):
+                index = table.find(i, j)
+                if index is None or not real[index]:
+                    line.append(None)
+                    continue
+            else:
+                index = i * table.columns + j
+            line.append(CostRange(
+                cost=cost(scalar(table.costs.reshape(-1)[index])),
+                lower=cost(lower[index]),
+                upper=cost(upper[index]),
+                basic=bool(basis.reshape(-1)[index]),
+            ))
+        matrix.append(line)
+
+    def ranged(value, partner: int, row: int, column: int) -> RhsRange:
+        low, high = rhs_range(table, row, column)
+        return RhsRange(
+            value=amount(value),
+            lower=amount(value + low) if low is not None else None,
+            upper=amount(value + high) if high is not None else None,
+            price=cost(tree.potentials[row] + tree.potentials[table.rows + column]),
+            partner=partner,
+        )
+
+    resources, needs = table.resources, table.needs
+    last_column, last_row = table.columns - 1, table.rows - 1
+    return Sensitivity(
+        costs=matrix,
+        supply=[ranged(resources[i], last_column, i, last_column) for i in range(rows)],
+        demand=[ranged(needs[j], last_row, last_row, j) for j in range(columns)],
+    )
@@ -0,0 +1,166 @@
+import time
+from typing import Callable
+
+from src.model.transport_solution.numeric import scalar
+from src.model.transport_solution.pricing import bland_entering
+from src.model.transport_solution.pricing import get_pricing_rule
+from src.model.transport_solution.stats import SolveStats
+from src.model.transport_solution.table import Table
+from src.model.transport_solution.utils import lower_bound
+
+
+class NetworkSimplex:
+    """
+    Сетевой симплекс-метод (метод потенциалов) на дереве базиса таблицы.
+
+    Вводимая клетка выбирается правилом из PRICING_RULES. Если подряд
+    выполнено degenerate_limit вырожденных итераций (theta = 0), до первой
+    невырожденной итерации используется правило Бланда, исключающее
+    зацикливание.
+
+    Таблица должна содержать невырожденный опорный план
+    (см. remove_degenerate).
+
+    Если передан stats, замеряется время выбора вводимой клетки, поиска
+    цикла и пересчета, а также длины циклов (см. SolveStats).
+    """
+
+    def __init__(
+            self,
+            table: Table,
+            pricing: str = 'dantzig',
+            anti_cycling: bool = True,
+            degenerate_limit: int | None = None,
+            stats: SolveStats | None = None,
+            **pricing_options
+    ):
+        self._table = table
+        self._pricing = pricing
+        self._rule = get_pricing_rule(pricing)(table, **pricing_options)
+        self._anti_cycling = anti_cycling
+        self._degenerate_limit = degenerate_limit or max(table.rows + table.columns, 10)
+        self._degenerate_run = 0
+        self._bland = False
+        self._stats = stats
+
+        self.pivots = 0
+        self.degenerate_pivots = 0
+        self.pivot_counts: dict[str, int] = {pricing: 0, 'bland': 0}
+        self.last_pivot: tuple[tuple[int, int], list[tuple[int, int]], int | float] | None = None
+
+    @property
+    def table(self) -> Table:
+        return self._table
+
+    @property
+    def pricing(self) -> str:
+        return self._pricing
+
+    def lower_bound(self) -> int | float:
+        """
+        Нижняя граница стоимости оптимального плана по текущим потенциалам
+        (см. utils.lower_bound)
+
+        :return:
+        """
+        tree = self._table.tree
+        if self._stats is None:
+            return lower_bound(self._table, tree.u, tree.v)
+        with self._stats.phase('lower_bound'):
+            return lower_bound(self._table, tree.u, tree.v)
+
+    def step(self) -> bool:
+        """
+        Одна итерация метода
+
+        :return: False, если план оптимален
+        """
+        table = self._table
+        tree = table.tree
+        u, v = tree.u, tree.v
+        stats = self._stats
+        if stats is not None:
+            started = time.perf_counter()
+
+        if self._bland:
+            entering = bland_entering(table, u, v)
+        else:
+            entering = self._rule.select(u, v)
+        if stats is not None:
+            priced = time.perf_counter()
+            stats.add('pricing', priced - started)
+        if entering is None:
+            return False
+
+        cycle = tree.cycle(entering)
+        if stats is not None:
+            found = time.perf_counter()
+            stats.add('cycle_search', found - priced)
+        plus = table.cell_index(cycle[0::2])
+        minus = table.cell_index(cycle[1::2])
+
+        # Из базиса выводится клетка со знаком "-" и наименьшим объемом.
+        # При равенстве - самая дорогая, по правилу Бланда - первая по индексу
+        amounts = table.amounts
+        theta = amounts[minus].min()
+        leaving = None
+        for cell in cycle[1::2]:
+            if amounts[cell] != theta:
+                continue
+            if leaving is None:
+                leaving = cell
+            elif self._bland:
+                leaving = min(leaving, cell)
+            elif table.cell_cost(cell) >= table.cell_cost(leaving):
+                leaving = cell
+
+        amounts[plus] += theta
+        amounts[minus] -= theta
+        table.pivot(entering, leaving)
+        if stats is not None:
+            stats.add('pivot', time.perf_counter() - found)
+            stats.pivot(len(cycle), bool(theta == 0), self._bland)
+
+        self.pivots += 1
+        self.pivot_counts['bland' if self._bland else self._pricing] += 1
+        self.last_pivot = (entering, cycle, scalar(theta))
+
+        if theta == 0:
+            self.degenerate_pivots += 1
+            self._degenerate_run += 1
+            if self._anti_cycling and self._degenerate_run >= self._degenerate_limit:
+                self._bland = True
+        else:
+            self._degenerate_run = 0
+            self._bland = False
+        return True
+
+    def run(
+            self,
+            max_pivots: int | None = None,
+            cancelled: Callable[[], bool] | None = None,
+            time_limit: float | None = None,
+            on_pivot: Callable[['NetworkSimplex'], None] | None = None
+    ) -> bool:
+        """
+        Итерации до оптимального плана или исчерпания бюджета.
+        Каждая итерация не увеличивает стоимость, поэтому при остановке
+        по бюджету в таблице остается лучший найденный план.
+
+        :param max_pivots: ограничение числа итераций
+        :param cancelled: проверяется перед каждой итерацией, True - прервать
+        :param time_limit: ограничение времени, с
+        :param on_pivot: вызывается после каждой итерации (протокол, ход решения)
+        :return: True, если план оптимален
+        """
+        deadline = time.perf_counter() + time_limit if time_limit is not None else None
+        while max_pivots is None or self.pivots < max_pivots:
+            if cancelled is not None and cancelled():
+                return False
+            if deadline is not None and time.perf_counter() >= deadline:
+                return False
+            if not self.step():
+                return True
+            if on_pivot is not None:
+                on_pivot(self)
+        return False
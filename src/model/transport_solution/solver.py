@@ -0,0 +1,414 @@
+import time
+from dataclasses import dataclass, field
+from typing import Callable
+
+import numpy as np
+
+from src.model.transport_solution.exact import ScaledProblem
+from src.model.transport_solution.exact import scale_problem
+from src.model.transport_solution.flow import FLOW_ENGINES
+from src.model.transport_solution.flow import get_flow_engine
+from src.model.transport_solution.flow import resolve_engine
+from src.model.transport_solution.initial import INITIAL_STRATEGIES
+from src.model.transport_solution.mapped import load_table
+from src.model.transport_solution.numeric import scalar
+from src.model.transport_solution.pricing import PRICING_RULES
+from src.model.transport_solution.sensitivity import Sensitivity
+from src.model.transport_solution.sensitivity import analyze_sensitivity
+from src.model.transport_solution.simplex import NetworkSimplex
+from src.model.transport_solution.sparse import SparseTable
+from src.model.transport_solution.sparse import sparse_least_cost
+from src.model.transport_solution.stats import SolveStats
+from src.model.transport_solution.stats import measure
+from src.model.transport_solution.table import Table
+from src.model.transport_solution.trace import Trace
+from src.model.transport_solution.utils import balance_table
+from src.model.transport_solution.utils import calculate_minimal_cost
+from src.model.transport_solution.utils import is_balanced
+from src.model.transport_solution.utils import is_degenerate
+from src.model.transport_solution.utils import remove_degenerate
+from src.model.transport_solution.warm import warm_start
+
+
+def make_table(
+        a: list[int],
+        b: list[int],
+        c: list[list[int | None]],
+        dtype: np.dtype | None = None
+) -> Table | SparseTable:
+    """
+    Таблица задачи: SparseTable, если в матрице стоимостей
+    есть запрещенные маршруты (None), иначе Table
+
+    :param a: ресурсы
+    :param b: потребности
+    :param c: стоимости
+    :param dtype: тип буферов таблицы
+    :return:
+    """
+    if any(cost is None for row in c for cost in row):
+        return SparseTable.from_dense(a, b, c, dtype=dtype)
+    return Table(a, b, c, dtype=dtype)
+
+
+def initial_plan(table: Table | SparseTable, initial: str = 'nwc') -> str:
+    """
+    Построение опорного плана выбранным методом.
+    Для SparseTable всегда используется метод минимального элемента
+    по разрешенным маршрутам.
+
+    :param table: сбалансированная таблица
+    :param initial: ключ из INITIAL_STRATEGIES
+    :return: название использованного метода
+    """
+    if isinstance(table, SparseTable):
+        sparse_least_cost(table)
+        return 'Метод минимального элемента по разрешенным маршрутам'
+
+    if initial not in INITIAL_STRATEGIES:
+        raise ValueError(f'Неизвестный метод построения опорного плана: {initial}')
+    name, strategy = INITIAL_STRATEGIES[initial]
+    strategy(table)
+    return name
+
+
+def prepare_table(
+        table: Table | SparseTable,
+        initial: str = 'nwc',
+        stats: SolveStats | None = None,
+        engine: str = 'simplex',
+        trace: Trace | None = None
+) -> str:
+    """
+    Балансировка, опорный план и устранение вырожденности.
+    Если выбран другой метод оптимизации (см. FLOW_ENGINES), он сразу
+    строит оптимальный базисный план; если метод неприменим - опорный план.
+
+    :param table:
+    :param initial:
+    :param stats: статистика решения (None - без замеров)
+    :param engine: ключ из FLOW_ENGINES или 'auto'
+    :param trace: протокол решения (None - без протокола)
+    :return: ключ использованного метода оптимизации
+    """
+    balanced = is_balanced(table)
+    with measure(stats, 'balance'):
+        balance_table(table)
+    if trace is not None and not balanced:
+        trace.message(f"Таблица не сбалансирована (Открытая задача), произведена балансировка<br/>")
+
+    engine = resolve_engine(engine, table)
+    if engine != 'simplex':
+        started = time.perf_counter()
+        with measure(stats, 'flow_engine'):
+            solved = get_flow_engine(engine)(table)
+        if solved:
+            if trace is not None:
+                trace.message(
+                    f"Оптимальный план: {FLOW_ENGINES[engine][0]} "
+                    f"({(time.perf_counter() - started) * 1000:.1f} мс), проверка методом потенциалов<br/>"
+                )
+            return engine
+
+    started = time.perf_counter()
+    with measure(stats, 'initial_plan'):
+        name = initial_plan(table, initial)
+    if trace is not None:
+        trace.message(f"Опорный план: {name} ({(time.perf_counter() - started) * 1000:.1f} мс)<br/>")
+        trace.message(f"Расчет стоимости опорного плана:<br/>")
+        trace.message(f" > F = {trace.cost(calculate_minimal_cost(table))}<br/>")
+
+    degenerate = is_degenerate(table)
+    with measure(stats, 'remove_degenerate'):
+        remove_degenerate(table)
+    if trace is not None and degenerate:
+        trace.message("Таблица вырождена<br/>Добавляем нулевые элементы")
+        trace.snapshot(table)
+    elif trace is not None:
+        trace.message(f"Таблица не вырождена<br/>")
+    return 'simplex'
+
+
+@dataclass
+class Solution:
+    """
+    Результат решения транспортной задачи
+    """
+    cost: int | float
+    optimal: bool
+    feasible: bool
+    pivots: int
+    degenerate_pivots: int
+    lower_bound: int | float
+    elapsed: float
+    table: Table | SparseTable = field(repr=False)
+    # масштаб точного режима: таблица хранит значения в целых числах
+    scale: ScaledProblem | None = field(default=None, repr=False)
+    # статистика решения, если она собиралась
+    stats: SolveStats | None = field(default=None, repr=False)
+    # метод, построивший план до метода потенциалов (см. FLOW_ENGINES)
+    engine: str = 'simplex'
+
+    def set_scale(self, scale: ScaledProblem) -> None:
+        """
+        Перевод стоимости и нижней границы точного режима в исходные единицы
+
+        :param scale: масштаб задачи (см. scale_problem)
+        :return:
+        """
+        self.cost = scale.cost(self.cost)
+        self.lower_bound = scale.cost(self.lower_bound)
+        self.scale = scale
+
+    @property
+    def gap(self) -> int | float:
+        """
+        Разрыв между стоимостью плана и нижней границей
+        (0 для оптимального плана)
+
+        :return:
+        """
+        return 0 if self.optimal else max(self.cost - self.lower_bound, 0)
+
+    @property
+    def relative_gap(self) -> float:
+        """
+        Разрыв относительно стоимости плана
+
+        :return:
+        """
+        return self.gap / max(abs(self.cost), 1)
+
+    @property
+    def matrix(self) -> list[list[int | None]]:
+        """
+        План в виде Table.as_matrix() (с фиктивными строками/столбцами)
+        в исходных единицах
+
+        :return:
+        """
+        matrix = self.table.as_matrix()
+        if self.scale is None:
+            return matrix
+        return [[self.scale.amount(value) if value is not None else None for value in row] for row in matrix]
+
+    @property
+    def potentials(self) -> tuple[list[int | float], list[int | float]]:
+        """
+        Потенциалы строк и столбцов (с фиктивными) в исходных единицах
+
+        :return:
+        """
+        potentials = self.table.tree.potentials
+        if self.scale is not None:
+            potentials = [self.scale.potential(value) for value in potentials]
+        return potentials[:self.table.rows], potentials[self.table.rows:]
+
+    def sensitivity(self, rows: int | None = None, columns: int | None = None) -> Sensitivity:
+        """
+        Анализ чувствительности по оптимальному базису (см. analyze_sensitivity)
+
+        :param rows: количество строк исходной задачи (без фиктивных)
+        :param columns: количество столбцов исходной задачи
+        :return:
+        """
+        if not self.optimal:
+            raise ValueError('Анализ чувствительности требует оптимального плана')
+        return analyze_sensitivity(self.table, self.scale, rows, columns)
+
+    def plan(self, rows: int | None = None, columns: int | None = None) -> list[list[int | float]]:
+        """
+        Объемы перевозок (0 для свободных клеток)
+
+        :param rows: количество строк исходной задачи (без фиктивных)
+        :param columns: количество столбцов исходной задачи
+        :return:
+        """
+        return [
+            [amount or 0 for amount in row[1:][:columns]]
+            for row in self.matrix[1:][:rows]
+        ]
+
+    def shipments(self, rows: int | None = None, columns: int | None = None) -> list[tuple[int, int, int | float]]:
+        """
+        Ненулевые перевозки (строка, столбец, объем) - компактная форма плана
+        больших задач, для которых матрица plan() слишком велика
+
+        :param rows: количество строк исходной задачи (без фиктивных)
+        :param columns: количество столбцов исходной задачи
+        :return:
+        """
+        rows = self.table.rows if rows is None else rows
+        columns = self.table.columns if columns is None else columns
+        result = []
+        for cell in self.table.basic_cells():
+            row, column = self.table.endpoints(cell)
+            amount = scalar(self.table.amounts[cell])
+            if row < rows and column < columns and amount:
+                result.append((row, column, self.scale.amount(amount) if self.scale is not None else amount))
+        return result
+
+
+def solve_table(
+        table: Table | SparseTable,
+        pricing: str = 'dantzig',
+        max_pivots: int | None = None,
+        time_limit: float | None = None,
+        stats: SolveStats | None = None,
+        trace: Trace | None = None,
+        cancelled: Callable[[], bool] | None = None,
+        progress: Callable[[int], None] | None = None,
+        progress_interval: float = 0.1
+) -> Solution | None:
+    """
+    Оптимизация подготовленной таблицы (см. prepare_table) сетевым симплекс-методом.
+    При исчерпании бюджета возвращается лучший найденный план
+    с нижней границей по текущим потенциалам.
+
+    :param table:
+    :param pricing: ключ из PRICING_RULES
+    :param max_pivots: ограничение числа итераций
+    :param time_limit: ограничение времени, с
+    :param stats: статистика решения (None - без замеров)
+    :param trace: протокол решения: итерации и их итог (None - без протокола)
+    :param cancelled: проверяется перед каждой итерацией, True - прервать решение
+    :param progress: получает число выполненных итераций (не чаще progress_interval)
+    :param progress_interval: интервал между вызовами progress, с
+    :return: решение или None, если решение прервано (cancelled)
+    """
+    started = reported = time.perf_counter()
+    simplex = NetworkSimplex(table, pricing=pricing, stats=stats)
+
+    def on_pivot(method: NetworkSimplex) -> None:
+        nonlocal reported
+        if progress is not None and time.perf_counter() - reported >= progress_interval:
+            reported = time.perf_counter()
+            progress(method.pivots)
+        if trace is not None and trace.enabled('pivots'):
+            _, cycle, theta = method.last_pivot
+            trace.pivot(method.pivots, cycle, theta, calculate_minimal_cost(table), table)
+
+    traced = progress is not None or (trace is not None and trace.enabled('pivots'))
+    optimal = simplex.run(max_pivots, cancelled, time_limit, on_pivot if traced else None)
+    if cancelled is not None and cancelled():
+        return None
+    if trace is not None:
+        trace.message(
+            f" > Итераций метода потенциалов: {simplex.pivots} "
+            f"({(time.perf_counter() - started) * 1000:.1f} мс), "
+            f"правило: {PRICING_RULES[pricing][0]}, "
+            f"из них вырожденных: {simplex.degenerate_pivots}, "
+            f"по правилу Бланда: {simplex.pivot_counts['bland']}<br/>"
+        )
+
+    cost = calculate_minimal_cost(table)
+    return Solution(
+        cost=cost,
+        optimal=optimal,
+        feasible=table.is_feasible() if isinstance(table, SparseTable) else True,
+        pivots=simplex.pivots,
+        degenerate_pivots=simplex.degenerate_pivots,
+        lower_bound=cost if optimal else simplex.lower_bound(),
+        elapsed=time.perf_counter() - started,
+        table=table,
+        stats=stats,
+    )
+
+
+def solve(
+        a: list[int],
+        b: list[int],
+        c: list[list[int | None]],
+        initial: str = 'nwc',
+        pricing: str = 'dantzig',
+        max_pivots: int | None = None,
+        previous: Solution | None = None,
+        time_limit: float | None = None,
+        exact: bool = False,
+        stats: SolveStats | None = None,
+        engine: str = 'simplex'
+) -> Solution:
+    """
+    Решение транспортной задачи.
+    Если передано предыдущее решение задачи тех же размеров,
+    оптимизация продолжается от его базиса (см. warm_start).
+
+    В точном режиме данные (целые, десятичные, дроби "p/q") приводятся
+    к общим знаменателям и задача решается в целых числах; стоимость
+    и план возвращаются в исходных единицах (int, float или Fraction).
+
+    :param a: ресурсы
+    :param b: потребности
+    :param c: стоимости (None - запрещенный маршрут)
+    :param initial: метод построения опорного плана
+    :param pricing: правило выбора вводимой клетки
+    :param max_pivots: ограничение числа итераций
+    :param previous: предыдущее решение для теплого старта
+    :param time_limit: ограничение времени оптимизации, с
+    :param exact: точный режим (см. scale_problem)
+    :param stats: статистика решения, сохраняется в Solution.stats (None - без замеров)
+    :param engine: метод оптимизации: ключ из FLOW_ENGINES или 'auto' (см. select_engine);
+        результат всегда проверяется методом потенциалов
+    :return:
+    """
+    if stats is not None:
+        with stats.tracking():
+            return _solve(a, b, c, initial, pricing, max_pivots, previous, time_limit, exact, stats, engine)
+    return _solve(a, b, c, initial, pricing, max_pivots, previous, time_limit, exact, None, engine)
+
+
+def _solve(a, b, c, initial, pricing, max_pivots, previous, time_limit, exact, stats, engine) -> Solution:
+    scale = scale_problem(a, b, c) if exact else None
+    if scale is not None:
+        a, b, c = scale.a, scale.b, scale.c
+
+    table = None
+    if previous is not None:
+        started = time.perf_counter()
+        table = warm_start(previous.table, a, b, c)
+        if stats is not None:
+            stats.add('warm_start', time.perf_counter() - started)
+    used = 'simplex'
+    if table is None:
+        table = make_table(a, b, c, dtype=scale.dtype if scale is not None else None)
+        used = prepare_table(table, initial, stats, engine)
+    solution = solve_table(table, pricing=pricing, max_pivots=max_pivots, time_limit=time_limit, stats=stats)
+    solution.engine = used
+
+    if scale is not None:
+        solution.set_scale(scale)
+    return solution
+
+
+def solve_mapped(
+        costs: str,
+        supply: str,
+        demand: str,
+        dtype: str | None = None,
+        pricing: str = 'block',
+        max_pivots: int | None = None,
+        time_limit: float | None = None,
+        stats: SolveStats | None = None
+) -> Solution:
+    """
+    Решение задачи с матрицей стоимостей в файле .npy или двоичном файле
+    без загрузки матрицы в память (см. load_table, MappedTable).
+
+    Опорный план строится методом северо-западного угла: остальные методы
+    просматривают всю матрицу на каждом шаге. Правило по умолчанию - блочный
+    поиск: за итерацию читается несколько строк матрицы, а не вся она.
+    План больших задач удобнее получать через Solution.shipments()
+
+    :param costs: файл стоимостей
+    :param supply: файл ресурсов (.npy, .txt, .csv или двоичный)
+    :param demand: файл потребностей
+    :param dtype: тип двоичных файлов (например, 'int32', '<f8')
+    :param pricing: ключ из PRICING_RULES
+    :param max_pivots: ограничение числа итераций
+    :param time_limit: ограничение времени оптимизации, с
+    :param stats: статистика решения (None - без замеров)
+    :return:
+    """
+    table = load_table(costs, supply, demand, dtype)
+    prepare_table(table, 'nwc', stats)
+    return solve_table(table, pricing=pricing, max_pivots=max_pivots, time_limit=time_limit, stats=stats)
@@ -0,0 +1,674 @@
+import copy
+
+import numpy as np
+
+from src.model.transport_solution.dsu import DisjointSet
+from src.model.transport_solution.numeric import noise_tolerance
+from src.model.transport_solution.numeric import scalar
+from src.model.transport_solution.table import _dtype
+from src.model.transport_solution.table import dual_bound
+from src.model.transport_solution.tree import BasisTree
+
+
+class SparseTable:
+    """
+    Транспортная таблица с разрешенными маршрутами.
+
+    Хранит только разрешенные маршруты (дуги) в виде списка
+    (строка, столбец, стоимость), упорядоченного по строкам (CSR).
+    Клетка таблицы - номер дуги, поэтому память и время расчета
+    зависят от числа маршрутов, а не от rows x columns.
+
+    Если ограничения маршрутов не позволяют построить опорный план,
+    добавляются искусственные дуги со штрафной стоимостью big_m
+    (метод больших штрафов). Положительный объем на искусственной
+    дуге в оптимальном плане означает, что задача неразрешима.
+    """
+
+    def __init__(
+            self,
+            a: list[int],
+            b: list[int],
+            arcs: list[tuple[int, int, int]],
+            dtype: np.dtype | None = None
+    ):
+        arc_rows = np.array([arc[0] for arc in arcs], dtype=np.intp)
+        arc_columns = np.array([arc[1] for arc in arcs], dtype=np.intp)
+        order = np.lexsort((arc_columns, arc_rows))
+        costs = [arc[2] for arc in arcs]
+        self._allocate(
+            a, b, arc_rows[order], arc_columns[order], np.array(costs, dtype=dtype or _dtype(costs))[order],
+            dtype=dtype
+        )
+
+    def _allocate(
+            self,
+            a: list[int],
+            b: list[int],
+            arc_rows: np.ndarray,
+            arc_columns: np.ndarray,
+            costs: np.ndarray,
+            artificial: np.ndarray | None = None,
+            dtype: np.dtype | None = None
+    ) -> None:
+        """
+        Буферы таблицы с маршрутами, упорядоченными по строкам (массивы
+        маршрутов не копируются): нулевые объемы, пустой базис и дельты
+
+        :param a: ресурсы
+        :param b: потребности
+        :param arc_rows: строки маршрутов
+        :param arc_columns: столбцы маршрутов
+        :param costs: стоимости маршрутов
+        :param artificial: маска искусственных маршрутов (None - нет искусственных)
+        :param dtype: тип ресурсов и потребностей (по умолчанию - по значениям)
+        :return:
+        """
+        self._resources = np.array(a, dtype=dtype or _dtype(a))
+        self._needs = np.array(b, dtype=dtype or _dtype(b))
+
+        self._arc_rows = arc_rows
+        self._arc_columns = arc_columns
+        self._costs = costs
+        self._amounts = np.zeros(len(costs), dtype=np.result_type(self._resources, self._needs))
+        self._basis = np.zeros(len(costs), dtype=bool)
+        self._deltas = np.zeros(len(costs), dtype=costs.dtype)
+        self._artificial = np.zeros(len(costs), dtype=bool) if artificial is None else artificial
+        self._basic_count = 0
+        self._tree: BasisTree | None = None
+        self._index: dict[tuple[int, int], int] | None = None
+        # порог шума дельт по стоимостям разрешенных маршрутов (см. noise_tolerance)
+        self._tolerance: int | float | None = None
+
+    @classmethod
+    def from_dense(
+            cls,
+            a: list[int],
+            b: list[int],
+            c: list[list[int | None]],
+            dtype: np.dtype | None = None
+    ) -> 'SparseTable':
+        """
+        Таблица из матрицы стоимостей, в которой None - запрещенный маршрут
+
+        :param a:
+        :param b:
+        :param c:
+        :param dtype: тип буферов (см. Table)
+        :return:
+        """
+        return cls(a, b, [
+            (i, j, cost) for i, row in enumerate(c) for j, cost in enumerate(row) if cost is not None
+        ], dtype=dtype)
+
+    @classmethod
+    def from_csr(
+            cls,
+            a: list[int],
+            b: list[int],
+            indptr: list[int],
+            indices: list[int],
+            data: list[int],
+            dtype: np.dtype | None = None
+    ) -> 'SparseTable':
+        """
+        Таблица из матрицы стоимостей в формате CSR:
+        маршруты строки i - indices[indptr[i]:indptr[i + 1]]
+        со стоимостями data[indptr[i]:indptr[i + 1]]
+
+        :param dtype: тип буферов (см. Table)
+        :return:
+        """
+        rows = np.repeat(np.arange(len(a)), np.diff(indptr))
+        return cls(a, b, list(zip(rows.tolist(), list(indices), list(data))), dtype=dtype)
+
+    @property
+    def rows(self) -> int:
+        return len(self._resources)
+
+    @property
+    def columns(self) -> int:
+        return len(self._needs)
+
+    @property
+    def needs(self) -> list[int]:
+        """
+        Строка потребностей (B)
+
+        :return:
+        """
+        return self._needs.tolist()
+
+    @property
+    def resources(self) -> list[int]:
+        """
+        Столбец ресурсов (A)
+
+        :return:
+        """
+        return self._resources.tolist()
+
+    @property
+    def costs(self) -> np.ndarray:
+        """
+        Стоимости маршрутов
+
+        :return:
+        """
+        return self._costs
+
+    @property
+    def amounts(self) -> np.ndarray:
+        """
+        Объемы перевозок по маршрутам (для небазисных - 0)
+
+        :return:
+        """
+        return self._amounts
+
+    @property
+    def basis(self) -> np.ndarray:
+        """
+        Маска базисных маршрутов
+
+        :return:
+        """
+        return self._basis
+
+    @property
+    def deltas(self) -> np.ndarray:
+        """
+        Дельты маршрутов
+
+        :return:
+        """
+        return self._deltas
+
+    @property
+    def arc_rows(self) -> np.ndarray:
+        return self._arc_rows
+
+    @property
+    def arc_columns(self) -> np.ndarray:
+        return self._arc_columns
+
+    @property
+    def artificial(self) -> np.ndarray:
+        """
+        Маска искусственных маршрутов (метод больших штрафов)
+
+        :return:
+        """
+        return self._artificial
+
+    @property
+    def basic_count(self) -> int:
+        return self._basic_count
+
+    @property
+    def size(self) -> int:
+        """
+        Количество маршрутов
+
+        :return:
+        """
+        return len(self._costs)
+
+    @property
+    def big_m(self) -> int | float:
+        """
+        Штрафная стоимость искусственного маршрута: больше изменения
+        стоимости плана при переносе единицы груза по любому циклу
+
+        :return:
+        """
+        real = self._costs[~self._artificial]
+        largest = scalar(np.abs(real).max()) if len(real) else 0
+        return 2 * (self.rows + self.columns) * (largest + 1)
+
+    @property
+    def tree(self) -> BasisTree:
+        """
+        Остовное дерево базиса с потенциалами (см. Table.tree)
+
+        :return:
+        """
+        if self._tree is None:
+            self._tree = BasisTree(self)
+        return self._tree
+
+    @resources.setter
+    def resources(self, value: list[int]):
+        if len(value) < self.rows:
+            raise ValueError('Невозможно уменьшить количество потребностей')
+
+        first = self.rows
+        self._resources = np.array(value, dtype=np.result_type(self._resources, _dtype(value)))
+        # Новые (фиктивные) поставщики связаны со всеми потребителями
+        rows = np.repeat(np.arange(first, self.rows), self.columns)
+        columns = np.tile(np.arange(self.columns), self.rows - first)
+        self.add_arcs(rows, columns, np.zeros(len(rows), dtype=self._costs.dtype))
+
+    @needs.setter
+    def needs(self, value: list[int]):
+        if len(value) < self.columns:
+            raise ValueError('Невозможно уменьшить количество ресурсов')
+
+        first = self.columns
+        self._needs = np.array(value, dtype=np.result_type(self._needs, _dtype(value)))
+        # Новые (фиктивные) потребители связаны со всеми поставщиками
+        rows = np.repeat(np.arange(self.rows), self.columns - first)
+        columns = np.tile(np.arange(first, self.columns), self.rows)
+        self.add_arcs(rows, columns, np.zeros(len(rows), dtype=self._costs.dtype))
+
+    def add_arcs(
+            self,
+            rows: np.ndarray,
+            columns: np.ndarray,
+            costs: np.ndarray,
+            artificial: bool = False
+    ) -> np.ndarray:
+        """
+        Добавление маршрутов с сохранением порядка по строкам (CSR):
+        новые маршруты вставляются на свои места, номера остальных
+        маршрутов сдвигаются
+
+        :return: номера добавленных маршрутов (в порядке rows, columns)
+        """
+        rows = np.asarray(rows, dtype=np.intp)
+        columns = np.asarray(columns, dtype=np.intp)
+        costs = np.asarray(costs)
+        keys = rows * self.columns + columns
+        order = np.argsort(keys, kind='stable')
+        # вставка после маршрутов с тем же или меньшим ключом
+        positions = np.searchsorted(self._arc_rows * self.columns + self._arc_columns, keys[order], side='right')
+
+        def insert(buffer: np.ndarray, values: np.ndarray) -> np.ndarray:
+            return np.insert(buffer.astype(np.result_type(buffer, values), copy=False), positions, values[order])
+
+        added = len(rows)
+        self._arc_rows = insert(self._arc_rows, rows)
+        self._arc_columns = insert(self._arc_columns, columns)
+        self._costs = insert(self._costs, costs)
+        self._amounts = insert(self._amounts, np.zeros(added, dtype=np.result_type(self._resources, self._needs)))
+        self._basis = insert(self._basis, np.zeros(added, dtype=bool))
+        self._deltas = insert(self._deltas, np.zeros(added, dtype=self._costs.dtype))
+        self._artificial = insert(self._artificial, np.full(added, artificial))
+        self._tree = None
+        self._index = None
+
+        cells = np.empty(added, dtype=np.intp)
+        cells[order] = positions + np.arange(added)
+        return cells
+
+    def update(self, a: list[int], b: list[int], c: list[list[int | None]] | None = None) -> None:
+        """
+        Замена ресурсов, потребностей и стоимостей при неизменном базисе
+        (см. Table.update). Стоимости берутся из матрицы c для
+        неискусственных маршрутов.
+
+        :param a:
+        :param b:
+        :param c: стоимости (None - без изменений)
+        :return:
+        """
+        self._resources = np.array(a, dtype=np.result_type(self._resources, _dtype(a)))
+        self._needs = np.array(b, dtype=np.result_type(self._needs, _dtype(b)))
+        if c is not None:
+            real = np.flatnonzero(~self._artificial)
+            costs = [
+                c[row][column] for row, column in zip(self._arc_rows[real].tolist(), self._arc_columns[real].tolist())
+            ]
+            self._costs = self._costs.astype(np.result_type(self._costs, _dtype(costs)), copy=False)
+            self._costs[real] = costs
+            self._costs[self._artificial] = self.big_m
+        self._amounts = self._amounts.astype(np.result_type(self._resources, self._needs), copy=False)
+        self._deltas = self._deltas.astype(self._costs.dtype, copy=False)
+        self._tree = None
+        self._tolerance = None
+
+    def set_plan(self, amounts: np.ndarray, basis: np.ndarray) -> None:
+        """
+        Установка плана и базиса из буферов другой таблицы
+        с теми же маршрутами (см. Table.set_plan)
+
+        :param amounts: объемы перевозок
+        :param basis: маска базисных маршрутов
+        :return:
+        """
+        self._amounts = amounts.astype(np.result_type(self._resources, self._needs, amounts))
+        self._basis = basis.copy()
+        self._basic_count = int(np.count_nonzero(basis))
+        self._tree = None
+
+    def change_costs(
+            self,
+            factor: int | float = 1,
+            changes: dict[tuple[int, int], int | float | None] | None = None
+    ) -> None:
+        """
+        Изменение стоимостей при неизменном базисе (см. Table.change_costs).
+        Закрытый маршрут (None) остается в таблице искусственным
+        со штрафом big_m, новый маршрут добавляется свободным
+
+        :param factor: множитель стоимостей
+        :param changes: новые стоимости маршрутов {(строка, столбец): стоимость или None}
+        :return:
+        """
+        changes = changes or {}
+        values = [value for value in changes.values() if value is not None]
+        dtype = np.result_type(self._costs, _dtype([factor, *values]))
+        self._costs = self._costs.astype(dtype, copy=False)
+        if factor != 1:
+            self._costs *= factor
+
+        added = []
+        for (row, column), value in changes.items():
+            cell = self.find(row, column)
+            if cell is None:
+                if value is not None:
+                    added.append((row, column, value))
+                continue
+            self._artificial[cell] = value is None
+            if value is not None:
+                self._costs[cell] = value
+        if added:
+            rows, columns, costs = zip(*added)
+            self.add_arcs(np.array(rows), np.array(columns), np.array(costs, dtype=dtype))
+        self._costs[self._artificial] = self.big_m
+        self._deltas = self._deltas.astype(dtype, copy=False)
+        self._tree = None
+        self._tolerance = None
+
+    def crossing(self, rows: np.ndarray, columns: np.ndarray) -> np.ndarray:
+        """
+        Маска маршрутов, строка которых отмечена в rows, а столбец - в columns
+
+        :param rows: маска строк
+        :param columns: маска столбцов
+        :return:
+        """
+        return rows[self._arc_rows] & columns[self._arc_columns]
+
+    def copy(self) -> 'SparseTable':
+        return copy.deepcopy(self)
+
+    def endpoints(self, cell: int) -> tuple[int, int]:
+        """
+        Строка и столбец маршрута
+
+        :param cell:
+        :return:
+        """
+        return int(self._arc_rows[cell]), int(self._arc_columns[cell])
+
+    def cell_at(self, index: int) -> int:
+        return int(index)
+
+    def cell_index(self, cells: list[int]) -> np.ndarray:
+        return np.array(cells, dtype=np.intp)
+
+    def find(self, row: int, column: int) -> int | None:
+        """
+        Номер маршрута между строкой и столбцом (None, если маршрут запрещен)
+
+        :param row:
+        :param column:
+        :return:
+        """
+        if self._index is None:
+            self._index = {
+                cell: k for k, cell in enumerate(zip(self._arc_rows.tolist(), self._arc_columns.tolist()))
+            }
+        return self._index.get((row, column))
+
+    def get_amount(self, row: int, column: int) -> int | float | None:
+        """
+        Объем перевозки клетки, None для свободной или запрещенной клетки
+
+        :param row:
+        :param column:
+        :return:
+        """
+        cell = self.find(row, column)
+        if cell is None or not self._basis[cell] or self._artificial[cell]:
+            return None
+        return scalar(self._amounts[cell])
+
+    def set_basic(self, cell: int, amount: int | float) -> None:
+        if not self._basis[cell]:
+            self._basis[cell] = True
+            self._basic_count += 1
+            self._tree = None
+        self._amounts[cell] = amount
+
+    def set_free(self, cell: int) -> None:
+        if self._basis[cell]:
+            self._basis[cell] = False
+            self._basic_count -= 1
+            self._tree = None
+        self._amounts[cell] = 0
+
+    def pivot(self, entering: int, leaving: int) -> None:
+        """
+        Замена базисного маршрута leaving на entering (см. Table.pivot)
+
+        :param entering:
+        :param leaving:
+        :return:
+        """
+        if entering == leaving:
+            return
+
+        self._basis[entering] = True
+        self._basis[leaving] = False
+        self._amounts[leaving] = 0
+        if self._tree is not None:
+            self._tree.pivot(entering, leaving)
+
+    def basic_cells(self) -> list[int]:
+        return np.flatnonzero(self._basis).tolist()
+
+    def reduced_costs(self, u: np.ndarray, v: np.ndarray, start: int = 0, stop: int | None = None) -> np.ndarray:
+        """
+        Дельты маршрутов [start, stop), для базисных - 0.
+        Полный расчет сохраняется в deltas.
+
+        :param u: потенциалы строк
+        :param v: потенциалы столбцов
+        :param start:
+        :param stop:
+        :return:
+        """
+        window = slice(start, stop)
+        if start == 0 and stop is None:
+            self._tolerance = None
+        deltas = self._costs[window] - u[self._arc_rows[window]] - v[self._arc_columns[window]]
+        deltas[self._basis[window]] = 0
+        self._snap(deltas)
+        if start == 0 and stop is None:
+            self._deltas[...] = deltas
+        return deltas
+
+    def reduced_costs_of(self, u: np.ndarray, v: np.ndarray, cells: np.ndarray) -> np.ndarray:
+        deltas = self._costs[cells] - u[self._arc_rows[cells]] - v[self._arc_columns[cells]]
+        deltas[self._basis[cells]] = 0
+        self._snap(deltas)
+        return deltas
+
+    def _snap(self, deltas: np.ndarray) -> None:
+        """
+        Обнуление дельт, меньших порога шума (см. noise_tolerance)
+        """
+        if self._tolerance is None:
+            self._tolerance = noise_tolerance(self._costs[~self._artificial])
+        if self._tolerance:
+            deltas[np.abs(deltas) <= self._tolerance] = 0
+
+    def lower_bound(self, u: np.ndarray, v: np.ndarray) -> int | float:
+        """
+        Нижняя граница стоимости оптимального плана (см. utils.lower_bound).
+        Искусственные маршруты не ограничивают стоимость допустимого плана
+
+        :param u: потенциалы строк
+        :param v: потенциалы столбцов
+        :return:
+        """
+        real = ~self._artificial
+        return dual_bound(self, self._arc_rows[real], self._arc_columns[real], self._costs[real], u, v)
+
+    def cell_cost(self, cell: int) -> int | float:
+        """
+        Стоимость маршрута (см. Table.cell_cost)
+
+        :param cell:
+        :return:
+        """
+        return scalar(self._costs[cell])
+
+    def plan_cost(self) -> int | float:
+        """
+        Стоимость плана по разрешенным маршрутам: искусственные
+        маршруты не учитываются (см. utils.calculate_minimal_cost)
+
+        :return:
+        """
+        counted = self._basis & ~self._artificial
+        return scalar((self._costs[counted] * self._amounts[counted]).sum())
+
+    def is_feasible(self) -> bool:
+        """
+        План не использует искусственные маршруты
+
+        :return:
+        """
+        return not (self._amounts[self._artificial] > 0).any()
+
+    def as_matrix(self) -> list[list[int | None]]:
+        matrix = [[None] * self.columns for _ in range(self.rows)]
+        for cell in np.flatnonzero(self._basis & ~self._artificial).tolist():
+            row, column = self.endpoints(cell)
+            matrix[row][column] = scalar(self._amounts[cell])
+        return [
+            [None, *self.needs],
+            *[[resource, *row] for resource, row in zip(self.resources, matrix)]
+        ]
+
+    def as_graph(self) -> dict[str, dict[str, int | float]]:
+        """
+        Список смежности двудольного графа разрешенных маршрутов:
+        {'A1': {'B1': стоимость, ...}, ...}
+
+        :return:
+        """
+        graph = {f'A{i + 1}': {} for i in range(self.rows)}
+        real = ~self._artificial
+        for row, column, cost in zip(
+                self._arc_rows[real].tolist(), self._arc_columns[real].tolist(), self._costs[real].tolist()
+        ):
+            graph[f'A{row + 1}'][f'B{column + 1}'] = cost
+        return graph
+
+
+def sparse_least_cost(table: SparseTable) -> None:
+    """
+    Метод минимального элемента по разрешенным маршрутам.
+    Остатки ресурсов и потребностей, которые нельзя распределить
+    по разрешенным маршрутам, распределяются по искусственным.
+
+    :param table:
+    :return:
+    """
+    needs = table.needs
+    resources = table.resources
+
+    for cell in np.argsort(table.costs, kind='stable').tolist():
+        i, j = table.endpoints(cell)
+        if resources[i] == 0 or needs[j] == 0:
+            continue
+
+        amount = min(resources[i], needs[j])
+        table.set_basic(cell, amount)
+        resources[i] -= amount
+        needs[j] -= amount
+
+    # Искусственные маршруты для нераспределенных остатков
+    big_m = table.big_m
+    i, j = 0, 0
+    while i < table.rows and j < table.columns:
+        if resources[i] == 0:
+            i += 1
+            continue
+        if needs[j] == 0:
+            j += 1
+            continue
+
+        amount = min(resources[i], needs[j])
+        cell = table.add_arcs(
+            np.array([i]), np.array([j]), np.array([big_m], dtype=table.costs.dtype), artificial=True
+        )[0]
+        table.set_basic(cell, amount)
+        resources[i] -= amount
+        needs[j] -= amount
+
+
+def sparse_remove_degenerate(table: SparseTable) -> None:
+    """
+    Достраивание базиса разреженной таблицы до остовного дерева.
+
+    Сначала добавляются самые дешевые разрешенные маршруты, соединяющие
+    разные компоненты, затем (если граф маршрутов несвязен) - искусственные.
+
+    :param table:
+    :return:
+    """
+    if table.basic_count >= table.rows + table.columns - 1:
+        return
+
+    rows = table.rows
+    components = DisjointSet(rows + table.columns)
+    for cell in table.basic_cells():
+        i, j = table.endpoints(cell)
+        components.union(i, rows + j)
+
+    missing = rows + table.columns - 1 - table.basic_count
+    for cell in np.argsort(table.costs, kind='stable').tolist():
+        if missing == 0:
+            return
+        if table.basis[cell]:
+            continue
+        i, j = table.endpoints(cell)
+        if components.union(i, rows + j):
+            table.set_basic(cell, 0)
+            missing -= 1
+
+    # Граф маршрутов несвязен: компоненты соединяются искусственными
+    # маршрутами с компонентой строки A1 - сначала через свой столбец,
+    # затем оставшиеся одиночные строки через любой столбец этой компоненты
+    component_row: dict[int, int] = {}
+    component_column: dict[int, int] = {}
+    for node in range(rows + table.columns):
+        root = components.find(node)
+        if node < rows:
+            component_row.setdefault(root, node)
+        else:
+            component_column.setdefault(root, node - rows)
+
+    big_m = table.big_m
+    connections = []
+    for column in component_column.values():
+        if components.union(0, rows + column):
+            connections.append((0, column))
+    main_column = next(iter(component_column.values()))
+    for row in component_row.values():
+        if components.union(row, rows + main_column):
+            connections.append((row, main_column))
+
+    if connections:
+        connection_rows, connection_columns = zip(*connections)
+        cells = table.add_arcs(
+            np.array(connection_rows), np.array(connection_columns),
+            np.full(len(connections), big_m, dtype=table.costs.dtype), artificial=True
+        )
+        for cell in cells.tolist():
+            table.set_basic(cell, 0)
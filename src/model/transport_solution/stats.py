@@ -0,0 +1,157 @@
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+
+# Этапы решения: ключ -> название
+PHASES: dict[str, str] = {
+    'build': 'Построение таблицы',
+    'warm_start': 'Теплый старт',
+    'balance': 'Балансировка',
+    'initial_plan': 'Опорный план',
+    'remove_degenerate': 'Устранение вырожденности',
+    'flow_engine': 'Оптимальный план другим методом',
+    'pricing': 'Выбор вводимой клетки',
+    'cycle_search': 'Поиск цикла',
+    'pivot': 'Пересчет плана и потенциалов',
+    'lower_bound': 'Нижняя граница',
+}
+
+
+class SolveStats:
+    """
+    Статистика решения: время этапов (с), счетчики итераций
+    и длин циклов, пиковая память (tracemalloc).
+
+    Сбор включается передачей объекта в solve / NetworkSimplex; без него
+    решатель не замеряет ничего. Замер памяти заметно замедляет решение,
+    поэтому включается отдельно (memory=True).
+    """
+
+    def __init__(self, memory: bool = False):
+        """
+        :param memory: замерять пиковую память
+        """
+        self.memory = memory
+        self.phases: dict[str, float] = {}
+        self.pivots = 0
+        self.degenerate_pivots = 0
+        self.bland_pivots = 0
+        self.cycle_length_total = 0
+        self.cycle_length_max = 0
+        self.peak_memory: int | None = None
+
+    @property
+    def total(self) -> float:
+        return sum(self.phases.values())
+
+    @property
+    def cycle_length_mean(self) -> float:
+        return self.cycle_length_total / self.pivots if self.pivots else 0.0
+
+    def add(self, phase: str, seconds: float) -> None:
+        """
+        Добавление времени к этапу
+
+        :param phase: ключ из PHASES
+        :param seconds:
+        :return:
+        """
+        self.phases[phase] = self.phases.get(phase, 0.0) + seconds
+
+    @contextmanager
+    def phase(self, name: str):
+        """
+        Замер этапа: with stats.phase('balance'): ...
+
+        :param name: ключ из PHASES
+        :return:
+        """
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - started)
+
+    def pivot(self, cycle_length: int, degenerate: bool, bland: bool) -> None:
+        """
+        Учет итерации метода потенциалов
+
+        :param cycle_length: число клеток цикла пересчета
+        :param degenerate: theta = 0
+        :param bland: клетка выбрана по правилу Бланда
+        :return:
+        """
+        self.pivots += 1
+        self.degenerate_pivots += degenerate
+        self.bland_pivots += bland
+        self.cycle_length_total += cycle_length
+        self.cycle_length_max = max(self.cycle_length_max, cycle_length)
+
+    @contextmanager
+    def tracking(self):
+        """
+        Замер пиковой памяти блока (если memory=True).
+        Если tracemalloc уже запущен, он не останавливается после блока.
+
+        :return:
+        """
+        if not self.memory:
+            yield
+            return
+        started = not tracemalloc.is_tracing()
+        if started:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        try:
+            yield
+        finally:
+            peak = tracemalloc.get_traced_memory()[1]
+            self.peak_memory = max(self.peak_memory or 0, peak)
+            if started:
+                tracemalloc.stop()
+
+    def as_dict(self) -> dict:
+        """
+        Статистика для JSON
+
+        :return:
+        """
+        return {
+            'phases': dict(self.phases),
+            'total': self.total,
+            'pivots': self.pivots,
+            'degenerate_pivots': self.degenerate_pivots,
+            'bland_pivots': self.bland_pivots,
+            'cycle_length_mean': self.cycle_length_mean,
+            'cycle_length_max': self.cycle_length_max,
+            'peak_memory': self.peak_memory,
+        }
+
+    def render(self) -> str:
+        """
+        Статистика в HTML для консоли
+
+        :return:
+        """
+        lines = ["Профиль решения:"]
+        for phase, seconds in self.phases.items():
+            lines.append(f" > {PHASES.get(phase, phase)}: {seconds * 1000:.2f} мс")
+        lines.append(
+            f" > Итераций: {self.pivots}, вырожденных: {self.degenerate_pivots}, "
+            f"по правилу Бланда: {self.bland_pivots}"
+        )
+        lines.append(f" > Длина цикла: средняя {self.cycle_length_mean:.1f}, наибольшая {self.cycle_length_max}")
+        if self.peak_memory is not None:
+            lines.append(f" > Пиковая память: {self.peak_memory / 1024:.1f} КБ")
+        return '<br/>'.join(lines) + '<br/>'
+
+
+def measure(stats: SolveStats | None, phase: str):
+    """
+    Замер этапа, если статистика собирается: with measure(stats, 'balance'): ...
+
+    :param stats:
+    :param phase: ключ из PHASES
+    :return:
+    """
+    return stats.phase(phase) if stats is not None else nullcontext()
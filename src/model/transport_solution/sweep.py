@@ -0,0 +1,573 @@
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from multiprocessing.shared_memory import SharedMemory
+from typing import Iterable, Iterator
+
+import numpy as np
+
+from src.model.transport_solution.numeric import scalar
+from src.model.transport_solution.solver import solve
+from src.model.transport_solution.solver import solve_table
+from src.model.transport_solution.sparse import SparseTable
+from src.model.transport_solution.table import Table
+from src.model.transport_solution.table import dual_bound
+from src.model.transport_solution.warm import repair
+
+
+@dataclass
+class Scenario:
+    """
+    Сценарий "что если" - отличия от базовой задачи:
+    множитель всех стоимостей (например, цена топлива), отдельные
+    стоимости (None - маршрут закрыт), ресурсы (0 - выбыл поставщик)
+    и потребности
+    """
+    name: str
+    cost_multiplier: int | float = 1
+    costs: dict[tuple[int, int], int | float | None] = field(default_factory=dict)
+    supply: dict[int, int | float] = field(default_factory=dict)
+    demand: dict[int, int | float] = field(default_factory=dict)
+
+
+@dataclass
+class ScenarioResult:
+    """
+    Решение сценария; plan - только если запрошен (ScenarioSweep(plans=True))
+    """
+    name: str
+    cost: int | float | None = None
+    optimal: bool = False
+    feasible: bool = False
+    pivots: int = 0
+    warm: bool = False
+    elapsed: float = 0.0
+    plan: list[list[int | float]] | None = None
+    error: str | None = None
+
+
+@dataclass
+class SweepSummary:
+    """
+    Сводка по сценариям, накапливаемая по мере получения результатов
+    """
+    base_cost: int | float
+    solved: int = 0
+    failed: int = 0
+    warm: int = 0
+    pivots: int = 0
+    cheapest: ScenarioResult | None = None
+    costliest: ScenarioResult | None = None
+    total_cost: float = 0.0
+
+    @property
+    def mean_cost(self) -> float | None:
+        return self.total_cost / self.solved if self.solved else None
+
+    def add(self, result: ScenarioResult) -> None:
+        """
+        Учет результата сценария
+
+        :param result:
+        :return:
+        """
+        if result.error is not None or not result.feasible:
+            self.failed += 1
+            return
+        self.solved += 1
+        self.warm += result.warm
+        self.pivots += result.pivots
+        self.total_cost += result.cost
+        if self.cheapest is None or result.cost < self.cheapest.cost:
+            self.cheapest = result
+        if self.costliest is None or result.cost > self.costliest.cost:
+            self.costliest = result
+
+
+def _share(array: np.ndarray) -> tuple[SharedMemory, tuple[str, tuple, str]]:
+    """
+    Копия массива в разделяемой памяти
+
+    :return: блок памяти и описание для подключения (имя, форма, тип)
+    """
+    memory = SharedMemory(create=True, size=max(array.nbytes, 1))
+    np.ndarray(array.shape, dtype=array.dtype, buffer=memory.buf)[...] = array
+    return memory, (memory.name, array.shape, array.dtype.str)
+
+
+def _attach(spec: tuple[str, tuple, str]) -> tuple[SharedMemory, np.ndarray]:
+    """
+    Подключение к массиву в разделяемой памяти из процесса пула.
+    Блок освобождает (unlink) только создавший его процесс
+
+    :param spec: описание из _share
+    :return:
+    """
+    name, shape, dtype = spec
+    memory = SharedMemory(name=name)
+    return memory, np.ndarray(shape, dtype=np.dtype(dtype), buffer=memory.buf)
+
+
+class _ScenarioCosts:
+    """
+    Стоимости сценария поверх стоимостей базовой задачи в разделяемой памяти.
+
+    Базовая матрица не копируется и не изменяется: измененные клетки
+    хранятся отдельно (плоские номера и стоимости) и подставляются
+    при расчете дельт, потенциалов и стоимости плана. Множитель k > 0
+    всех стоимостей не меняет оптимальный план, поэтому оптимизация
+    идет в базовых единицах (измененные стоимости делятся на k),
+    а стоимость плана и нижняя граница умножаются на k
+    """
+
+    def _cover(self, factor: int | float, cells: list[int], originals: list, tolerance: int | float) -> None:
+        """
+        :param factor: множитель стоимостей сценария
+        :param cells: плоские номера измененных клеток
+        :param originals: стоимости измененных клеток (с учетом множителя)
+        :param tolerance: порог шума дельт (см. noise_tolerance)
+        :return:
+        """
+        order = np.argsort(np.array(cells, dtype=np.int64), kind='stable')
+        self._factor = factor
+        self._cells = np.array(cells, dtype=np.int64)[order]
+        self._originals = np.array(originals)[order] if originals else np.zeros(0, dtype=np.int64)
+        self._values = self._originals / factor if factor != 1 else self._originals
+        self._changes = dict(zip(self._cells.tolist(), self._values.tolist()))
+        self._noise = tolerance
+        self._deltas = self._deltas.astype(np.result_type(self._deltas, self._values), copy=False)
+
+    def _flat(self, cell) -> int:
+        raise NotImplementedError
+
+    def _ends(self, cells: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        raise NotImplementedError
+
+    def _counted(self) -> np.ndarray:
+        raise NotImplementedError
+
+    def _changed(self, u: np.ndarray, v: np.ndarray, cells: np.ndarray, values: np.ndarray) -> np.ndarray:
+        rows, columns = self._ends(cells)
+        deltas = values - u[rows] - v[columns]
+        deltas[self._basis.reshape(-1)[cells]] = 0
+        self._snap(deltas)
+        return deltas
+
+    def reduced_costs(self, u: np.ndarray, v: np.ndarray, start: int = 0, stop: int | None = None) -> np.ndarray:
+        deltas = super().reduced_costs(u, v, start, stop).astype(self._deltas.dtype, copy=False)
+        first, last = np.searchsorted(self._cells, [start, self.size if stop is None else stop])
+        cells = self._cells[first:last]
+        deltas[cells - start] = self._changed(u, v, cells, self._values[first:last])
+        if start == 0 and stop is None:
+            self._deltas.reshape(-1)[cells] = deltas[cells]
+        return deltas
+
+    def reduced_costs_of(self, u: np.ndarray, v: np.ndarray, cells: np.ndarray) -> np.ndarray:
+        deltas = super().reduced_costs_of(u, v, cells).astype(self._deltas.dtype, copy=False)
+        index = np.minimum(np.searchsorted(self._cells, cells), max(len(self._cells) - 1, 0))
+        hit = self._cells[index] == cells if len(self._cells) else np.zeros(len(cells), dtype=bool)
+        deltas[hit] = self._changed(u, v, cells[hit], self._values[index[hit]])
+        return deltas
+
+    def _snap(self, deltas: np.ndarray) -> None:
+        if self._noise:
+            deltas[np.abs(deltas) <= self._noise] = 0
+
+    def cell_cost(self, cell) -> int | float:
+        value = self._changes.get(self._flat(cell))
+        return super().cell_cost(cell) if value is None else value
+
+    def plan_cost(self) -> int | float:
+        """
+        Стоимость плана сценария: базовые стоимости с множителем,
+        измененные - как заданы в сценарии
+
+        :return:
+        """
+        counted = self._counted()
+        amounts = self._amounts.reshape(-1)
+        costs = self._costs.reshape(-1)
+        changed = counted[self._cells]
+        cells = self._cells[changed]
+        base = (costs[counted] * amounts[counted]).sum() - (costs[cells] * amounts[cells]).sum()
+        return scalar(self._factor * base + (self._originals[changed] * amounts[cells]).sum())
+
+    def _scenario_costs(self) -> np.ndarray:
+        """
+        Полная копия стоимостей сценария в базовых единицах
+        (только для нижней границы при исчерпании бюджета итераций)
+
+        :return:
+        """
+        costs = self._costs.reshape(-1).astype(np.result_type(self._costs, self._values))
+        costs[self._cells] = self._values
+        return costs
+
+
+class _DenseScenario(_ScenarioCosts, Table):
+    """
+    Плотная таблица сценария над матрицей стоимостей базовой задачи
+    """
+
+    def __init__(self, a: np.ndarray, b: np.ndarray, arrays: dict[str, np.ndarray]):
+        self._allocate(a, b, arrays['costs'])
+        self.set_plan(arrays['amounts'], arrays['basis'])
+
+    def _flat(self, cell: tuple[int, int]) -> int:
+        row, column = cell
+        return row * self.columns + column
+
+    def _ends(self, cells: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        return np.divmod(cells, self.columns)
+
+    def _counted(self) -> np.ndarray:
+        return self._basis.reshape(-1)
+
+    def lower_bound(self, u: np.ndarray, v: np.ndarray) -> int | float:
+        rows, columns = np.divmod(np.arange(self.size), self.columns)
+        return self._factor * dual_bound(self, rows, columns, self._scenario_costs(), u, v)
+
+
+class _SparseScenario(_ScenarioCosts, SparseTable):
+    """
+    Разреженная таблица сценария над маршрутами базовой задачи.
+    Собственная у сценария только маска искусственных маршрутов
+    (закрытые сценарием маршруты становятся искусственными)
+    """
+
+    def __init__(self, a: np.ndarray, b: np.ndarray, arrays: dict[str, np.ndarray], artificial: np.ndarray):
+        self._allocate(a, b, arrays['arc_rows'], arrays['arc_columns'], arrays['costs'], artificial)
+        self.set_plan(arrays['amounts'], arrays['basis'])
+
+    def _flat(self, cell: int) -> int:
+        return cell
+
+    def _ends(self, cells: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        return self._arc_rows[cells], self._arc_columns[cells]
+
+    def _counted(self) -> np.ndarray:
+        return self._basis & ~self._artificial
+
+    def lower_bound(self, u: np.ndarray, v: np.ndarray) -> int | float:
+        real = ~self._artificial
+        costs = self._scenario_costs()[real]
+        return self._factor * dual_bound(self, self._arc_rows[real], self._arc_columns[real], costs, u, v)
+
+
+class _Problem:
+    """
+    Оптимальная сбалансированная таблица базовой задачи в разделяемой
+    памяти (по одному экземпляру на процесс). Таблицы сценариев строятся
+    над ее буферами: копируются только объемы и базис
+    """
+
+    def __init__(self, arrays: dict[str, np.ndarray], options: dict):
+        self.a, self.b = arrays['a'], arrays['b']
+        self.arrays = arrays
+        self.options = options
+        self.sparse = 'arc_rows' in arrays
+
+    def vectors(self, scenario: Scenario) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Ресурсы и потребности сценария
+
+        :param scenario:
+        :return:
+        """
+        a = self.a.astype(np.result_type(self.a, *scenario.supply.values()))
+        b = self.b.astype(np.result_type(self.b, *scenario.demand.values()))
+        for row, value in scenario.supply.items():
+            a[row] = value
+        for column, value in scenario.demand.items():
+            b[column] = value
+        return a, b
+
+    def find(self, row: int, column: int) -> int | None:
+        """
+        Номер маршрута базовой таблицы (маршруты упорядочены по строкам и столбцам)
+
+        :param row:
+        :param column:
+        :return: номер или None, если маршрута нет
+        """
+        rows, columns = self.arrays['arc_rows'], self.arrays['arc_columns']
+        start, stop = np.searchsorted(rows, [row, row + 1])
+        cell = start + int(np.searchsorted(columns[start:stop], column))
+        return cell if cell < stop and columns[cell] == column else None
+
+    def warm(self, scenario: Scenario, a: np.ndarray, b: np.ndarray) -> Table | SparseTable | None:
+        """
+        Таблица сценария от базового базиса: стоимости - базовые
+        в разделяемой памяти с наложением отличий сценария (см. _ScenarioCosts),
+        объемы пересчитываются по дереву базиса (см. repair)
+
+        :param scenario:
+        :param a: ресурсы сценария
+        :param b: потребности сценария
+        :return: таблица или None, если нужен холодный старт (изменилась
+                 балансировка, открыт новый маршрут или закрыт маршрут
+                 плотной таблицы, множитель стоимостей не положителен)
+        """
+        rows, columns = self.options['shape']
+        surplus = a.sum() - b.sum()
+        if columns > len(b) and surplus >= 0:
+            b = np.append(b, surplus)
+        elif rows > len(a) and surplus <= 0:
+            a = np.append(a, -surplus)
+        elif (rows, columns) != (len(a), len(b)) or surplus != 0:
+            return None
+        factor = scenario.cost_multiplier
+        if factor <= 0:
+            return None
+
+        cells, originals = [], []
+        if not self.sparse:
+            if None in scenario.costs.values():
+                return None
+            for (row, column), value in scenario.costs.items():
+                cells.append(row * columns + column)
+                originals.append(value)
+            table = _DenseScenario(a, b, self.arrays)
+        else:
+            artificial = self.arrays['artificial'].copy()
+            for (row, column), value in scenario.costs.items():
+                cell = self.find(row, column)
+                if cell is None:
+                    if value is None:
+                        continue
+                    return None
+                artificial[cell] = value is None
+                if value is not None:
+                    cells.append(cell)
+                    originals.append(value)
+            table = _SparseScenario(a, b, self.arrays, artificial)
+
+        # наибольшая по модулю стоимость сценария в базовых единицах
+        largest = max([self.options['largest'], *(abs(value) / factor if factor != 1 else abs(value) for value in originals)])
+        if self.sparse:
+            # штраф искусственных маршрутов - по стоимостям сценария (см. SparseTable.big_m)
+            closed = np.flatnonzero(table.artificial).tolist()
+            cells += closed
+            originals += [2 * (rows + columns) * (largest + 1) * factor] * len(closed)
+        exact = not self.options['float'] and factor == 1 and all(isinstance(value, int) for value in originals)
+        table._cover(factor, cells, originals, 0 if exact else 1e-9 * max(float(largest), 1))
+        return table if repair(table) else None
+
+    def matrix(self, scenario: Scenario, rows: int, columns: int) -> list[list[int | float | None]]:
+        """
+        Матрица стоимостей сценария для холодного старта
+
+        :param scenario:
+        :param rows: количество поставщиков исходной задачи
+        :param columns: количество потребителей исходной задачи
+        :return:
+        """
+        arrays = self.arrays
+        if self.sparse:
+            c = [[None] * columns for _ in range(rows)]
+            real = ~arrays['artificial'] & (arrays['arc_rows'] < rows) & (arrays['arc_columns'] < columns)
+            for row, column, cost in zip(
+                    arrays['arc_rows'][real].tolist(), arrays['arc_columns'][real].tolist(),
+                    arrays['costs'][real].tolist()
+            ):
+                c[row][column] = cost
+        else:
+            c = arrays['costs'][:rows, :columns].tolist()
+        if scenario.cost_multiplier != 1:
+            c = [[cost * scenario.cost_multiplier if cost is not None else None for cost in row] for row in c]
+        for (row, column), value in scenario.costs.items():
+            c[row][column] = value
+        return c
+
+    def solve(self, scenario: Scenario) -> ScenarioResult:
+        """
+        Решение сценария с теплым стартом от базового базиса;
+        если базис не подходит (изменились балансировка или маршруты) - с нуля
+
+        :param scenario:
+        :return:
+        """
+        started = time.perf_counter()
+        options = self.options
+        try:
+            a, b = self.vectors(scenario)
+            table = self.warm(scenario, a, b)
+            if table is not None:
+                solution = solve_table(
+                    table, options['pricing'], options['max_pivots'], options['time_limit']
+                )
+            else:
+                solution = solve(
+                    a.tolist(), b.tolist(), self.matrix(scenario, len(a), len(b)), pricing=options['pricing'],
+                    max_pivots=options['max_pivots'], time_limit=options['time_limit']
+                )
+        except Exception as error:
+            return ScenarioResult(scenario.name, error=str(error), elapsed=time.perf_counter() - started)
+
+        return ScenarioResult(
+            name=scenario.name,
+            cost=solution.cost,
+            optimal=solution.optimal,
+            feasible=solution.feasible,
+            pivots=solution.pivots,
+            warm=table is not None,
+            elapsed=time.perf_counter() - started,
+            plan=solution.plan(len(a), len(b)) if options['plans'] else None,
+        )
+
+
+# Базовая задача процесса пула и подключенные блоки памяти (см. _initialize)
+_problem: _Problem | None = None
+_memory: list[SharedMemory] = []
+
+
+def _initialize(specs: dict, options: dict) -> None:
+    global _problem
+    arrays = {}
+    for key, spec in specs.items():
+        memory, arrays[key] = _attach(spec)
+        _memory.append(memory)
+    _problem = _Problem(arrays, options)
+
+
+def _solve_chunk(scenarios: list[Scenario]) -> list[ScenarioResult]:
+    return [_problem.solve(scenario) for scenario in scenarios]
+
+
+class ScenarioSweep:
+    """
+    Перебор сценариев "что если" вокруг одной большой базовой задачи.
+
+    Ресурсы, потребности и стоимости базовой задачи один раз копируются
+    в разделяемую память (multiprocessing.shared_memory), процессы пула
+    подключаются к ним без копирования при каждой задаче. Сценарий
+    передается только отличиями (Scenario) и решается с теплым стартом
+    от оптимального базиса базовой задачи.
+
+    Используется как контекстный менеджер (или с close()), чтобы
+    освободить разделяемую память:
+
+        with ScenarioSweep(a, b, c, workers=8) as sweep:
+            for result in sweep.run(scenarios):
+                ...
+            print(sweep.summary.cheapest)
+    """
+
+    def __init__(
+            self,
+            a: list[int | float],
+            b: list[int | float],
+            c: list[list[int | float | None]],
+            workers: int = 1,
+            pricing: str = 'dantzig',
+            max_pivots: int | None = None,
+            time_limit: float | None = None,
+            plans: bool = False
+    ):
+        """
+        :param a: ресурсы базовой задачи
+        :param b: потребности
+        :param c: стоимости (None - запрещенный маршрут)
+        :param workers: количество процессов (1 - решение в текущем процессе)
+        :param pricing: ключ из PRICING_RULES
+        :param max_pivots: ограничение числа итераций на сценарий
+        :param time_limit: ограничение времени на сценарий, с
+        :param plans: возвращать планы сценариев (иначе только стоимости)
+        """
+        self.base = solve(a, b, c, pricing=pricing)
+        if not self.base.optimal or not self.base.feasible:
+            raise ValueError('Базовая задача не решена: нет оптимального допустимого плана')
+
+        table = self.base.table
+        arrays = {'a': np.array(a), 'b': np.array(b)}
+        if isinstance(table, SparseTable):
+            arrays.update(arc_rows=table.arc_rows, arc_columns=table.arc_columns, artificial=table.artificial)
+            real = table.costs[~table.artificial]
+        else:
+            real = table.costs
+        arrays.update(costs=table.costs, amounts=table.amounts, basis=table.basis)
+
+        self._workers = workers
+        self._memory = []
+        self._specs = {}
+        self._arrays = {}
+        for key, array in arrays.items():
+            memory, self._specs[key] = _share(array)
+            self._memory.append(memory)
+            self._arrays[key] = np.ndarray(array.shape, dtype=array.dtype, buffer=memory.buf)
+        self._options = {
+            'pricing': pricing, 'max_pivots': max_pivots, 'time_limit': time_limit, 'plans': plans,
+            'shape': (table.rows, table.columns),
+            'largest': scalar(np.abs(real).max()) if len(real) else 0,
+            'float': table.costs.dtype.kind == 'f',
+        }
+        self.summary = SweepSummary(self.base.cost)
+
+    def run(self, scenarios: Iterable[Scenario], chunksize: int = 4) -> Iterator[ScenarioResult]:
+        """
+        Решение сценариев. Результаты возвращаются по мере готовности
+        (не в порядке сценариев) и учитываются в summary.
+        Одновременно в работе не более 4 * workers пачек
+
+        :param scenarios:
+        :param chunksize: количество сценариев в пачке
+        :return:
+        """
+        if self._memory is None:
+            raise ValueError('Перебор сценариев уже закрыт')
+
+        if self._workers <= 1:
+            problem = _Problem(self._arrays, self._options)
+            for scenario in scenarios:
+                result = problem.solve(scenario)
+                self.summary.add(result)
+                yield result
+            return
+
+        with ProcessPoolExecutor(
+                max_workers=self._workers,
+                initializer=_initialize,
+                initargs=(self._specs, self._options)
+        ) as executor:
+            pending = set()
+            chunk = []
+
+            def collect(futures) -> Iterator[ScenarioResult]:
+                for future in futures:
+                    for result in future.result():
+                        self.summary.add(result)
+                        yield result
+
+            for scenario in scenarios:
+                chunk.append(scenario)
+                if len(chunk) < chunksize:
+                    continue
+                pending.add(executor.submit(_solve_chunk, chunk))
+                chunk = []
+                if len(pending) >= 4 * self._workers:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    yield from collect(done)
+            if chunk:
+                pending.add(executor.submit(_solve_chunk, chunk))
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                yield from collect(done)
+
+    def close(self) -> None:
+        """
+        Освобождение разделяемой памяти
+
+        :return:
+        """
+        # представления массивов держат буферы блоков: их нужно отпустить до close
+        self._arrays = {}
+        for memory in self._memory or []:
+            memory.close()
+            memory.unlink()
+        self._memory = None
+
+    def __enter__(self) -> 'ScenarioSweep':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -1,10 +1,112 @@
+import copy
+
+import numpy as np
+
+from src.model.transport_solution.numeric import noise_tolerance
+from src.model.transport_solution.numeric import scalar
+from src.model.transport_solution.tree import BasisTree
+
+
+def _dtype(values) -> np.dtype:
+    """
+    Тип буфера: целочисленный, если все значения целые, иначе float64.
+    Целые, не помещающиеся в int64, хранятся как объекты Python (int)
+
+    :param values:
+    :return:
+    """
+    values = np.asarray(values)
+    # пустой список (например, задача без разрешенных маршрутов) - целые
+    if values.dtype.kind in 'iub' or not values.size:
+        return np.dtype(np.int64)
+    if values.dtype.kind == 'O' and all(isinstance(value, int) for value in values.reshape(-1)):
+        return np.dtype(object)
+    return np.dtype(np.float64)
+
+
+def dual_bound(
+        table: 'Table',
+        rows: np.ndarray,
+        columns: np.ndarray,
+        costs: np.ndarray,
+        u: np.ndarray,
+        v: np.ndarray
+) -> int | float:
+    """
+    Нижняя граница стоимости по маршрутам (rows[k], columns[k], costs[k])
+    и потенциалам u, v (см. utils.lower_bound)
+
+    :param table: сбалансированная таблица (ресурсы и потребности)
+    :param rows: строки маршрутов
+    :param columns: столбцы маршрутов
+    :param costs: стоимости маршрутов
+    :param u: потенциалы строк
+    :param v: потенциалы столбцов
+    :return:
+    """
+    def minimal(index: np.ndarray, values: np.ndarray, size: int) -> np.ndarray:
+        result = np.full(size, np.inf)
+        np.minimum.at(result, index, values)
+        # Строка (столбец) без маршрутов не ограничивает потенциал
+        result[np.isinf(result)] = 0
+        return result
+
+    resources = np.array(table.resources)
+    needs = np.array(table.needs)
+    bounds = []
+    # Нулевые потенциалы дают простую границу sum(A[i] * min_j C[i][j]),
+    # которая в начале решения бывает точнее границы по потенциалам
+    for row_potentials, column_potentials in ((u, v), (np.zeros(table.rows), np.zeros(table.columns))):
+        fixed_u = minimal(rows, costs - column_potentials[columns], table.rows)
+        fixed_v = minimal(columns, costs - fixed_u[rows], table.columns)
+        bounds.append(resources @ fixed_u + needs @ fixed_v)
+        fixed_v = minimal(columns, costs - row_potentials[rows], table.columns)
+        fixed_u = minimal(rows, costs - fixed_v[columns], table.rows)
+        bounds.append(resources @ fixed_u + needs @ fixed_v)
+    return scalar(max(bounds))
+
+
 class Table:
-    def __init__(self, a: list[int], b: list[int], c: list[list[int]]):
-        self._needs = b
-        self._resources = a
-        self._items: list[list[ItemTable]] = [
-            [ItemTable(i, j, cost=c[i][j]) for j in range(len(b))] for i in range(len(a))
-        ]
+    """
+    Транспортная таблица в виде структуры массивов.
+
+    Стоимости, объемы перевозок, маска базисных клеток и дельты
+    хранятся в непрерывных буферах NumPy размера rows x columns.
+    Объекты ItemTable создаются только по запросу (для отображения).
+    """
+
+    def __init__(self, a: list[int], b: list[int], c: list[list[int]], dtype: np.dtype | None = None):
+        """
+        :param a: ресурсы
+        :param b: потребности
+        :param c: стоимости
+        :param dtype: тип буферов (по умолчанию - по значениям, см. _dtype)
+        """
+        self._allocate(a, b, np.array(c, dtype=dtype or _dtype(c)).reshape(len(a), len(b)), dtype)
+
+    def _allocate(self, a: list[int], b: list[int], costs: np.ndarray, dtype: np.dtype | None = None) -> None:
+        """
+        Буферы таблицы с матрицей стоимостей costs (без копирования):
+        ресурсы, потребности, нулевые объемы, пустой базис и дельты
+
+        :param a: ресурсы
+        :param b: потребности
+        :param costs: матрица стоимостей len(a) x len(b)
+        :param dtype: тип ресурсов и потребностей (по умолчанию - по значениям)
+        :return:
+        """
+        self._resources = np.array(a, dtype=dtype or _dtype(a))
+        self._needs = np.array(b, dtype=dtype or _dtype(b))
+
+        self._costs = costs
+        self._amounts = np.zeros(costs.shape, dtype=np.result_type(self._resources, self._needs))
+        self._basis = np.zeros(costs.shape, dtype=bool)
+        # дельты узких типов (int32, float32 из файла) считаются в int64 и float64
+        self._deltas = np.zeros(costs.shape, dtype=np.result_type(costs.dtype, np.int64))
+        self._basic_count = 0
+        self._tree: BasisTree | None = None
+        # порог шума дельт (см. noise_tolerance), пересчитывается при полном расчете дельт
+        self._tolerance: int | float | None = None
 
     @property
     def rows(self) -> int:
@@ -21,7 +123,7 @@ class Table:
 
         :return:
         """
-        return self._needs.copy()
+        return self._needs.tolist()
 
     @property
     def resources(self) -> list[int]:
@@ -30,68 +132,415 @@ class Table:
 
         :return:
         """
-        return self._resources.copy()
+        return self._resources.tolist()
+
+    @property
+    def costs(self) -> np.ndarray:
+        """
+        Матрица стоимостей (C)
+
+        :return:
+        """
+        return self._costs
+
+    @property
+    def amounts(self) -> np.ndarray:
+        """
+        Матрица объемов перевозок (для небазисных клеток - 0)
+
+        :return:
+        """
+        return self._amounts
+
+    @property
+    def basis(self) -> np.ndarray:
+        """
+        Маска базисных (заполненных) клеток
+
+        :return:
+        """
+        return self._basis
+
+    @property
+    def deltas(self) -> np.ndarray:
+        """
+        Дельты (оценки) свободных клеток, рассчитанные методом потенциалов
+
+        :return:
+        """
+        return self._deltas
+
+    @property
+    def basic_count(self) -> int:
+        """
+        Количество базисных клеток
+
+        :return:
+        """
+        return self._basic_count
+
+    @property
+    def size(self) -> int:
+        """
+        Количество клеток (маршрутов) таблицы
+
+        :return:
+        """
+        return self._costs.size
+
+    @property
+    def tree(self) -> BasisTree:
+        """
+        Остовное дерево базиса с потенциалами.
+        Строится при первом обращении и поддерживается методом pivot;
+        set_basic/set_free, меняющие базис, сбрасывают его.
+
+        :return:
+        """
+        if self._tree is None:
+            self._tree = BasisTree(self)
+        return self._tree
 
     @property
     def items(self) -> list[list['ItemTable']]:
         """
-        Таблица стоимостей (C)
+        Представление таблицы в виде клеток ItemTable.
+        Клетки создаются при каждом обращении, поэтому в расчетах
+        следует использовать буферы costs/amounts/basis.
 
         :return:
         """
-        return self._items
+        return [[ItemTable(self, i, j) for j in range(self.columns)] for i in range(self.rows)]
 
     @resources.setter
     def resources(self, value: list[int]):
         if len(value) < self.rows:
             raise ValueError('Невозможно уменьшить количество потребностей')
 
-        delta = len(value) - len(self._resources)
-        for i in range(delta):
-            self._items.append([ItemTable(self.rows + i, j) for j in range(self.columns)])
-        self._resources = value.copy()
+        delta = len(value) - self.rows
+        self._resources = np.array(value, dtype=np.result_type(self._resources, _dtype(value)))
+        self._grow(rows=delta, columns=0)
 
     @needs.setter
     def needs(self, value: list[int]):
         if len(value) < self.columns:
             raise ValueError('Невозможно уменьшить количество ресурсов')
 
-        delta = len(value) - len(self._needs)
-        for i, row in enumerate(self._items):
-            row.extend([ItemTable(i, self.columns + j) for j in range(delta)])
-        self._needs = value.copy()
+        delta = len(value) - self.columns
+        self._needs = np.array(value, dtype=np.result_type(self._needs, _dtype(value)))
+        self._grow(rows=0, columns=delta)
+
+    def _grow(self, rows: int, columns: int) -> None:
+        """
+        Расширение буферов новыми строками/столбцами с нулевой стоимостью
+
+        :param rows:
+        :param columns:
+        :return:
+        """
+        def pad(buffer: np.ndarray) -> np.ndarray:
+            # np.pad заполняет буферы object значениями np.int64, а не int
+            result = np.zeros((buffer.shape[0] + rows, buffer.shape[1] + columns), dtype=buffer.dtype)
+            result[:buffer.shape[0], :buffer.shape[1]] = buffer
+            return result
+
+        amount_dtype = np.result_type(self._resources, self._needs)
+        self._costs = pad(self._costs)
+        self._amounts = pad(self._amounts).astype(amount_dtype, copy=False)
+        self._basis = pad(self._basis)
+        self._deltas = pad(self._deltas)
+        self._tree = None
+
+    def update(self, a: list[int], b: list[int], c: list[list[int]] | None = None) -> None:
+        """
+        Замена ресурсов, потребностей и стоимостей при неизменном базисе.
+        Размеры должны совпадать; потенциалы будут пересчитаны,
+        объемы перевозок - нет (см. BasisTree.flows).
+
+        :param a:
+        :param b:
+        :param c: стоимости (None - без изменений)
+        :return:
+        """
+        self._resources = np.array(a, dtype=np.result_type(self._resources, _dtype(a)))
+        self._needs = np.array(b, dtype=np.result_type(self._needs, _dtype(b)))
+        if c is not None:
+            self._costs = np.array(c, dtype=np.result_type(self._costs, _dtype(c))).reshape(self._costs.shape)
+        self._amounts = self._amounts.astype(np.result_type(self._resources, self._needs), copy=False)
+        self._deltas = self._deltas.astype(self._costs.dtype, copy=False)
+        self._tree = None
+        self._tolerance = None
+
+    def set_plan(self, amounts: np.ndarray, basis: np.ndarray) -> None:
+        """
+        Установка плана и базиса из буферов другой таблицы той же формы
+        (буферы копируются). Объемы обычно пересчитываются затем по дереву
+        базиса (см. warm.repair)
+
+        :param amounts: объемы перевозок
+        :param basis: маска базисных клеток
+        :return:
+        """
+        self._amounts = amounts.astype(np.result_type(self._resources, self._needs, amounts))
+        self._basis = basis.copy()
+        self._basic_count = int(np.count_nonzero(basis))
+        self._tree = None
+
+    def change_costs(
+            self,
+            factor: int | float = 1,
+            changes: dict[tuple[int, int], int | float] | None = None
+    ) -> None:
+        """
+        Изменение стоимостей в буфере при неизменном базисе: умножение
+        всех стоимостей на factor, затем замена отдельных клеток.
+        Потенциалы будут пересчитаны (см. update)
+
+        :param factor: множитель стоимостей
+        :param changes: новые стоимости клеток {(строка, столбец): стоимость}
+        :return:
+        """
+        changes = changes or {}
+        if any(value is None for value in changes.values()):
+            raise ValueError('Запрещенные маршруты задаются только в SparseTable')
+
+        dtype = np.result_type(self._costs, _dtype([factor, *changes.values()]))
+        self._costs = self._costs.astype(dtype, copy=False)
+        if factor != 1:
+            self._costs *= factor
+        for (row, column), value in changes.items():
+            self._costs[row, column] = value
+        self._deltas = self._deltas.astype(dtype, copy=False)
+        self._tree = None
+        self._tolerance = None
+
+    def crossing(self, rows: np.ndarray, columns: np.ndarray) -> np.ndarray:
+        """
+        Плоская маска клеток, строка которых отмечена в rows, а столбец - в columns
+
+        :param rows: маска строк
+        :param columns: маска столбцов
+        :return:
+        """
+        return np.logical_and.outer(rows, columns).reshape(-1)
+
+    def copy(self) -> 'Table':
+        return copy.deepcopy(self)
+
+    def item(self, row: int, column: int) -> 'ItemTable':
+        return ItemTable(self, row, column)
+
+    def is_basic(self, row: int, column: int) -> bool:
+        return bool(self._basis[row, column])
+
+    def set_basic(self, row: int, column: int, amount: int | float) -> None:
+        """
+        Занести клетку в базис с заданным объемом перевозки
+
+        :param row:
+        :param column:
+        :param amount:
+        :return:
+        """
+        if not self._basis[row, column]:
+            self._basis[row, column] = True
+            self._basic_count += 1
+            self._tree = None
+        self._amounts[row, column] = amount
 
-    @items.setter
-    def items(self, value):
-        self._items = value
+    def set_free(self, row: int, column: int) -> None:
+        """
+        Вывести клетку из базиса
+
+        :param row:
+        :param column:
+        :return:
+        """
+        if self._basis[row, column]:
+            self._basis[row, column] = False
+            self._basic_count -= 1
+            self._tree = None
+        self._amounts[row, column] = 0
+
+    def pivot(self, entering: tuple[int, int], leaving: tuple[int, int]) -> None:
+        """
+        Замена базисной клетки leaving на entering с обновлением
+        дерева базиса (если оно уже построено).
+        Объемы перевозок по циклу пересчитываются вызывающим кодом.
+
+        :param entering:
+        :param leaving:
+        :return:
+        """
+        if entering == leaving:
+            return
+
+        self._basis[entering] = True
+        self._basis[leaving] = False
+        self._amounts[leaving] = 0
+        if self._tree is not None:
+            self._tree.pivot(entering, leaving)
+
+    def endpoints(self, cell: tuple[int, int]) -> tuple[int, int]:
+        """
+        Строка и столбец клетки
+
+        :param cell:
+        :return:
+        """
+        return cell
+
+    def cell_at(self, index: int) -> tuple[int, int]:
+        """
+        Клетка по плоскому индексу (обход по строкам)
+
+        :param index:
+        :return:
+        """
+        row, column = divmod(int(index), self.columns)
+        return row, column
+
+    def cell_index(self, cells: list[tuple[int, int]]) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Индекс для выборки клеток из буферов costs/amounts/basis
+
+        :param cells:
+        :return:
+        """
+        return tuple(np.array(cells).reshape(-1, 2).T)
+
+    def get_amount(self, row: int, column: int) -> int | float | None:
+        """
+        Объем перевозки клетки, None для свободной клетки
+
+        :param row:
+        :param column:
+        :return:
+        """
+        if not self._basis[row, column]:
+            return None
+        return scalar(self._amounts[row, column])
+
+    def reduced_costs(self, u: np.ndarray, v: np.ndarray, start: int = 0, stop: int | None = None) -> np.ndarray:
+        """
+        Дельты клеток с плоскими индексами [start, stop).
+        Для базисных клеток - 0. Полный расчет сохраняется в deltas.
+
+        :param u: потенциалы строк
+        :param v: потенциалы столбцов
+        :param start:
+        :param stop:
+        :return:
+        """
+        if start == 0 and stop is None:
+            self._tolerance = None
+            self._deltas[...] = self._costs - np.add.outer(u, v)
+            self._deltas[self._basis] = 0
+            self._snap(self._deltas)
+            return self._deltas.reshape(-1)
+
+        return self.reduced_costs_of(u, v, np.arange(start, stop))
+
+    def reduced_costs_of(self, u: np.ndarray, v: np.ndarray, cells: np.ndarray) -> np.ndarray:
+        """
+        Дельты клеток с заданными плоскими индексами
+
+        :param u:
+        :param v:
+        :param cells:
+        :return:
+        """
+        rows, columns = np.divmod(cells, self.columns)
+        deltas = self._costs.reshape(-1)[cells] - u[rows] - v[columns]
+        deltas[self._basis.reshape(-1)[cells]] = 0
+        self._snap(deltas)
+        return deltas
+
+    def _snap(self, deltas: np.ndarray) -> None:
+        """
+        Обнуление дельт, меньших порога шума (см. noise_tolerance)
+
+        :param deltas:
+        :return:
+        """
+        if self._tolerance is None:
+            self._tolerance = noise_tolerance(self._costs)
+        if self._tolerance:
+            deltas[np.abs(deltas) <= self._tolerance] = 0
+
+    def cell_cost(self, cell: tuple[int, int]) -> int | float:
+        """
+        Стоимость клетки (для дерева базиса и выбора выводимой клетки)
+
+        :param cell:
+        :return:
+        """
+        return scalar(self._costs[cell])
+
+    def plan_cost(self) -> int | float:
+        """
+        Стоимость плана: сумма объемов базисных клеток, умноженных на стоимости
+        (см. utils.calculate_minimal_cost)
+
+        :return:
+        """
+        basis = self._basis
+        return scalar((self._costs[basis] * self._amounts[basis]).sum())
+
+    def lower_bound(self, u: np.ndarray, v: np.ndarray) -> int | float:
+        """
+        Нижняя граница стоимости оптимального плана по потенциалам u, v
+        (см. utils.lower_bound)
+
+        :param u: потенциалы строк
+        :param v: потенциалы столбцов
+        :return:
+        """
+        rows, columns = np.divmod(np.arange(self.size), self.columns)
+        return dual_bound(self, rows, columns, self._costs.reshape(-1), u, v)
+
+    def basic_cells(self) -> list[tuple[int, int]]:
+        """
+        Список базисных клеток (строка, столбец) в порядке обхода по строкам
+
+        :return:
+        """
+        rows, columns = np.nonzero(self._basis)
+        return list(zip(rows.tolist(), columns.tolist()))
 
     def as_matrix(self) -> list[list[int | None]]:
+        amounts = np.where(self._basis, self._amounts, None)
         return [
-            [None, *self._needs],
+            [None, *self.needs],
             *[
-                [self._resources[i], *[item.amount for item in self._items[i]]] for i in range(self.rows)
+                [resource, *row] for resource, row in zip(self.resources, amounts.tolist())
             ]
         ]
 
-    def as_graph(self):
-        graph = {}
-        for i in range(self.rows):
-            for j in range(self.columns):
-                cost = self._items[i][j].cost
-                if cost > 0:
-                    if self._resources[i] not in graph:
-                        graph[self._resources[i]] = {}
-                    graph[self._resources[i]][self._needs[j]] = cost
-        return graph
+    def as_graph(self) -> dict[str, dict[str, int | float]]:
+        """
+        Список смежности двудольного графа маршрутов:
+        {'A1': {'B1': стоимость, ...}, ...}
+
+        :return:
+        """
+        costs = self._costs.tolist()
+        return {
+            f'A{i + 1}': {f'B{j + 1}': costs[i][j] for j in range(self.columns)}
+            for i in range(self.rows)
+        }
 
 
 class ItemTable:
-    def __init__(self, row: int, column: int, cost: int | float = 0, amount: int = None):
+    """
+    Представление одной клетки таблицы.
+    Не хранит данных: чтение и запись идут напрямую в буферы Table.
+    """
+
+    def __init__(self, table: Table, row: int, column: int):
+        self._table = table
         self._row = row
         self._column = column
-        self._amount = amount
-        self._cost = cost
-        self._delta = None
 
     @property
     def row(self) -> int:
@@ -103,27 +552,32 @@ class ItemTable:
 
     @property
     def amount(self) -> int | None:
-        return self._amount
+        return self._table.get_amount(self._row, self._column)
 
     @property
     def cost(self) -> int:
-        return self._cost
+        return scalar(self._table.costs[self._row, self._column])
 
     @property
     def delta(self) -> int | None:
-        return self._delta
+        if self._table.basis[self._row, self._column]:
+            return None
+        return scalar(self._table.deltas[self._row, self._column])
 
     @cost.setter
     def cost(self, value: int) -> None:
-        self._cost = value
+        self._table.costs[self._row, self._column] = value
 
     @amount.setter
-    def amount(self, value: int) -> None:
-        self._amount = value
+    def amount(self, value: int | None) -> None:
+        if value is None:
+            self._table.set_free(self._row, self._column)
+        else:
+            self._table.set_basic(self._row, self._column, value)
 
     @delta.setter
     def delta(self, value: int | None) -> None:
-        self._delta = value
+        self._table.deltas[self._row, self._column] = 0 if value is None else value
 
     def __eq__(self, other) -> bool:
-        return self._row == other.row and self._column == other.column and self._cost == other.cost
+        return self._row == other.row and self._column == other.column and self.cost == other.cost
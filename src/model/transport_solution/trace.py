@@ -0,0 +1,164 @@
+import numpy as np
+
+from src.model.transport_solution.exact import ScaledProblem
+from src.model.transport_solution.utils import table_to_html
+
+# Уровни протокола решения: ключ -> (название, подробность)
+TRACE_LEVELS: dict[str, tuple[str, int]] = {
+    'off': ('Без протокола', 0),
+    'summary': ('Итоги', 1),
+    'pivots': ('Итерации', 2),
+    'full': ('Итерации с таблицами', 3),
+}
+
+
+def get_trace_level(name: str) -> int:
+    """
+    Подробность уровня протокола по ключу
+
+    :param name: ключ из TRACE_LEVELS
+    :return:
+    """
+    if name not in TRACE_LEVELS:
+        raise ValueError(f'Неизвестный уровень протокола: {name}')
+    return TRACE_LEVELS[name][1]
+
+
+def _label(table, cell) -> str:
+    row, column = table.endpoints(cell)
+    return f"A{row + 1}B{column + 1}"
+
+
+def _cell(cell: np.ndarray):
+    """
+    Клетка в адресации таблицы из сохраненной строки массива
+    """
+    return tuple(cell.tolist()) if cell.ndim else cell.item()
+
+
+class Trace:
+    """
+    Протокол решения.
+
+    Записи хранятся компактно (текст сообщений, клетки итераций в массивах
+    NumPy, снимки плана - только базисные клетки) и переводятся в HTML
+    лишь при отображении, по частям (render(start, stop)).
+    Записи подробнее заданного уровня не сохраняются.
+    """
+
+    def __init__(self, level: str = 'full', scale: ScaledProblem | None = None):
+        """
+        :param level: ключ из TRACE_LEVELS
+        :param scale: масштаб точного режима (значения выводятся в исходных единицах)
+        """
+        self._level_name = level
+        self._scale = scale
+        self._level = get_trace_level(level)
+        self._entries: list[tuple] = []
+        self._table = None
+
+    @property
+    def level(self) -> str:
+        return self._level_name
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def enabled(self, level: str) -> bool:
+        """
+        Сохраняются ли записи уровня level
+
+        :param level: ключ из TRACE_LEVELS
+        :return:
+        """
+        return 0 < get_trace_level(level) <= self._level
+
+    def message(self, text: str, level: str = 'summary') -> None:
+        """
+        Текстовое сообщение (HTML)
+
+        :param text:
+        :param level:
+        :return:
+        """
+        if self.enabled(level):
+            self._entries.append(('message', text))
+
+    def snapshot(self, table, level: str = 'full') -> None:
+        """
+        Снимок плана: базисные клетки и их объемы
+
+        :param table:
+        :param level:
+        :return:
+        """
+        if not self.enabled(level):
+            return
+        self._table = table
+        cells = np.flatnonzero(table.basis.reshape(-1))
+        self._entries.append(('snapshot', cells, table.amounts.reshape(-1)[cells].copy()))
+
+    def pivot(self, number: int, cycle: list, theta: int | float, cost: int | float, table) -> None:
+        """
+        Итерация метода потенциалов: цикл пересчета (первая клетка - вводимая),
+        объем переноса theta и стоимость плана после итерации.
+        При уровне full после итерации сохраняется снимок плана.
+
+        :param number:
+        :param cycle:
+        :param theta:
+        :param cost:
+        :param table:
+        :return:
+        """
+        if not self.enabled('pivots'):
+            return
+        self._table = table
+        self._entries.append(('pivot', number, np.array(cycle, dtype=np.int32), theta, cost))
+        self.snapshot(table)
+
+    def render(self, start: int = 0, stop: int | None = None) -> str:
+        """
+        HTML записей протокола start..stop
+
+        :param start:
+        :param stop:
+        :return:
+        """
+        return '<br/>'.join(self._render(entry) for entry in self._entries[start:stop])
+
+    def cost(self, value: int | float) -> int | float:
+        """
+        Стоимость в исходных единицах (для точного режима)
+
+        :param value: стоимость в единицах таблицы
+        :return:
+        """
+        return self._scale.cost(value) if self._scale is not None else value
+
+    def _amount(self, value: int | float) -> int | float:
+        return self._scale.amount(value) if self._scale is not None else value
+
+    def _render(self, entry: tuple) -> str:
+        kind = entry[0]
+        if kind == 'message':
+            return entry[1]
+
+        table = self._table
+        if kind == 'snapshot':
+            _, cells, amounts = entry
+            plan = {
+                table.endpoints(table.cell_at(cell)): self._amount(amount)
+                for cell, amount in zip(cells.tolist(), amounts.tolist())
+            }
+            return f"{table_to_html(table, item=lambda t, r, c: plan.get((r, c)))}<br/>"
+
+        _, number, cycle, theta, cost = entry
+        path = ' → '.join(
+            f"{_label(table, _cell(cell))}{'+' if k % 2 == 0 else '-'}" for k, cell in enumerate(cycle)
+        )
+        return (
+            f"<br/> Оптимизация плана методом потенциалов Шаг {number}:<br/>"
+            f" > Вводится клетка {_label(table, _cell(cycle[0]))}, цикл: {path}, θ = {self._amount(theta)}<br/>"
+            f" > Fmin = {self.cost(cost)}<br/>"
+        )
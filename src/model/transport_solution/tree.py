@@ -0,0 +1,204 @@
+from collections import deque
+
+import numpy as np
+
+
+
+class BasisTree:
+    """
+    Остовное дерево базиса.
+
+    Узлы 0..rows-1 соответствуют строкам (поставщикам),
+    узлы rows..rows+columns-1 - столбцам (потребителям),
+    базисные клетки - ребрам между ними.
+    Хранит родителей, глубины и потенциалы узлов: для ребра (i, j)
+    выполняется U[i] + V[j] = C[i][j].
+
+    Клетка задается так, как ее адресует таблица: (строка, столбец)
+    в Table или номер маршрута в SparseTable; концы ребра дает
+    table.endpoints(cell).
+    """
+
+    def __init__(self, table):
+        self._table = table
+        self._rows = table.rows
+
+        nodes = table.rows + table.columns
+        self._adjacency: list[dict[int, object]] = [{} for _ in range(nodes)]
+        for cell in table.basic_cells():
+            i, j = table.endpoints(cell)
+            self._adjacency[i][self._rows + j] = cell
+            self._adjacency[self._rows + j][i] = cell
+
+        self.parent: list[int] = [-1] * nodes
+        self.depth: list[int] = [0] * nodes
+        self.potentials: list[int | float | None] = [None] * nodes
+
+        for root in range(nodes):
+            if self.potentials[root] is None:
+                self.potentials[root] = 0
+                self._hang(root, -1)
+
+    @property
+    def u(self) -> np.ndarray:
+        """
+        Потенциалы строк
+
+        :return:
+        """
+        return np.array(self.potentials[:self._rows])
+
+    @property
+    def v(self) -> np.ndarray:
+        """
+        Потенциалы столбцов
+
+        :return:
+        """
+        return np.array(self.potentials[self._rows:])
+
+    def cell(self, first: int, second: int):
+        """
+        Клетка таблицы, соответствующая ребру между узлами
+
+        :param first:
+        :param second:
+        :return:
+        """
+        return self._adjacency[first][second]
+
+    def subtree(self, node: int) -> list[int]:
+        """
+        Узлы поддерева с корнем node
+
+        :param node:
+        :return:
+        """
+        visited = [node]
+        seen = {node, self.parent[node]}
+        queue = deque(visited)
+        while queue:
+            for neighbor in self._adjacency[queue.popleft()]:
+                if neighbor not in seen:
+                    seen.add(neighbor)
+                    visited.append(neighbor)
+                    queue.append(neighbor)
+        return visited
+
+    def flows(self, resources: list[int | float], needs: list[int | float]) -> dict[object, int | float]:
+        """
+        Объемы перевозок базисных клеток, однозначно определяемые деревом
+        для заданных ресурсов и потребностей (от листьев к корню).
+        Отрицательный объем означает, что базис недопустим.
+
+        :param resources:
+        :param needs:
+        :return: клетка -> объем
+        """
+        balances = list(resources) + list(needs)
+        children = [0] * len(balances)
+        flows = {}
+        for node in sorted(range(len(balances)), key=self.depth.__getitem__, reverse=True):
+            parent = self.parent[node]
+            if parent == -1:
+                continue
+            amount = balances[node] - children[node]
+            flows[self.cell(node, parent)] = amount
+            children[parent] += amount
+        return flows
+
+    def _hang(self, node: int, parent: int) -> list[int]:
+        """
+        Подвесить поддерево с корнем node к узлу parent (обход в ширину),
+        пересчитав родителей, глубины и потенциалы поддерева.
+        Потенциал node должен быть уже установлен.
+
+        :return: список узлов поддерева
+        """
+        table = self._table
+        self.parent[node] = parent
+        self.depth[node] = self.depth[parent] + 1 if parent >= 0 else 0
+
+        visited = [node]
+        seen = {node, parent}
+        queue = deque(visited)
+        while queue:
+            current = queue.popleft()
+            for neighbor, cell in self._adjacency[current].items():
+                if neighbor in seen:
+                    continue
+                seen.add(neighbor)
+                self.parent[neighbor] = current
+                self.depth[neighbor] = self.depth[current] + 1
+                self.potentials[neighbor] = table.cell_cost(cell) - self.potentials[current]
+                visited.append(neighbor)
+                queue.append(neighbor)
+        return visited
+
+    def pivot(self, entering, leaving) -> None:
+        """
+        Замена базисной клетки leaving на entering.
+        Перевешивается и пересчитывается только поддерево,
+        отрезанное удаляемым ребром.
+
+        :param entering: вводимая в базис клетка
+        :param leaving: выводимая из базиса клетка
+        :return:
+        """
+        if entering == leaving:
+            return
+
+        leaving_row, leaving_column = self._table.endpoints(leaving)
+        entering_row, entering_column = self._table.endpoints(entering)
+        leaving_column += self._rows
+        entering_column += self._rows
+
+        del self._adjacency[leaving_row][leaving_column]
+        del self._adjacency[leaving_column][leaving_row]
+        self._adjacency[entering_row][entering_column] = entering
+        self._adjacency[entering_column][entering_row] = entering
+
+        # Узел удаляемого ребра, ниже которого находится отрезаемое поддерево
+        child = leaving_column if self.parent[leaving_column] == leaving_row else leaving_row
+
+        # Конец вводимого ребра, лежащий в отрезанном поддереве
+        inner, outer = entering_row, entering_column
+        node = outer
+        while node != -1 and node != child:
+            node = self.parent[node]
+        if node == child:
+            inner, outer = outer, inner
+
+        self.potentials[inner] = self._table.cell_cost(entering) - self.potentials[outer]
+        self._hang(inner, outer)
+
+    def cycle(self, cell) -> list:
+        """
+        Цикл пересчета для свободной клетки: сама клетка
+        и путь в дереве от узла ее столбца до узла ее строки.
+        Клетки чередуют знак: четные позиции "+", нечетные "-".
+        Стоимость пропорциональна длине цикла.
+
+        :param cell:
+        :return: список клеток, либо пустой список, если узлы
+                 лежат в разных компонентах (цикла нет)
+        """
+        row, column = self._table.endpoints(cell)
+        first, second = self._rows + column, row
+        first_path, second_path = [first], [second]
+
+        while first != second:
+            if self.depth[first] >= self.depth[second]:
+                first = self.parent[first]
+                if first == -1:
+                    return []
+                first_path.append(first)
+            else:
+                second = self.parent[second]
+                if second == -1:
+                    return []
+                second_path.append(second)
+
+        # first_path и second_path заканчиваются общим предком
+        path = first_path + second_path[-2::-1]
+        return [cell] + [self.cell(path[k], path[k + 1]) for k in range(len(path) - 1)]
@@ -1,8 +1,9 @@
-import copy
+import numpy as np
 
-from prettytable import PrettyTable
-
-from src.model.transport_solution.table import Table, ItemTable
+from src.model.transport_solution.dsu import DisjointSet
+from src.model.transport_solution.sparse import SparseTable
+from src.model.transport_solution.sparse import sparse_remove_degenerate
+from src.model.transport_solution.table import Table
 
 
 def balance_table(table: Table) -> None:
@@ -41,14 +42,33 @@ def is_balanced(table: Table) -> bool:
 
 def calculate_minimal_cost(table: Table) -> int:
     """
-    Расчет минимальной стоимости
+    Расчет минимальной стоимости.
+    Искусственные маршруты SparseTable не учитываются: стоимость
+    равна сумме объемов плана, умноженных на стоимости маршрутов
 
     :param table:
     :return:
     """
-    return sum(
-        item.cost * item.amount for row in table.items for item in row if item.amount is not None
-    )
+    return table.plan_cost()
+
+
+def lower_bound(table: Table | SparseTable, u: np.ndarray, v: np.ndarray) -> int | float:
+    """
+    Нижняя граница стоимости оптимального плана по потенциалам u, v
+    (не обязательно допустимым).
+
+    Потенциалы исправляются до двойственно допустимых: U'[i] = min_j(C[i][j] - V[j]),
+    затем V'[j] = min_i(C[i][j] - U'[i]) (и симметрично, начиная со столбцов).
+    По теореме двойственности sum(A * U') + sum(B * V') не больше стоимости
+    любого плана; берется большая из двух границ.
+    Для оптимальных потенциалов граница равна стоимости плана.
+
+    :param table: сбалансированная таблица
+    :param u: потенциалы строк
+    :param v: потенциалы столбцов
+    :return:
+    """
+    return table.lower_bound(u, v)
 
 
 def is_degenerate(table: Table) -> bool:
@@ -59,75 +79,72 @@ def is_degenerate(table: Table) -> bool:
     :param table:
     :return:
     """
-    return len([j for row in table.items for j in row if j.amount is not None]) < table.rows + table.columns - 1
-
-
-def get_cycle(start_item: ItemTable, table: Table) -> list[ItemTable]:
-    path = [start_item] + [item for row in table.items for item in row if item.amount is not None]
-
-    previous_length: int
-    while True:
-        previous_length = len(path)
-
-        i = 0
-        while True:
-            if i >= len(path):
-                break
-            neighbors = get_neighbors(path[i], path)
-            if neighbors[0].amount is None or neighbors[1].amount is None:
-                path.pop(i)
-                break
-            i += 1
+    return table.basic_count < table.rows + table.columns - 1
 
-        if previous_length == len(path) or len(path) == 0:
-            break
-
-    cycle = []
-    for i in range(len(path)):
-        cycle.append(ItemTable(-1, -1))
-    previous_item = start_item
-    for i in range(len(cycle)):
-        cycle[i] = previous_item
-        previous_item = get_neighbors(previous_item, path)[i % 2]
-
-    return cycle.copy()
 
+def get_cycle(start_item: tuple[int, int], table: Table) -> list[tuple[int, int]]:
+    """
+    Цикл пересчета для свободной клетки по дереву базиса
 
-def get_neighbors(current_item: ItemTable, item_list: list[ItemTable]) -> list[ItemTable]:
-    neighbors = [ItemTable(-1, -1), ItemTable(-1, -1)]
-    for item in item_list:
-        if item != current_item:
-            if item.row == current_item.row and neighbors[0].amount is None:
-                neighbors[0] = item
-            elif item.column == current_item.column and neighbors[1].amount is None:
-                neighbors[1] = item
-            if neighbors[0].amount is not None and neighbors[1].amount is not None:
-                break
-    return neighbors.copy()
+    :param start_item: свободная клетка
+    :param table:
+    :return: клетки цикла, начиная со start_item, со знаками "+", "-", ...
+             (пустой список, если цикла нет)
+    """
+    return table.tree.cycle(start_item)
 
 
 def remove_degenerate(table: Table) -> None:
     """
-    Добавление нулей в вырожденную таблицу
+    Добавление нулей в вырожденную таблицу.
+
+    Строки и столбцы - узлы системы непересекающихся множеств,
+    базисные клетки объединяют их в компоненты. Нулевая клетка
+    добавляется только там, где она соединяет две компоненты,
+    поэтому циклы не возникают, а таблица не копируется.
 
     :param table:
     :return:
     """
+    if not is_degenerate(table):
+        return
+    if isinstance(table, SparseTable):
+        sparse_remove_degenerate(table)
+        return
 
-    while is_degenerate(table):
-        zero_added = False
-        for i in range(table.rows):
-            for j in range(table.columns):
-                if table.items[i][j].amount is None:
-                    item = table.items[i][j]
-                    artificial_table = copy.deepcopy(table)
-                    artificial_table.items[i][j] = ItemTable(i, j, item.cost, 0)
-                    if len(get_cycle(item, artificial_table)) == 0:
-                        table.items[i][j] = artificial_table.items[i][j]
-                        zero_added = True
-                        break
-            if zero_added:
-                break
+    rows = table.rows
+    components = DisjointSet(rows + table.columns)
+    for i, j in table.basic_cells():
+        components.union(i, rows + j)
+
+    # Для каждой компоненты - какая-нибудь ее строка и какой-нибудь столбец
+    component_row: dict[int, int] = {}
+    component_column: dict[int, int] = {}
+    for node in range(rows + table.columns):
+        root = components.find(node)
+        if node < rows:
+            component_row.setdefault(root, node)
+        else:
+            component_column.setdefault(root, node - rows)
+
+    # Компонента, к которой присоединяются остальные: нужна и строка, и столбец
+    hub = next((root for root in component_row if root in component_column), None)
+    if hub is None:
+        table.set_basic(0, 0, 0)
+        components.union(0, rows)
+        hub = components.find(0)
+    hub_row = component_row.get(hub, 0)
+    hub_column = component_column.get(hub, 0)
+
+    for root in set(component_row) | set(component_column):
+        if components.find(root) == components.find(hub):
+            continue
+        if root in component_row:
+            row, column = component_row[root], hub_column
+        else:
+            row, column = hub_row, component_column[root]
+        table.set_basic(row, column, 0)
+        components.union(row, rows + column)
 
 
 def table_to_html(table: Table, item: callable) -> str:
@@ -138,6 +155,9 @@ def table_to_html(table: Table, item: callable) -> str:
     :param table:
     :return: html string
     """
+    # prettytable нужен только для протокола: не загружается при импорте ядра
+    from prettytable import PrettyTable
+
     str_table = PrettyTable()
     str_table.field_names = [" "] + [f"B{i + 1}" for i in range(table.columns)]
     for i in range(table.rows):
@@ -0,0 +1,88 @@
+import numpy as np
+
+from src.model.transport_solution.table import Table
+
+
+def _penalties(costs: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Штрафы Фогеля для строк матрицы: разность двух наименьших стоимостей.
+    Исключенные клетки должны иметь стоимость inf.
+
+    :param costs:
+    :return: штрафы и индексы наименьших стоимостей
+    """
+    if costs.shape[1] == 1:
+        return np.zeros(costs.shape[0]), np.zeros((costs.shape[0], 2), dtype=np.intp)
+
+    smallest = np.argpartition(costs, 1, axis=1)[:, :2]
+    values = np.take_along_axis(costs, smallest, axis=1)
+    order = np.argsort(values, axis=1)
+    values = np.take_along_axis(values, order, axis=1)
+    minimal = np.take_along_axis(smallest, order, axis=1)
+
+    with np.errstate(invalid='ignore'):
+        penalties = values[:, 1] - values[:, 0]
+    # Осталась одна клетка - штраф не определен
+    penalties[np.isinf(values[:, 1])] = 0
+    return penalties, minimal
+
+
+def vogel_approximation(table: Table) -> None:
+    """
+    Метод аппроксимации Фогеля.
+
+    Штрафы пересчитываются только для строк (столбцов), у которых
+    исключенный столбец (строка) был одним из двух наименьших.
+
+    :param table:
+    :return:
+    """
+    needs = table.needs
+    resources = table.resources
+
+    costs = table.costs.astype(np.float64)
+    for i in range(table.rows):
+        if resources[i] == 0:
+            costs[i, :] = np.inf
+    for j in range(table.columns):
+        if needs[j] == 0:
+            costs[:, j] = np.inf
+
+    row_penalties, row_minimal = _penalties(costs)
+    column_penalties, column_minimal = _penalties(costs.T)
+    row_penalties[np.array(resources) == 0] = -np.inf
+    column_penalties[np.array(needs) == 0] = -np.inf
+
+    while True:
+        row = int(np.argmax(row_penalties))
+        column = int(np.argmax(column_penalties))
+        if row_penalties[row] == -np.inf or column_penalties[column] == -np.inf:
+            break
+
+        if row_penalties[row] >= column_penalties[column]:
+            i, j = row, int(row_minimal[row, 0])
+        else:
+            i, j = int(column_minimal[column, 0]), column
+
+        amount = min(resources[i], needs[j])
+        table.set_basic(i, j, amount)
+        resources[i] -= amount
+        needs[j] -= amount
+
+        if resources[i] == 0:
+            costs[i, :] = np.inf
+            row_penalties[i] = -np.inf
+            affected = np.flatnonzero(
+                ((column_minimal[:, 0] == i) | (column_minimal[:, 1] == i)) & (column_penalties != -np.inf)
+            )
+            if len(affected):
+                column_penalties[affected], column_minimal[affected] = _penalties(costs[:, affected].T)
+
+        if needs[j] == 0:
+            costs[:, j] = np.inf
+            column_penalties[j] = -np.inf
+            affected = np.flatnonzero(
+                ((row_minimal[:, 0] == j) | (row_minimal[:, 1] == j)) & (row_penalties != -np.inf)
+            )
+            if len(affected):
+                row_penalties[affected], row_minimal[affected] = _penalties(costs[affected])
@@ -0,0 +1,157 @@
+import numpy as np
+
+from src.model.transport_solution.sparse import SparseTable
+from src.model.transport_solution.table import Table
+
+
+def balanced_problem(
+        a: list[int],
+        b: list[int],
+        c: list[list[int | None]]
+) -> tuple[list[int], list[int], list[list[int | None]]]:
+    """
+    Ресурсы, потребности и стоимости после балансировки
+    (так же, как balance_table: фиктивная строка или столбец с нулевой стоимостью)
+
+    :param a:
+    :param b:
+    :param c:
+    :return:
+    """
+    a, b, c = list(a), list(b), [list(row) for row in c]
+    if sum(b) > sum(a):
+        a.append(sum(b) - sum(a))
+        c.append([0] * len(b))
+    elif sum(a) > sum(b):
+        b.append(sum(a) - sum(b))
+        for row in c:
+            row.append(0)
+    return a, b, c
+
+
+def _same_routes(table: Table | SparseTable, c: list[list[int | None]]) -> bool:
+    """
+    Совпадают ли разрешенные маршруты таблицы и матрицы стоимостей
+
+    :param table:
+    :param c: сбалансированная матрица стоимостей
+    :return:
+    """
+    forbidden = sum(cost is None for row in c for cost in row)
+    if not isinstance(table, SparseTable):
+        return forbidden == 0
+
+    real = ~table.artificial
+    rows, columns = table.arc_rows[real].tolist(), table.arc_columns[real].tolist()
+    allowed = table.rows * table.columns - forbidden
+    return len(rows) == allowed and all(c[row][column] is not None for row, column in zip(rows, columns))
+
+
+def dual_simplex(table: Table | SparseTable, max_pivots: int | None = None) -> bool:
+    """
+    Восстановление допустимости плана двойственным сетевым симплекс-методом.
+
+    Базис должен быть двойственно допустимым (все дельты >= 0), объемы
+    базисных клеток - заданы деревом (BasisTree.flows) и могут быть
+    отрицательными. Из базиса выводится клетка с наименьшим объемом,
+    вводится свободная клетка, пересекающая разрез дерева в нужном
+    направлении, с наименьшей дельтой - дельты остаются неотрицательными.
+
+    :param table:
+    :param max_pivots: ограничение числа итераций
+    :return: True, если план стал допустимым
+    """
+    pivots = 0
+    while True:
+        basic = np.flatnonzero(table.basis.reshape(-1))
+        amounts = table.amounts.reshape(-1)[basic]
+        if not len(basic) or amounts.min() >= 0:
+            return True
+        if max_pivots is not None and pivots >= max_pivots:
+            return False
+
+        leaving = table.cell_at(basic[np.argmin(amounts)])
+        tree = table.tree
+        row, column = table.endpoints(leaving)
+        column += table.rows
+
+        # Разрез дерева: сторона строки и сторона столбца выводимой клетки
+        child = column if tree.parent[column] == row else row
+        side = np.zeros(table.rows + table.columns, dtype=bool)
+        side[tree.subtree(child)] = True
+        if child == row:
+            side = ~side
+
+        # Объем выводимой клетки растет при вводе клетки (строка на стороне
+        # столбца, столбец на стороне строки)
+        eligible = table.crossing(side[:table.rows], ~side[table.rows:]) & ~table.basis.reshape(-1)
+        if not eligible.any():
+            return False
+        candidates = np.flatnonzero(eligible)
+        deltas = table.reduced_costs_of(tree.u, tree.v, candidates)
+        entering = table.cell_at(candidates[np.argmin(deltas)])
+
+        cycle = tree.cycle(entering)
+        theta = -table.amounts[leaving]
+        table.amounts[table.cell_index(cycle[0::2])] += theta
+        table.amounts[table.cell_index(cycle[1::2])] -= theta
+        table.pivot(entering, leaving)
+        pivots += 1
+
+
+def warm_start(
+        previous: Table | SparseTable,
+        a: list[int],
+        b: list[int],
+        c: list[list[int | None]],
+        max_pivots: int | None = None
+) -> Table | SparseTable | None:
+    """
+    Допустимый базисный план новой задачи, построенный из базиса
+    предыдущего решения (теплый старт).
+
+    Базис previous сохраняется, потенциалы пересчитываются по новым
+    стоимостям, объемы - по новым ресурсам и потребностям. Если объемы
+    получились отрицательными, допустимость восстанавливается двойственным
+    симплекс-методом (только когда стоимости не изменились или базис
+    остался двойственно допустимым). Дальше план оптимизируется обычным
+    NetworkSimplex, обычно за несколько итераций.
+
+    :param previous: таблица предыдущего решения (не изменяется)
+    :param a: ресурсы
+    :param b: потребности
+    :param c: стоимости (None - запрещенный маршрут)
+    :param max_pivots: ограничение числа итераций двойственного метода
+    :return: таблица или None, если нужен холодный старт (изменились размеры,
+             балансировка или разрешенные маршруты)
+    """
+    a, b, c = balanced_problem(a, b, c)
+    if (len(a), len(b)) != (previous.rows, previous.columns) or not _same_routes(previous, c):
+        return None
+
+    table = previous.copy()
+    table.update(a, b, c)
+    return table if repair(table, max_pivots) else None
+
+
+def repair(table: Table | SparseTable, max_pivots: int | None = None) -> bool:
+    """
+    Пересчет объемов по дереву базиса после изменения ресурсов,
+    потребностей или стоимостей (см. warm_start). Отрицательные объемы
+    исправляются двойственным симплекс-методом, если базис двойственно допустим
+
+    :param table: сбалансированная таблица с базисом
+    :param max_pivots: ограничение числа итераций двойственного метода
+    :return: True, если план допустим (иначе нужен холодный старт)
+    """
+    for cell, amount in table.tree.flows(table.resources, table.needs).items():
+        table.amounts[cell] = amount
+
+    basic = table.basis.reshape(-1)
+    if table.amounts.reshape(-1)[basic].min() >= 0:
+        return True
+
+    tree = table.tree
+    if table.reduced_costs(tree.u, tree.v).min() < 0:
+        return False
+    return dual_simplex(table, max_pivots or 10 * (table.rows + table.columns))
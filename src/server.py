@@ -0,0 +1,367 @@
+"""
+Сервер решения транспортных задач: долгоживущий процесс, принимающий
+задачи по Unix-сокету или TCP (localhost) и решающий их в пуле процессов.
+
+Протокол - JSON по строкам, в обе стороны. Задача - в формате консольного
+режима (см. src.cli): {"id": ..., "a": [...], "b": [...], "c": [[...]]};
+ответ - результат solve() с тем же id. Ответы на задачи одного соединения
+приходят по мере готовности, не обязательно по порядку.
+Запрос {"op": "stats"} возвращает статистику сервера: число решенных задач,
+размеры пачек, глубину очереди и процентили задержки.
+
+Задачи собираются в пачки (до batch_size задач или batch_delay секунд
+ожидания) и передаются процессам пула, которые уже импортировали ядро
+решателя. Очередь ограничена (max_pending): при ее заполнении сервер
+перестает читать новые задачи, и клиент ждет. Число задач одного
+соединения в работе ограничено max_inflight.
+
+Пример: python -m src.server --unix /tmp/transport.sock --workers 4
+Клиент: src.client.SolveClient
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import signal
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from src.cli import solve_chunk
+from src.model.transport_solution import FLOW_ENGINES
+from src.model.transport_solution import INITIAL_STRATEGIES
+from src.model.transport_solution import PRICING_RULES
+
+# Процентили задержки в статистике сервера
+PERCENTILES = (50, 90, 99)
+
+
+def _ready() -> bool:
+    """
+    Пустая задача для запуска процессов пула (импорт ядра до первых задач)
+
+    :return:
+    """
+    return True
+
+
+class LatencyWindow:
+    """
+    Задержки последних size задач (с) и их процентили
+    """
+
+    def __init__(self, size: int = 10000):
+        self._values: deque[float] = deque(maxlen=size)
+
+    def add(self, seconds: float) -> None:
+        self._values.append(seconds)
+
+    def percentiles(self) -> dict[str, float | None]:
+        """
+        Процентили задержки в миллисекундах (None, если задач еще не было)
+
+        :return:
+        """
+        values = sorted(self._values)
+        result = {}
+        for percentile in PERCENTILES:
+            index = min(len(values) - 1, int(len(values) * percentile / 100))
+            result[f'p{percentile}'] = values[index] * 1000 if values else None
+        result['max'] = values[-1] * 1000 if values else None
+        return result
+
+
+class SolveServer:
+    """
+    Асинхронный сервер решения задач с пакетной обработкой
+    """
+
+    def __init__(
+            self,
+            options: dict,
+            workers: int = 1,
+            batch_size: int = 32,
+            batch_delay: float = 0.002,
+            max_pending: int = 1024,
+            max_inflight: int = 256
+    ):
+        """
+        :param options: параметры solve() (см. src.cli.solve_problem)
+        :param workers: количество процессов пула
+        :param batch_size: наибольшее число задач в пачке
+        :param batch_delay: наибольшее ожидание неполной пачки, с
+        :param max_pending: наибольшее число задач в очереди (дальше - ожидание клиента)
+        :param max_inflight: наибольшее число задач одного соединения в работе
+        """
+        self._options = options
+        self._workers = max(workers, 1)
+        self._batch_size = max(batch_size, 1)
+        self._batch_delay = batch_delay
+        self._max_inflight = max(max_inflight, 1)
+        self._queue: asyncio.Queue | None = None
+        self._max_pending = max(max_pending, 1)
+        self._executor: ProcessPoolExecutor | None = None
+        self._batcher: asyncio.Task | None = None
+        self._batches: set[asyncio.Task] = set()
+        self._slots: asyncio.Semaphore | None = None
+
+        self.latency = LatencyWindow()
+        self.solved = 0
+        self.failed = 0
+        self.batch_count = 0
+        self.connections = 0
+        self.started = time.time()
+
+    def stats(self) -> dict:
+        """
+        Статистика сервера для ответа на {"op": "stats"}
+
+        :return:
+        """
+        return {
+            'solved': self.solved,
+            'failed': self.failed,
+            'batches': self.batch_count,
+            'mean_batch': self.solved / self.batch_count if self.batch_count else 0.0,
+            'pending': self._queue.qsize() if self._queue is not None else 0,
+            'connections': self.connections,
+            'workers': self._workers,
+            'uptime': time.time() - self.started,
+            'latency_ms': self.latency.percentiles(),
+        }
+
+    async def start(self) -> None:
+        """
+        Запуск пула процессов и сборщика пачек
+
+        :return:
+        """
+        loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue(self._max_pending)
+        # в работе не более двух пачек на процесс: остальное ждет в ограниченной очереди
+        self._slots = asyncio.Semaphore(2 * self._workers)
+        self._executor = ProcessPoolExecutor(max_workers=self._workers)
+        await asyncio.gather(*[loop.run_in_executor(self._executor, _ready) for _ in range(self._workers)])
+        self._batcher = asyncio.create_task(self._collect())
+
+    async def close(self) -> None:
+        """
+        Остановка: задачи в работе завершаются, пул закрывается
+
+        :return:
+        """
+        if self._batcher is not None:
+            self._batcher.cancel()
+        if self._batches:
+            await asyncio.gather(*self._batches, return_exceptions=True)
+        if self._executor is not None:
+            self._executor.shutdown()
+
+    async def submit(self, problem: dict) -> dict:
+        """
+        Решение задачи через очередь (ждет, если очередь заполнена)
+
+        :param problem: задача в формате src.cli
+        :return: результат
+        """
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((problem, future, time.perf_counter()))
+        return await future
+
+    async def _collect(self) -> None:
+        """
+        Сборка пачек: первая задача ждется без ограничения, остальные -
+        до batch_size задач или batch_delay секунд
+
+        :return:
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self._batch_delay
+            while len(batch) < self._batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            await self._slots.acquire()
+            task = asyncio.create_task(self._run(batch))
+            self._batches.add(task)
+            task.add_done_callback(self._batches.discard)
+
+    async def _run(self, batch: list[tuple[dict, asyncio.Future, float]]) -> None:
+        """
+        Решение пачки в процессе пула и передача результатов ожидающим
+
+        :param batch:
+        :return:
+        """
+        try:
+            problems = [problem for problem, _, _ in batch]
+            try:
+                results = await asyncio.get_running_loop().run_in_executor(
+                    self._executor, solve_chunk, problems, self._options
+                )
+            except Exception as error:
+                results = [{'id': problem.get('id'), 'error': str(error)} for problem in problems]
+        finally:
+            self._slots.release()
+
+        self.batch_count += 1
+        finished = time.perf_counter()
+        for (_, future, received), result in zip(batch, results):
+            self.latency.add(finished - received)
+            self.solved += 1
+            self.failed += 'error' in result
+            if not future.done():
+                future.set_result(result)
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """
+        Обработка соединения: задачи читаются построчно, ответы
+        записываются по мере готовности
+
+        :param reader:
+        :param writer:
+        :return:
+        """
+        self.connections += 1
+        inflight = asyncio.Semaphore(self._max_inflight)
+        tasks: set[asyncio.Task] = set()
+
+        async def reply(message: dict) -> None:
+            writer.write((json.dumps(message, ensure_ascii=False, default=str) + '\n').encode('utf-8'))
+            await writer.drain()
+
+        async def answer(problem: dict) -> None:
+            try:
+                await reply(await self.submit(problem))
+            finally:
+                inflight.release()
+
+        try:
+            number = 0
+            while line := await reader.readline():
+                if not line.strip():
+                    continue
+                try:
+                    message = json.loads(line)
+                    if not isinstance(message, dict):
+                        raise ValueError('Ожидается объект JSON')
+                except ValueError as error:
+                    await reply({'id': None, 'error': f'Некорректный запрос: {error}'})
+                    continue
+                if message.get('op') == 'stats':
+                    await reply({'id': message.get('id'), 'stats': self.stats()})
+                    continue
+
+                message.setdefault('id', number)
+                number += 1
+                # ограничение задач соединения в работе: дальше чтение приостанавливается
+                await inflight.acquire()
+                task = asyncio.create_task(answer(message))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            for task in tasks:
+                task.cancel()
+            self.connections -= 1
+            writer.close()
+
+
+def parse_address(address: str) -> tuple[str, str | int | None]:
+    """
+    Адрес сервера: "unix:/path/to.sock" или "host:port"
+
+    :param address:
+    :return: ('unix', путь) или (хост, порт)
+    """
+    if address.startswith('unix:'):
+        return 'unix', address[len('unix:'):]
+    host, _, port = address.rpartition(':')
+    return host or '127.0.0.1', int(port)
+
+
+async def serve(address: str, server: SolveServer) -> None:
+    """
+    Запуск сервера до сигнала остановки (SIGINT, SIGTERM)
+
+    :param address: см. parse_address
+    :param server:
+    :return:
+    """
+    await server.start()
+    host, port = parse_address(address)
+    # строка задачи может быть большой: ограничение буфера чтения - 64 МБ
+    if host == 'unix':
+        listener = await asyncio.start_unix_server(server.handle, path=port, limit=1 << 26)
+    else:
+        listener = await asyncio.start_server(server.handle, host, port, limit=1 << 26)
+
+    stopped = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for stop_signal in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(stop_signal, stopped.set)
+        except NotImplementedError:
+            pass
+    print(f'Сервер решения запущен: {address}, процессов: {server.stats()["workers"]}', file=sys.stderr)
+    async with listener:
+        await stopped.wait()
+    await server.close()
+    if host == 'unix' and os.path.exists(port):
+        os.unlink(port)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description='Сервер решения транспортных задач')
+    address = parser.add_mutually_exclusive_group()
+    address.add_argument('--unix', help='путь Unix-сокета')
+    address.add_argument('--tcp', default='127.0.0.1:8765', help='адрес TCP host:port (по умолчанию 127.0.0.1:8765)')
+    parser.add_argument('-w', '--workers', type=int, default=os.cpu_count() or 1, help='количество процессов')
+    parser.add_argument('--batch-size', type=int, default=32, help='наибольшее число задач в пачке')
+    parser.add_argument('--batch-delay', type=float, default=0.002, help='ожидание неполной пачки, с')
+    parser.add_argument('--max-pending', type=int, default=1024, help='наибольшая длина очереди задач')
+    parser.add_argument('--max-inflight', type=int, default=256, help='наибольшее число задач соединения в работе')
+    parser.add_argument('--initial', choices=list(INITIAL_STRATEGIES), default='nwc', help='метод опорного плана')
+    parser.add_argument('--pricing', choices=list(PRICING_RULES), default='dantzig', help='правило выбора клетки')
+    parser.add_argument(
+        '--engine', choices=[*FLOW_ENGINES, 'auto'], default='simplex',
+        help='метод оптимального плана (auto - по размеру задачи)'
+    )
+    parser.add_argument('--max-pivots', type=int, help='ограничение числа итераций')
+    parser.add_argument('--time-limit', type=float, help='ограничение времени на задачу, с')
+    parser.add_argument('--exact', action='store_true', help='точный режим: дроби без округления')
+    args = parser.parse_args(argv)
+
+    options = {
+        'initial': args.initial,
+        'pricing': args.pricing,
+        'engine': args.engine,
+        'max_pivots': args.max_pivots,
+        'time_limit': args.time_limit,
+        'exact': args.exact,
+    }
+    server = SolveServer(
+        options,
+        workers=args.workers,
+        batch_size=args.batch_size,
+        batch_delay=args.batch_delay,
+        max_pending=args.max_pending,
+        max_inflight=args.max_inflight,
+    )
+    asyncio.run(serve(f'unix:{args.unix}' if args.unix else args.tcp, server))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
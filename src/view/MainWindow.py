@@ -60,6 +60,38 @@ class Ui_MainWindow(object):
         self.label_3.setObjectName("label_3")
         self.horizontalLayout_6.addWidget(self.label_3)
         self.verticalLayout_5.addLayout(self.horizontalLayout_6)
+        self.horizontalLayout_7 = QtWidgets.QHBoxLayout()
+        self.horizontalLayout_7.setObjectName("horizontalLayout_7")
+        self.label_4 = QtWidgets.QLabel(parent=self.initSizeBox)
+        self.label_4.setObjectName("label_4")
+        self.horizontalLayout_7.addWidget(self.label_4)
+        self.initialStrategy = QtWidgets.QComboBox(parent=self.initSizeBox)
+        self.initialStrategy.setObjectName("initialStrategy")
+        self.horizontalLayout_7.addWidget(self.initialStrategy)
+        self.label_5 = QtWidgets.QLabel(parent=self.initSizeBox)
+        self.label_5.setObjectName("label_5")
+        self.horizontalLayout_7.addWidget(self.label_5)
+        self.pricingRule = QtWidgets.QComboBox(parent=self.initSizeBox)
+        self.pricingRule.setObjectName("pricingRule")
+        self.horizontalLayout_7.addWidget(self.pricingRule)
+        self.label_6 = QtWidgets.QLabel(parent=self.initSizeBox)
+        self.label_6.setObjectName("label_6")
+        self.horizontalLayout_7.addWidget(self.label_6)
+        self.traceLevel = QtWidgets.QComboBox(parent=self.initSizeBox)
+        self.traceLevel.setObjectName("traceLevel")
+        self.horizontalLayout_7.addWidget(self.traceLevel)
+        self.profileSolve = QtWidgets.QCheckBox(parent=self.initSizeBox)
+        self.profileSolve.setObjectName("profileSolve")
+        self.horizontalLayout_7.addWidget(self.profileSolve)
+        self.exactSolve = QtWidgets.QCheckBox(parent=self.initSizeBox)
+        self.exactSolve.setObjectName("exactSolve")
+        self.horizontalLayout_7.addWidget(self.exactSolve)
+        self.sensitivitySolve = QtWidgets.QCheckBox(parent=self.initSizeBox)
+        self.sensitivitySolve.setObjectName("sensitivitySolve")
+        self.horizontalLayout_7.addWidget(self.sensitivitySolve)
+        spacerItem2 = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Policy.Expanding, QtWidgets.QSizePolicy.Policy.Minimum)
+        self.horizontalLayout_7.addItem(spacerItem2)
+        self.verticalLayout_5.addLayout(self.horizontalLayout_7)
         self.verticalLayout.addWidget(self.initSizeBox)
         self.inputTable = QtWidgets.QTableView(parent=self.inputBox)
         self.inputTable.setObjectName("inputTable")
@@ -75,6 +107,9 @@ class Ui_MainWindow(object):
         self.outputTable = QtWidgets.QTableView(parent=self.outputBox)
         self.outputTable.setObjectName("outputTable")
         self.verticalLayout_2.addWidget(self.outputTable)
+        self.sensitivityTable = QtWidgets.QTableView(parent=self.outputBox)
+        self.sensitivityTable.setObjectName("sensitivityTable")
+        self.verticalLayout_2.addWidget(self.sensitivityTable)
         self.consoleArea = QtWidgets.QTextEdit(parent=self.outputBox)
         font = QtGui.QFont()
         font.setPointSize(12)
@@ -100,4 +135,10 @@ class Ui_MainWindow(object):
         self.label.setText(_translate("MainWindow", "<html><head/><body><p>Ширина:</p></body></html>"))
         self.label_2.setText(_translate("MainWindow", "<html><head/><body><p><span style=\" font-size:11pt;\">Высота:  </span></p></body></html>"))
         self.label_3.setText(_translate("MainWindow", "<html><head/><body><p><a href=\"https://github.com/JKearnsl/transport_task\"><span style=\" text-decoration: underline; color:#2980b9;\">GitHub </span></a>2023</p></body></html>"))
+        self.label_4.setText(_translate("MainWindow", "Опорный план:"))
+        self.label_5.setText(_translate("MainWindow", "Правило:"))
+        self.label_6.setText(_translate("MainWindow", "Протокол:"))
+        self.profileSolve.setText(_translate("MainWindow", "Профиль"))
+        self.exactSolve.setText(_translate("MainWindow", "Точно"))
+        self.sensitivitySolve.setText(_translate("MainWindow", "Чувствительность"))
         self.outputBox.setTitle(_translate("MainWindow", "Выходные данные"))
@@ -0,0 +1,245 @@
+from PyQt6.QtCore import QAbstractTableModel, QModelIndex, Qt, pyqtSignal
+from PyQt6.QtGui import QColor
+
+RESOURCE_COLOR = QColor('#fffdd0')
+NEED_COLOR = QColor('#99CCCC')
+PLAN_COLOR = QColor('#CCFF33')
+DUMMY_COLOR = QColor('#d3d3d3')
+
+
+def _changed_rows(old: list[list], new: list[list]) -> list[tuple[int, int]]:
+    """
+    Диапазоны подряд идущих измененных строк (первая, последняя)
+
+    :param old:
+    :param new:
+    :return:
+    """
+    ranges = []
+    for i, (old_row, new_row) in enumerate(zip(old, new)):
+        if old_row == new_row:
+            continue
+        if ranges and ranges[-1][1] == i - 1:
+            ranges[-1] = (ranges[-1][0], i)
+        else:
+            ranges.append((i, i))
+    return ranges
+
+
+class _MatrixModel(QAbstractTableModel):
+    """
+    Таблица, читающая значения из матрицы list[list] без создания
+    элементов на каждую клетку. refresh сравнивает новую матрицу
+    с показанной и сообщает представлению только об измененных строках.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._matrix: list[list] = [[None]]
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._matrix)
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() or not self._matrix else len(self._matrix[0])
+
+    def set_matrix(self, matrix: list[list]):
+        """
+        Замена показываемой матрицы
+
+        :param matrix:
+        :return:
+        """
+        matrix = [list(row) for row in matrix] or [[None]]
+        if len(matrix) != len(self._matrix) or len(matrix[0]) != len(self._matrix[0]):
+            self.beginResetModel()
+            self._matrix = matrix
+            self.endResetModel()
+            return
+
+        ranges = _changed_rows(self._matrix, matrix)
+        self._matrix = matrix
+        for first, last in ranges:
+            self.dataChanged.emit(self.index(first, 0), self.index(last, self.columnCount() - 1))
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        if role == Qt.ItemDataRole.DisplayRole or role == Qt.ItemDataRole.EditRole:
+            value = self._matrix[index.row()][index.column()]
+            return str(value) if value is not None else ""
+        if role == Qt.ItemDataRole.TextAlignmentRole:
+            return Qt.AlignmentFlag.AlignCenter
+        if role == Qt.ItemDataRole.BackgroundRole:
+            return self.color(index.row(), index.column())
+        return None
+
+    def color(self, row: int, column: int) -> QColor | None:
+        return None
+
+
+class InputTableModel(_MatrixModel):
+    """
+    Входная таблица: первая строка - потребности B, первый столбец -
+    ресурсы A, остальное - стоимости. Правки пользователя хранятся
+    в таблице до передачи в модель (table) и сообщаются сигналом edited.
+    """
+    edited = pyqtSignal()
+
+    def __init__(self, model, parent=None):
+        super().__init__(parent)
+        self._model = model
+
+    def refresh(self):
+        self.set_matrix(self._model.input_table)
+
+    def table(self) -> list[list]:
+        """
+        Текущее содержимое таблицы с учетом правок
+
+        :return:
+        """
+        return [list(row) for row in self._matrix]
+
+    def flags(self, index: QModelIndex) -> Qt.ItemFlag:
+        return super().flags(index) | Qt.ItemFlag.ItemIsEditable
+
+    def setData(self, index: QModelIndex, value, role: int = Qt.ItemDataRole.EditRole) -> bool:
+        if not index.isValid() or role != Qt.ItemDataRole.EditRole:
+            return False
+        value = str(value).strip() or None
+        if self._matrix[index.row()][index.column()] == value:
+            return False
+        self._matrix[index.row()][index.column()] = value
+        self.dataChanged.emit(index, index)
+        self.edited.emit()
+        return True
+
+    def color(self, row: int, column: int) -> QColor | None:
+        if row == 0 and column > 0:
+            return NEED_COLOR
+        if row > 0 and column == 0:
+            return RESOURCE_COLOR
+        return None
+
+    def headerData(self, section: int, orientation: Qt.Orientation, role: int = Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+        if section == 0:
+            return " "
+        return f"B{section}" if orientation == Qt.Orientation.Horizontal else f"A{section} = "
+
+
+class SolutionTableModel(_MatrixModel):
+    """
+    Выходная таблица (TransportSolutionModel.solution).
+    Фиктивные строки и столбцы, добавленные балансировкой, выделяются серым.
+    """
+
+    def __init__(self, model, parent=None):
+        super().__init__(parent)
+        self._model = model
+        self._height = 1
+        self._width = 1
+
+    def refresh(self):
+        self._height = self._model.height
+        self._width = self._model.width
+        self.set_matrix(self._model.solution)
+        self.headerDataChanged.emit(Qt.Orientation.Horizontal, 0, self.columnCount() - 1)
+        self.headerDataChanged.emit(Qt.Orientation.Vertical, 0, self.rowCount() - 1)
+
+    def color(self, row: int, column: int) -> QColor | None:
+        real_row = row < self._height
+        real_column = column < self._width
+        if row == 0 and column == 0:
+            return None
+        if row == 0:
+            return NEED_COLOR if real_column else DUMMY_COLOR
+        if column == 0:
+            return RESOURCE_COLOR if real_row else DUMMY_COLOR
+        return PLAN_COLOR if real_row and real_column else DUMMY_COLOR
+
+    def headerData(self, section: int, orientation: Qt.Orientation, role: int = Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+        if section == 0:
+            return " "
+        if orientation == Qt.Orientation.Horizontal:
+            return f"B{section}" if section < self._width else f"NewB{section}"
+        return f"A{section} = " if section < self._height else f"NewA{section} = "
+
+
+def _bound(value, infinity: str) -> str:
+    return infinity if value is None else str(value)
+
+
+def _interval(lower, upper) -> str:
+    return f"[{_bound(lower, '-∞')}; {_bound(upper, '+∞')}]"
+
+
+class SensitivityTableModel(_MatrixModel):
+    """
+    Анализ чувствительности (TransportSolutionModel.sensitivity):
+    в клетках - диапазоны стоимостей, в первой строке и первом столбце -
+    диапазоны потребностей и ресурсов. Изменение стоимости плана на
+    единицу ресурса (потребности) выводится во всплывающей подсказке.
+    """
+
+    def __init__(self, model, parent=None):
+        super().__init__(parent)
+        self._model = model
+        self._basic: set[tuple[int, int]] = set()
+        self._hints: dict[tuple[int, int], str] = {}
+
+    def refresh(self):
+        sensitivity = self._model.sensitivity
+        if sensitivity is None:
+            self._basic, self._hints = set(), {}
+            self.set_matrix([[None]])
+            return
+
+        self._hints = {}
+        for j, demand in enumerate(sensitivity.demand, start=1):
+            self._hints[0, j] = (
+                f"Вместе с A{demand.partner + 1}, стоимость плана: {demand.price} на единицу"
+            )
+        for i, supply in enumerate(sensitivity.supply, start=1):
+            self._hints[i, 0] = (
+                f"Вместе с B{supply.partner + 1}, стоимость плана: {supply.price} на единицу"
+            )
+        self._basic = {
+            (i, j)
+            for i, row in enumerate(sensitivity.costs, start=1)
+            for j, cell in enumerate(row, start=1)
+            if cell is not None and cell.basic
+        }
+        self.set_matrix([
+            [None, *[_interval(demand.lower, demand.upper) for demand in sensitivity.demand]],
+            *[
+                [
+                    _interval(supply.lower, supply.upper),
+                    *[_interval(cell.lower, cell.upper) if cell is not None else None for cell in row]
+                ]
+                for supply, row in zip(sensitivity.supply, sensitivity.costs)
+            ]
+        ])
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.ToolTipRole and index.isValid():
+            return self._hints.get((index.row(), index.column()))
+        return super().data(index, role)
+
+    def color(self, row: int, column: int) -> QColor | None:
+        if row == 0 and column > 0:
+            return NEED_COLOR
+        if row > 0 and column == 0:
+            return RESOURCE_COLOR
+        return PLAN_COLOR if (row, column) in self._basic else None
+
+    def headerData(self, section: int, orientation: Qt.Orientation, role: int = Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+        if section == 0:
+            return " "
+        return f"B{section}" if orientation == Qt.Orientation.Horizontal else f"A{section} = "
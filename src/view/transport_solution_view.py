@@ -1,10 +1,15 @@
-from PyQt6.QtCore import Qt
-from PyQt6.QtGui import QDoubleValidator, QStandardItemModel, QStandardItem, QColor
-from PyQt6.QtWidgets import QMainWindow, QAbstractItemView
+from PyQt6.QtGui import QTextCursor
+from PyQt6.QtWidgets import QMainWindow
 
+from src.model.transport_solution import INITIAL_STRATEGIES
+from src.model.transport_solution import PRICING_RULES
+from src.model.transport_solution import TRACE_LEVELS
 from src.utils.observer import TransportSolutionDObserver
 from src.utils.ts_meta import TSMeta
 from src.view.MainWindow import Ui_MainWindow
+from src.view.table_models import InputTableModel
+from src.view.table_models import SensitivityTableModel
+from src.view.table_models import SolutionTableModel
 
 
 class TransportSolutionView(QMainWindow, TransportSolutionDObserver, metaclass=TSMeta):
@@ -13,6 +18,9 @@ class TransportSolutionView(QMainWindow, TransportSolutionDObserver, metaclass=T
 
     """
 
+    # Записей протокола, выводимых в консоль за раз
+    console_page_size = 20
+
     def __init__(self, controller, model, parent=None):
 
         super(QMainWindow, self).__init__(parent)
@@ -21,97 +29,99 @@ class TransportSolutionView(QMainWindow, TransportSolutionDObserver, metaclass=T
 
         self.ui = Ui_MainWindow()
         self.ui.setupUi(self)
-        self.ui.inputTable.setModel(QStandardItemModel(1, 1))
-        self.ui.outputTable.setModel(QStandardItemModel(1, 1))
-        self.ui.inputTable.model().setHorizontalHeaderLabels([" "])
-        self.ui.inputTable.model().setVerticalHeaderLabels([" "])
-        self.ui.outputTable.model().setHorizontalHeaderLabels([" "])
-        self.ui.outputTable.model().setVerticalHeaderLabels([" "])
-        self.ui.inputTable.setColumnWidth(0, 50)
-        self.ui.outputTable.setColumnWidth(0, 50)
+        self.input_model = InputTableModel(self.model, self)
+        self.output_model = SolutionTableModel(self.model, self)
+        self.sensitivity_model = SensitivityTableModel(self.model, self)
+        self.ui.inputTable.setModel(self.input_model)
+        self.ui.outputTable.setModel(self.output_model)
+        self.ui.sensitivityTable.setModel(self.sensitivity_model)
+        self.ui.inputTable.horizontalHeader().setDefaultSectionSize(50)
+        self.ui.outputTable.horizontalHeader().setDefaultSectionSize(50)
+        self.ui.sensitivityTable.horizontalHeader().setDefaultSectionSize(90)
         self.ui.tableWidth.setMinimum(0)
         self.ui.tableHeight.setMinimum(0)
+        for key, (name, _) in INITIAL_STRATEGIES.items():
+            self.ui.initialStrategy.addItem(name, key)
+        self.ui.initialStrategy.setCurrentIndex(self.ui.initialStrategy.findData(self.model.initial_strategy))
+        for key, (name, _) in PRICING_RULES.items():
+            self.ui.pricingRule.addItem(name, key)
+        self.ui.pricingRule.setCurrentIndex(self.ui.pricingRule.findData(self.model.pricing_rule))
+        for key, (name, _) in TRACE_LEVELS.items():
+            self.ui.traceLevel.addItem(name, key)
+        self.ui.traceLevel.setCurrentIndex(self.ui.traceLevel.findData(self.model.trace_level))
+        self.ui.profileSolve.setChecked(self.model.profile)
+        self.ui.profileSolve.setToolTip("Время этапов решения, счетчики итераций и пиковая память в протоколе")
+        self.ui.exactSolve.setChecked(self.model.exact)
+        self.ui.exactSolve.setToolTip("Дроби и десятичные без округления: задача решается в целых числах")
+        self.ui.sensitivitySolve.setChecked(self.model.sensitivity_enabled)
+        self.ui.sensitivitySolve.setToolTip(
+            "Диапазоны стоимостей, ресурсов и потребностей, в которых оптимальный базис не меняется"
+        )
+        self.ui.sensitivityTable.setVisible(self.model.sensitivity_enabled)
+        self._trace = None
+        self._trace_shown = 0
 
         # Регистрация представлений
         self.model.add_observer(self)
 
         # События
-        self.ui.inputTable.model().itemChanged.connect(self.controller.input_table)
+        self.input_model.edited.connect(self.controller.table_edited)
         self.ui.tableWidth.valueChanged.connect(self.controller.resize_table)
         self.ui.tableHeight.valueChanged.connect(self.controller.resize_table)
+        self.ui.initialStrategy.currentIndexChanged.connect(self.controller.change_initial_strategy)
+        self.ui.pricingRule.currentIndexChanged.connect(self.controller.change_pricing_rule)
+        self.ui.traceLevel.currentIndexChanged.connect(self.controller.change_trace_level)
+        self.ui.profileSolve.toggled.connect(self.controller.change_profile)
+        self.ui.exactSolve.toggled.connect(self.controller.change_exact)
+        self.ui.sensitivitySolve.toggled.connect(self.controller.change_sensitivity)
+        self.ui.consoleArea.verticalScrollBar().valueChanged.connect(self.console_scrolled)
 
     def model_changed(self):
         """
         Метод вызывается при изменении модели.
         Запрашивает и отображает решение
         """
+        self.input_model.refresh()
+        self.output_model.refresh()
+        self.sensitivity_model.refresh()
+        self.ui.sensitivityTable.setVisible(self.model.sensitivity_enabled)
+
+        if self.model.trace is not self._trace:
+            self._trace = self.model.trace
+            self._trace_shown = 0
+            self.ui.consoleArea.clear()
+            self.show_console_page()
+
+    def show_console_page(self):
+        """
+        Вывод в консоль следующей страницы протокола.
+        Страницы добавляются, пока консоль не заполнится, дальше - при прокрутке
+        """
+        scroll_bar = self.ui.consoleArea.verticalScrollBar()
+        while self._trace_shown < len(self._trace):
+            stop = self._trace_shown + self.console_page_size
+            cursor = self.ui.consoleArea.textCursor()
+            cursor.movePosition(QTextCursor.MoveOperation.End)
+            cursor.insertHtml(('<br/>' if self._trace_shown else '') + self._trace.render(self._trace_shown, stop))
+            self._trace_shown = min(stop, len(self._trace))
+            if scroll_bar.maximum() > 0:
+                break
+
+    def console_scrolled(self, value: int):
+        scroll_bar = self.ui.consoleArea.verticalScrollBar()
+        if value >= scroll_bar.maximum() - scroll_bar.pageStep():
+            self.show_console_page()
+
+    def solve_started(self):
+        self.statusBar().showMessage("Решение...")
+
+    def solve_progress(self, pivots: int):
+        """
+        Ход фонового решения
 
-        self.ui.inputTable.model().itemChanged.disconnect(self.controller.input_table)
-
-        self.ui.inputTable.model().setRowCount(self.model.height)
-        self.ui.inputTable.model().setColumnCount(self.model.width)
-
-        self.ui.outputTable.model().setRowCount(self.model.height)
-        self.ui.outputTable.model().setColumnCount(self.model.width)
-
-        for i in range(self.model.height):
-            for j in range(self.model.width):
-                value = self.model.input_table[i][j]
-                item = QStandardItem(str(value if value else " "))
-                item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-
-                self.ui.inputTable.model().setItem(i, j, item)
-
-                if i == 0 and j > 0:
-                    item.setData(QColor('#99CCCC'), Qt.ItemDataRole.BackgroundRole)
-                elif i > 0 and j == 0:
-                    item.setData(QColor('#fffdd0'), Qt.ItemDataRole.BackgroundRole)
-
-                self.ui.inputTable.setColumnWidth(j, 50)
-
-        delta_row = len(self.model.solution) - self.model.height
-        delta_col = len(self.model.solution[0]) - self.model.width
-
-        output_vertical_header = [" "] + [f"A{i} = " for i in range(1, self.model.height)]
-        output_horizontal_header = [" "] + [f"B{i}" for i in range(1, self.model.width)]
-
-        for i in range(len(self.model.solution)):
-            if i >= self.model.height:
-                output_vertical_header.append(f"NewA{i} = ")
-            for j in range(len(self.model.solution[i])):
-                if j >= self.model.width and i == 0:
-                    output_horizontal_header.append(f"NewB{j}")
-
-                value = self.model.solution[i][j]
-                item = QStandardItem(str(value) if value is not None else " ")
-                item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-                item.setEditable(False)
-
-                self.ui.outputTable.model().setItem(i, j, item)
-
-                if i == 0:
-                    if 0 < j <= self.model.width - delta_col:
-                        item.setData(QColor('#99CCCC'), Qt.ItemDataRole.BackgroundRole)
-                    elif self.model.width - delta_col < j:
-                        item.setData(QColor('#d3d3d3'), Qt.ItemDataRole.BackgroundRole)
-                elif j == 0:
-                    if 0 < i <= self.model.height - delta_row:
-                        item.setData(QColor('#fffdd0'), Qt.ItemDataRole.BackgroundRole)
-                    elif self.model.height - delta_row < i:
-                        item.setData(QColor('#d3d3d3'), Qt.ItemDataRole.BackgroundRole)
-                elif (0 < i <= self.model.height - delta_row) and (0 < j <= self.model.width - delta_col):
-                    item.setData(QColor('#CCFF33'), Qt.ItemDataRole.BackgroundRole)
-                else:
-                    item.setData(QColor('#d3d3d3'), Qt.ItemDataRole.BackgroundRole)
-
-                self.ui.outputTable.setColumnWidth(j, 50)
-
-        self.ui.inputTable.model().setHorizontalHeaderLabels([" "] + [f"B{i}" for i in range(1, self.model.width)])
-        self.ui.inputTable.model().setVerticalHeaderLabels([" "] + [f"A{i} = " for i in range(1, self.model.height)])
-        self.ui.outputTable.model().setHorizontalHeaderLabels(output_horizontal_header)
-        self.ui.outputTable.model().setVerticalHeaderLabels(output_vertical_header)
-
-        self.ui.inputTable.model().itemChanged.connect(self.controller.input_table)
+        :param pivots: выполнено итераций метода потенциалов
+        """
+        self.statusBar().showMessage(f"Решение... итераций: {pivots}")
 
-        self.ui.consoleArea.clear()
-        self.ui.consoleArea.setHtml(self.model.console_output)
+    def solve_finished(self):
+        self.statusBar().clearMessage()
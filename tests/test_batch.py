@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+
+from src.model.transport_solution import solve
+from src.model.transport_solution import solve_batch
+
+
+def batch(kind: str, k: int, m: int, n: int, seed: int = 0) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    rng = np.random.default_rng(seed)
+    if kind == 'float':
+        a = rng.random((k, m)) * 10
+        b = rng.random((k, n)) * 10
+        c = rng.random((k, m, n)) * 5
+    elif kind == 'degenerate':
+        # равные ресурсы и потребности: много нулевых базисных перевозок
+        a = np.full((k, m), 5)
+        b = np.full((k, n), 5 * m // n)
+        b[:, 0] += 5 * m - b.sum(axis=1)
+        c = rng.integers(0, 3, (k, m, n))
+    else:
+        a = rng.integers(0, 30, (k, m))
+        b = rng.integers(0, 30, (k, n))
+        c = rng.integers(1, 100, (k, m, n))
+    return a, b, c
+
+
+@pytest.mark.parametrize('kind, m, n', [
+    ('int', 5, 5),
+    ('int', 8, 3),
+    ('float', 6, 4),
+    ('degenerate', 6, 3),
+])
+def test_batch_matches_single_solve(kind, m, n):
+    a, b, c = batch(kind, 40, m, n)
+    result = solve_batch(a, b, c)
+    assert result.plans.shape == (40, m, n)
+    assert result.optimal.all()
+    for i in range(40):
+        expected = solve(a[i].tolist(), b[i].tolist(), c[i].tolist())
+        plan = result.plans[i]
+        assert result.costs[i] == pytest.approx(expected.cost)
+        assert (plan * c[i]).sum() == pytest.approx(expected.cost)
+        assert (plan >= 0).all()
+        shipped = min(a[i].sum(), b[i].sum())
+        assert plan.sum() == pytest.approx(shipped)
+        assert (plan.sum(axis=1) <= a[i] + 1e-9).all() and (plan.sum(axis=0) <= b[i] + 1e-9).all()
+
+
+def test_batch_rejects_forbidden_routes():
+    a, b, c = batch('float', 2, 3, 3)
+    c[0, 1, 1] = np.inf
+    with pytest.raises(ValueError):
+        solve_batch(a, b, c)
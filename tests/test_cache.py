@@ -0,0 +1,59 @@
+import numpy as np
+
+from src.model.transport_solution import solve
+from src.model.transport_solution.cache import CachedSolution
+from src.model.transport_solution.cache import SolutionCache
+
+
+def problem(seed: int) -> tuple[list, list, list]:
+    rng = np.random.default_rng(seed)
+    a = rng.integers(5, 40, 5).tolist()
+    b = rng.integers(5, 40, 6).tolist()
+    c = rng.integers(1, 30, (5, 6)).tolist()
+    return a, b, c
+
+
+def cached(a: list, b: list, c: list) -> CachedSolution:
+    solution = solve(a, b, c)
+    return CachedSolution(solution.cost, solution.matrix, *solution.potentials)
+
+
+def test_permuted_problem_hits_cache():
+    a, b, c = problem(0)
+    cache = SolutionCache()
+    cache.put(a, b, c, cached(a, b, c))
+
+    rng = np.random.default_rng(1)
+    rows, columns = rng.permutation(len(a)).tolist(), rng.permutation(len(b)).tolist()
+    a2 = [a[i] for i in rows]
+    b2 = [b[j] for j in columns]
+    c2 = [[c[i][j] for j in columns] for i in rows]
+    hit = cache.get(a2, b2, c2)
+
+    assert hit is not None and (cache.hits, cache.misses) == (1, 0)
+    assert hit.cost == solve(a2, b2, c2).cost
+    # план из кэша переставлен под порядок запроса
+    plan = np.array([[amount or 0 for amount in row[1:]] for row in hit.matrix[1:]])
+    assert (plan[:len(a2), :len(b2)] * np.array(c2)).sum() == hit.cost
+    assert plan[:len(a2)].sum(axis=1).tolist() == a2
+
+
+def test_lru_evicts_least_recently_used():
+    problems = [problem(seed) for seed in range(3)]
+    solutions = [cached(*p) for p in problems]
+    sizes = []
+    for p, solution in zip(problems, solutions):
+        single = SolutionCache()
+        single.put(*p, solution)
+        sizes.append(single.size)
+
+    cache = SolutionCache(max_bytes=sum(sizes) - 1)
+    cache.put(*problems[0], solutions[0])
+    cache.put(*problems[1], solutions[1])
+    assert cache.get(*problems[0]) is not None
+    cache.put(*problems[2], solutions[2])
+
+    assert len(cache) == 2 and cache.size == sizes[0] + sizes[2]
+    assert cache.get(*problems[1]) is None
+    assert cache.get(*problems[0]) is not None and cache.get(*problems[2]) is not None
+    assert (cache.hits, cache.misses) == (3, 1)
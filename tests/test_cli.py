@@ -0,0 +1,41 @@
+import io
+import json
+
+from src.cli import main
+from src.cli import read_jsonl
+from src.cli import solve_problem
+
+
+def test_malformed_line_does_not_stop_batch(tmp_path):
+    source = tmp_path / 'problems.jsonl'
+    source.write_text(
+        '{"a": [10, 20], "b": [15, 15], "c": [[1, 2], [3, 1]]}\n'
+        '{"a": [1, \n'
+        '[1, 2]\n'
+        '{"a": [5], "b": [5], "c": [[2]]}\n',
+        encoding='utf-8'
+    )
+    output = tmp_path / 'results.jsonl'
+    code = main([str(source), '-o', str(output), '-w', '1'])
+    results = {result['id']: result for result in map(json.loads, output.read_text(encoding='utf-8').splitlines())}
+    assert code == 1
+    assert len(results) == 4
+    assert results[0]['cost'] == 40
+    assert 'error' in results[1] and 'error' in results[2]
+    assert results[3]['cost'] == 10
+
+
+def test_read_jsonl_keeps_line_numbers():
+    problems = list(read_jsonl(io.StringIO('not json\n\n{"a": [1], "b": [1], "c": [[1]]}\n')))
+    assert problems[0]['id'] == 0 and 'error' in problems[0]
+    assert problems[1]['id'] == 2
+
+
+def test_cache_hit_has_same_keys_as_miss(tmp_path):
+    problem = {'id': 1, 'a': [10, 20], 'b': [15, 15], 'c': [[1, 2], [3, 1]]}
+    options = {'cache': str(tmp_path)}
+    miss = solve_problem(problem, options)
+    hit = solve_problem(problem, options)
+    assert not miss['cached'] and hit['cached']
+    assert set(miss) == set(hit)
+    assert hit['cost'] == miss['cost'] and hit['plan'] == miss['plan']
@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+
+from src.model.transport_solution import find_components
+from src.model.transport_solution import solve
+from src.model.transport_solution import solve_decomposed
+
+
+def blocks(surplus: tuple[int, int]) -> tuple[list, list, list]:
+    # две независимые части (строки 0, 2, 4 - столбцы 1, 3; строки 1, 3 - столбцы 0, 2, 4)
+    rng = np.random.default_rng(2)
+    rows, columns = [[0, 2, 4], [1, 3]], [[1, 3], [0, 2, 4]]
+    a, b = [0] * 5, [0] * 5
+    c = [[None] * 5 for _ in range(5)]
+    for part, extra in enumerate(surplus):
+        for i in rows[part]:
+            a[i] = int(rng.integers(10, 40))
+            for j in columns[part]:
+                c[i][j] = int(rng.integers(1, 50))
+        total = sum(a[i] for i in rows[part]) - extra
+        for j in columns[part][:-1]:
+            b[j] = total // len(columns[part])
+        b[columns[part][-1]] = total - sum(b[j] for j in columns[part][:-1])
+    return a, b, c
+
+
+def test_find_components():
+    _, _, c = blocks((0, 0))
+    components = sorted(find_components(c), key=lambda component: component.rows)
+    assert [(component.rows, component.columns) for component in components] == [
+        ([0, 2, 4], [1, 3]), ([1, 3], [0, 2, 4])
+    ]
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+@pytest.mark.parametrize('surplus', [(0, 0), (5, 7)])
+def test_decomposed_matches_single_solve(surplus, workers):
+    a, b, c = blocks(surplus)
+    expected = solve(a, b, c)
+    solution = solve_decomposed(a, b, c, workers=workers)
+    assert solution.components == 2
+    assert solution.optimal and solution.feasible
+    assert solution.cost == expected.cost
+    plan = np.array(solution.plan(5, 5))
+    assert (plan.sum(axis=0) == b).all()
+    assert (plan.sum(axis=1) <= a).all()
+    forbidden = np.array([[cost is None for cost in row] for row in c])
+    assert (plan[forbidden] == 0).all()
+    costs = np.where(forbidden, 0, np.array(c, dtype=object)).astype(np.int64)
+    assert (plan * costs).sum() == expected.cost
+
+
+def test_opposite_imbalances_are_infeasible():
+    # избыток ресурсов одной части не покрывает недостаток другой
+    a, b, c = blocks((5, -5))
+    solution = solve_decomposed(a, b, c)
+    assert not solution.feasible
+    assert not solve(a, b, c).feasible
@@ -0,0 +1,30 @@
+from fractions import Fraction
+
+from src.model.transport_solution import TransportSolutionModel
+from src.model.transport_solution import solve
+
+
+A = [Fraction(1, 3), Fraction(2, 3)]
+B = [Fraction(1, 2), Fraction(1, 2)]
+C = [[Fraction(1, 3), 1], [Fraction(1, 2), Fraction(1, 7)]]
+
+
+def test_exact_mode_keeps_fractions():
+    solution = solve(A, B, C, exact=True)
+    # 1/3 * 1/3 + 1/6 * 1/2 + 1/2 * 1/7
+    assert solution.cost == Fraction(67, 252)
+    assert solution.optimal and solution.feasible
+    assert solution.plan(2, 2) == [[Fraction(1, 3), 0], [Fraction(1, 6), Fraction(1, 2)]]
+
+
+def test_model_exact_mode_is_opt_in():
+    table = [[None, '1/2', '1/2'], ['1/3', '1/3', '1'], ['2/3', '1/2', '1/7']]
+    model = TransportSolutionModel()
+    assert not model.exact
+    model.input_table = table
+    assert model.input_table[1][0] == 0.333
+
+    model.exact = True
+    model.input_table = table
+    assert model.input_table[1][0] == Fraction(1, 3)
+    assert model.solution[2][1:] == [Fraction(1, 6), Fraction(1, 2)]
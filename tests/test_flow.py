@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+
+from src.model.transport_solution import solve
+
+
+def random_problem(rows: int, columns: int, seed: int) -> tuple[list, list, list]:
+    rng = np.random.default_rng(seed)
+    a = (rng.random(rows) * 50).round(2).tolist()
+    b = (rng.random(columns) * 50).round(2).tolist()
+    c = (rng.random((rows, columns)) * 100).round(2).tolist()
+    return a, b, c
+
+
+@pytest.mark.parametrize('seed', range(10))
+def test_ssp_float_terminates(seed):
+    a = [12.4, 13.78, 2.08]
+    b = [10.74, 19.94, 11.26, 3.94, 1.05]
+    c = (np.random.default_rng(seed).random((3, 5)) * 10).tolist()
+    expected = solve(a, b, c)
+    solution = solve(a, b, c, engine='ssp')
+    assert solution.optimal
+    assert solution.engine == 'ssp'
+    assert solution.cost == pytest.approx(expected.cost)
+
+
+def test_auto_engine_float_at_threshold():
+    # 150 x 149 + фиктивный столбец = 300 узлов: порог выбора ssp для плотных таблиц
+    a, b, c = random_problem(150, 149, seed=1)
+    expected = solve(a, b, c, initial='vam')
+    solution = solve(a, b, c, engine='auto')
+    assert solution.engine == 'ssp'
+    assert solution.optimal
+    assert solution.cost == pytest.approx(expected.cost)
+
+
+@pytest.mark.parametrize('c', [
+    [[10 ** 17, 3 * 10 ** 17, 2], [5, 10 ** 17, 4 * 10 ** 17]],
+    [[1.5, 2.25, 3], [4.75, 1.125, 2]],
+])
+def test_cost_scaling_falls_back_to_simplex(c):
+    # переполнение int64 при масштабировании и дробные стоимости
+    a, b = [2, 3], [1, 2, 2]
+    solution = solve(a, b, c, engine='cost_scaling')
+    expected = solve(a, b, c, engine='simplex')
+    assert solution.engine == 'simplex'
+    assert solution.optimal
+    assert solution.cost == expected.cost
@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+
+from src.model.transport_solution import INITIAL_STRATEGIES
+from src.model.transport_solution import NetworkSimplex
+from src.model.transport_solution import Table
+from src.model.transport_solution import balance_table
+from src.model.transport_solution import calculate_minimal_cost
+from src.model.transport_solution import compare_initial_strategies
+from src.model.transport_solution import get_initial_strategy
+from src.model.transport_solution import remove_degenerate
+
+# Задачи с известной минимальной стоимостью (проверена линейным программированием)
+PROBLEMS = [
+    ([30, 40, 20], [20, 30, 30, 10], [[2, 3, 2, 4], [3, 2, 5, 1], [4, 3, 2, 6]], 170),
+    ([40, 40, 20], [20, 30, 30, 10], [[2, 3, 2, 4], [3, 2, 5, 1], [4, 3, 2, 6]], 170),
+    (
+        [50, 60, 50, 50], [30, 20, 70, 30, 60],
+        [[16, 16, 13, 22, 17], [14, 14, 13, 19, 15], [19, 19, 20, 23, 50], [50, 12, 50, 15, 11]],
+        3100,
+    ),
+]
+
+
+@pytest.mark.parametrize('strategy', INITIAL_STRATEGIES)
+@pytest.mark.parametrize('a, b, c, optimum', PROBLEMS)
+def test_initial_plan_is_feasible_basis(strategy, a, b, c, optimum):
+    table = Table(a, b, c)
+    balance_table(table)
+    get_initial_strategy(strategy)(table)
+    remove_degenerate(table)
+
+    amounts = np.where(table.basis, table.amounts, 0)
+    assert (amounts >= 0).all()
+    assert amounts.sum(axis=1).tolist() == table.resources
+    assert amounts.sum(axis=0).tolist() == table.needs
+    assert table.basic_count == table.rows + table.columns - 1
+    assert calculate_minimal_cost(table) >= optimum
+
+    simplex = NetworkSimplex(table)
+    assert simplex.run()
+    assert calculate_minimal_cost(table) == optimum
+
+
+@pytest.mark.parametrize('a, b, c, optimum', PROBLEMS)
+def test_compare_initial_strategies(a, b, c, optimum):
+    reports = compare_initial_strategies(a, b, c)
+    assert [report.strategy for report in reports] == list(INITIAL_STRATEGIES)
+    for report in reports:
+        assert report.optimal_cost == optimum
+        assert report.initial_cost >= optimum
@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+
+from src.model.transport_solution import solve
+from src.model.transport_solution.cache import SolutionCache
+from src.model.transport_solution.job import SolveJob
+
+
+def problem(seed: int = 0) -> tuple[list, list, list]:
+    rng = np.random.default_rng(seed)
+    a = rng.integers(5, 40, 6).tolist()
+    b = rng.integers(5, 40, 7).tolist()
+    c = rng.integers(1, 30, (6, 7)).tolist()
+    return a, b, c
+
+
+def job(a: list, b: list, c: list, **options) -> SolveJob:
+    return SolveJob(a, b, c, len(a) + 2, len(b) + 2, **options)
+
+
+@pytest.mark.parametrize('options', [
+    {},
+    {'initial': 'vam', 'pricing': 'block'},
+    {'engine': 'ssp'},
+    {'exact': True, 'profile': True},
+])
+def test_job_matches_solve(options):
+    a, b, c = problem()
+    result = job(a, b, c, **options).run()
+    expected = solve(a, b, c)
+    plan = np.array([[amount or 0 for amount in row[1:]] for row in result.solution[1:]])
+    assert (plan[:len(a), :len(b)] * np.array(c)).sum() == expected.cost
+    assert f"Fmin = {expected.cost}" in result.trace.render()
+
+
+def test_job_trace_pivots_and_progress():
+    a, b, c = problem(1)
+    reported = []
+    SolveJob.progress_interval = 0
+    try:
+        result = job(a, b, c, trace_level='full').run(progress=reported.append)
+    finally:
+        SolveJob.progress_interval = 0.1
+    assert reported == list(range(1, len(reported) + 1))
+    assert result.trace.render().count('Шаг') == len(reported)
+
+
+def test_job_cancelled():
+    a, b, c = problem(2)
+    assert job(a, b, c).run(cancelled=lambda: True) is None
+
+
+def test_job_cache_and_sensitivity(tmp_path):
+    a, b, c = problem(3)
+    cache = SolutionCache(path=str(tmp_path))
+    first = job(a, b, c, cache=cache, sensitivity=True).run()
+    assert first.sensitivity is not None
+    cached = job(a, b, c, cache=cache).run()
+    assert 'кэше' in cached.trace.render()
+    assert cached.solution == first.solution
+
+
+def test_job_infeasible_sparse():
+    result = job([5, 5], [5, 5], [[1, None], [None, None]]).run()
+    text = result.trace.render()
+    assert 'неразрешима' in text and 'Fmin = 5' in text
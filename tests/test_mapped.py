@@ -0,0 +1,26 @@
+import numpy as np
+import pytest
+
+from src.model.transport_solution import solve
+from src.model.transport_solution.mapped import MappedTable
+from src.model.transport_solution.table import Table
+from src.model.transport_solution.utils import lower_bound
+
+
+def test_mapped_table_matches_dense_table(tmp_path):
+    rng = np.random.default_rng(7)
+    a = rng.integers(5, 40, 9).tolist()
+    b = rng.integers(5, 40, 11).tolist()
+    costs = rng.integers(1, 60, (9, 11)).astype(np.int32)
+    np.save(tmp_path / 'costs.npy', costs)
+    mapped = MappedTable(a, b, np.load(tmp_path / 'costs.npy', mmap_mode='r'), block_cells=22)
+    dense = Table(a, b, costs.tolist())
+
+    assert mapped.deltas.dtype == np.int64
+    assert mapped.amounts.shape == dense.amounts.shape == (9, 11)
+    u, v = rng.integers(-5, 5, 9), rng.integers(-5, 5, 11)
+    assert lower_bound(mapped, u, v) == lower_bound(dense, u, v)
+
+    solution = solve(a, b, costs.tolist())
+    tree = solution.table.tree
+    assert lower_bound(solution.table, tree.u, tree.v) == pytest.approx(solution.cost)
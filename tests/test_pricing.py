@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+
+from src.model.transport_solution import NetworkSimplex
+from src.model.transport_solution import PRICING_RULES
+from src.model.transport_solution import Table
+from src.model.transport_solution import balance_table
+from src.model.transport_solution import calculate_minimal_cost
+from src.model.transport_solution import compare_pricing_rules
+from src.model.transport_solution import north_west_corner
+from src.model.transport_solution import remove_degenerate
+
+# Задачи с известной минимальной стоимостью (проверена линейным программированием);
+# последняя - задача о назначениях с вырожденными итерациями
+PROBLEMS = [
+    ([30, 40, 20], [20, 30, 30, 10], [[2, 3, 2, 4], [3, 2, 5, 1], [4, 3, 2, 6]], 170),
+    (
+        [50, 60, 50, 50], [30, 20, 70, 30, 60],
+        [[16, 16, 13, 22, 17], [14, 14, 13, 19, 15], [19, 19, 20, 23, 50], [50, 12, 50, 15, 11]],
+        3100,
+    ),
+    ([1] * 4, [1] * 4, [[9, 2, 7, 8], [6, 4, 3, 7], [5, 8, 1, 8], [7, 6, 9, 4]], 13),
+]
+
+
+@pytest.mark.parametrize('rule', PRICING_RULES)
+@pytest.mark.parametrize('a, b, c, optimum', PROBLEMS)
+def test_pricing_rule_reaches_optimum(rule, a, b, c, optimum):
+    table = Table(a, b, c)
+    balance_table(table)
+    north_west_corner(table)
+    remove_degenerate(table)
+
+    simplex = NetworkSimplex(table, pricing=rule)
+    assert simplex.run()
+    assert calculate_minimal_cost(table) == optimum
+    assert simplex.pivots == sum(simplex.pivot_counts.values())
+
+
+def test_compare_pricing_rules_on_random_problem():
+    rng = np.random.default_rng(7)
+    a = rng.integers(10, 50, 30).tolist()
+    b = rng.integers(10, 50, 25).tolist()
+    c = rng.integers(1, 100, (30, 25)).tolist()
+    reports = compare_pricing_rules(a, b, c)
+    assert [report.pricing for report in reports] == list(PRICING_RULES)
+    assert len({report.optimal_cost for report in reports}) == 1
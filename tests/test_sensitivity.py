@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+
+from src.model.transport_solution import solve
+
+
+def problem() -> tuple[list, list, list]:
+    rng = np.random.default_rng(5)
+    a = rng.integers(20, 60, 5).tolist()
+    b = rng.integers(10, 40, 6).tolist()
+    c = rng.integers(1, 50, (5, 6)).tolist()
+    return a, b, c
+
+
+def test_cost_ranges_keep_plan_optimal():
+    a, b, c = problem()
+    solution = solve(a, b, c)
+    plan = np.array(solution.plan(len(a), len(b)))
+    sensitivity = solution.sensitivity(len(a), len(b))
+    for i, row in enumerate(sensitivity.costs):
+        for j, ranged in enumerate(row):
+            assert ranged.cost == c[i][j]
+            # перевозящая клетка - базисная
+            assert ranged.basic or plan[i][j] == 0
+            for bound in (ranged.lower, ranged.upper):
+                if bound is None:
+                    continue
+                # на границе диапазона план остается оптимальным
+                changed = [list(line) for line in c]
+                changed[i][j] = bound
+                assert solve(a, b, changed).cost == pytest.approx((plan * np.array(changed)).sum())
+
+
+def test_rhs_ranges_price_cost_change():
+    a, b, c = problem()
+    assert sum(a) > sum(b)
+    solution = solve(a, b, c)
+    sensitivity = solution.sensitivity(len(a), len(b))
+    for i, ranged in enumerate(sensitivity.supply):
+        # партнер ресурса - фиктивный столбец: меняется только ресурс
+        assert ranged.partner == len(b)
+        for bound in (ranged.lower, ranged.upper):
+            if bound is None or bound < 0:
+                continue
+            changed = list(a)
+            changed[i] = bound
+            expected = solution.cost + ranged.price * (bound - ranged.value)
+            assert solve(changed, b, c).cost == pytest.approx(expected)
+    for j, ranged in enumerate(sensitivity.demand):
+        # партнер потребности - последняя строка: меняются обе величины
+        assert ranged.partner == len(a) - 1
+        for bound in (ranged.lower, ranged.upper):
+            if bound is None:
+                continue
+            t = bound - ranged.value
+            demand, supply = list(b), list(a)
+            demand[j] = bound
+            supply[-1] += t
+            if supply[-1] < 0:
+                continue
+            assert solve(supply, demand, c).cost == pytest.approx(solution.cost + ranged.price * t)
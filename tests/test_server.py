@@ -0,0 +1,61 @@
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from src.client import SolveClient
+from src.model.transport_solution import solve
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+@pytest.fixture
+def server(tmp_path):
+    path = tmp_path / 'solve.sock'
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'src.server', '--unix', str(path), '--workers', '1'],
+        cwd=ROOT, stderr=subprocess.DEVNULL
+    )
+    deadline = time.monotonic() + 30
+    while not path.exists():
+        assert process.poll() is None and time.monotonic() < deadline, 'сервер не запустился'
+        time.sleep(0.05)
+    yield f'unix:{path}'
+    process.terminate()
+    assert process.wait(timeout=30) == 0
+    assert not path.exists()
+
+
+def problems(count: int) -> list[dict]:
+    rng = np.random.default_rng(6)
+    result = []
+    for index in range(count):
+        c = rng.integers(1, 99, (6, 7)).tolist()
+        c[index % 6][index % 7] = None
+        result.append({
+            'id': index, 'a': rng.integers(1, 50, 6).tolist(), 'b': rng.integers(1, 50, 7).tolist(), 'c': c
+        })
+    return result
+
+
+def test_client_server_roundtrip(server):
+    batch = problems(20)
+    with SolveClient(server, timeout=60) as client:
+        single = client.solve(batch[0]['a'], batch[0]['b'], batch[0]['c'])
+        assert single['cost'] == solve(batch[0]['a'], batch[0]['b'], batch[0]['c']).cost
+
+        results = {result['id']: result for result in client.solve_many(batch, window=4)}
+        assert sorted(results) == list(range(20))
+        for problem in batch:
+            assert results[problem['id']]['cost'] == solve(problem['a'], problem['b'], problem['c']).cost
+
+        stats = client.stats()
+        assert stats['solved'] == 21 and stats['failed'] == 0
+
+        # ошибка в задаче возвращается в ответе, соединение остается открытым
+        failed = client.solve([1], [1, 2], [[1]])
+        assert 'error' in failed
+        assert client.solve([5], [5], [[2]])['cost'] == 10
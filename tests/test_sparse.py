@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+
+from src.model.transport_solution import solve
+
+
+def plan_cost(plan: list[list], c: list[list]) -> int | float:
+    return sum(
+        amount * cost
+        for plan_row, cost_row in zip(plan, c)
+        for amount, cost in zip(plan_row, cost_row)
+        if cost is not None
+    )
+
+
+@pytest.mark.parametrize('a, b, c', [
+    ([5, 5], [5, 5], [[1, None], [None, None]]),
+    ([4], [4], [[None]]),
+    ([10, 20, 5], [15, 15, 5], [[1, 2, None], [3, 1, None], [None, None, None]]),
+])
+def test_infeasible_cost_excludes_artificial_routes(a, b, c):
+    solution = solve(a, b, c)
+    plan = solution.plan(len(a), len(b))
+    assert not solution.feasible
+    assert solution.cost == plan_cost(plan, c)
+    assert solution.lower_bound <= solution.cost
+
+
+def test_feasible_sparse_cost_matches_plan():
+    rng = np.random.default_rng(5)
+    c = rng.integers(1, 50, (8, 7)).tolist()
+    for i in range(8):
+        c[i][i % 7] = None
+    a = rng.integers(5, 30, 8).tolist()
+    b = rng.integers(5, 30, 7).tolist()
+    solution = solve(a, b, c)
+    assert solution.feasible and solution.optimal
+    assert solution.cost == plan_cost(solution.plan(len(a), len(b)), c)
+
+
+def test_add_arcs_keeps_csr_order():
+    from src.model.transport_solution.sparse import SparseTable
+
+    table = SparseTable.from_csr([5, 5, 5], [5, 5, 5], [0, 1, 2, 3], [2, 0, 1], [4, 5, 6], dtype=np.float64)
+    assert table.costs.dtype == np.float64
+    table.set_basic(table.find(1, 0), 5)
+    cells = table.add_arcs(np.array([2, 0, 1]), np.array([0, 1, 2]), np.array([7, 8, 9]), artificial=True)
+    keys = table.arc_rows * table.columns + table.arc_columns
+    assert np.all(np.diff(keys) > 0)
+    assert [table.endpoints(cell) for cell in cells.tolist()] == [(2, 0), (0, 1), (1, 2)]
+    assert table.costs[cells].tolist() == [7, 8, 9] and table.artificial[cells].all()
+    assert table.get_amount(1, 0) == 5 and table.basic_count == 1
@@ -0,0 +1,77 @@
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+import pytest
+
+from src.model.transport_solution import solve
+from src.model.transport_solution.sweep import Scenario
+from src.model.transport_solution.sweep import ScenarioSweep
+
+
+def base_problem(forbidden: bool) -> tuple[list, list, list]:
+    rng = np.random.default_rng(3)
+    a = rng.integers(10, 60, 12).tolist()
+    b = rng.integers(10, 50, 10).tolist()
+    c = rng.integers(1, 100, (12, 10)).tolist()
+    if forbidden:
+        for i in range(12):
+            c[i][(i * 7) % 10] = None
+    return a, b, c
+
+
+def scenario_problem(a: list, b: list, c: list, scenario: Scenario) -> tuple[list, list, list]:
+    a, b = list(a), list(b)
+    c = [[cost * scenario.cost_multiplier if cost is not None else None for cost in row] for row in c]
+    for row, value in scenario.supply.items():
+        a[row] = value
+    for column, value in scenario.demand.items():
+        b[column] = value
+    for (row, column), value in scenario.costs.items():
+        c[row][column] = value
+    return a, b, c
+
+
+SCENARIOS = [
+    Scenario('fuel', cost_multiplier=1.15),
+    Scenario('supplier', supply={2: 0}),
+    Scenario('routes', costs={(1, 1): 1, (0, 1): None, (3, 4): 2.5}),
+    Scenario('demand', demand={4: 70}),
+]
+
+
+@pytest.mark.parametrize('forbidden', [False, True])
+def test_warm_scenarios_match_cold_solve(forbidden):
+    a, b, c = base_problem(forbidden)
+    with ScenarioSweep(a, b, c, plans=True) as sweep:
+        base_costs = sweep.base.table.costs.copy()
+        results = {result.name: result for result in sweep.run(SCENARIOS)}
+        # базовая таблица не изменяется сценариями
+        assert np.array_equal(sweep.base.table.costs, base_costs)
+
+    for scenario in SCENARIOS:
+        result = results[scenario.name]
+        expected = solve(*scenario_problem(a, b, c, scenario))
+        assert result.error is None
+        assert result.optimal and result.feasible == expected.feasible
+        assert result.cost == pytest.approx(expected.cost)
+    assert results['fuel'].warm
+    assert results['routes'].warm == forbidden
+
+
+def test_pool_scenarios_match_cold_solve_and_release_memory():
+    a, b, c = base_problem(True)
+    sweep = ScenarioSweep(a, b, c, workers=2)
+    with sweep:
+        results = {result.name: result for result in sweep.run(SCENARIOS, chunksize=1)}
+    # после close блоки разделяемой памяти удалены
+    for name, _, _ in sweep._specs.values():
+        with pytest.raises(FileNotFoundError):
+            SharedMemory(name=name)
+
+    for scenario in SCENARIOS:
+        result = results[scenario.name]
+        expected = solve(*scenario_problem(a, b, c, scenario))
+        assert result.error is None
+        assert result.optimal and result.feasible == expected.feasible
+        assert result.cost == pytest.approx(expected.cost)
+    assert sweep.summary.solved + sweep.summary.failed == len(SCENARIOS)
@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+from src.model.transport_solution import solve
+from src.model.transport_solution import warm_start
+
+
+def problem(forbidden: bool) -> tuple[list, list, list]:
+    rng = np.random.default_rng(4)
+    a = rng.integers(20, 60, 8).tolist()
+    b = rng.integers(10, 50, 9).tolist()
+    c = rng.integers(1, 100, (8, 9)).tolist()
+    if forbidden:
+        for i in range(8):
+            c[i][(i * 5) % 9] = None
+    return a, b, c
+
+
+def edited(a: list, b: list, c: list, edit: str) -> tuple[list, list, list]:
+    a, b, c = list(a), list(b), [list(row) for row in c]
+    if edit == 'cost':
+        c[2][3] = 1
+        c[5][1] = 150 if c[5][1] is not None else None
+    elif edit == 'supply':
+        # уменьшение ресурса: объемы по базису отрицательны, нужен двойственный метод
+        a[0] = 1
+        b[0] += 10
+    elif edit == 'unbalanced':
+        b = [value + 5 for value in b]
+    return a, b, c
+
+
+@pytest.mark.parametrize('forbidden', [False, True])
+@pytest.mark.parametrize('edit', ['cost', 'supply', 'unbalanced'])
+def test_warm_start_after_edit_matches_cold_solve(forbidden, edit):
+    a, b, c = problem(forbidden)
+    previous = solve(a, b, c)
+    before = previous.table.amounts.copy()
+    a2, b2, c2 = edited(a, b, c, edit)
+
+    expected = solve(a2, b2, c2)
+    solution = solve(a2, b2, c2, previous=previous)
+    assert solution.optimal and solution.feasible == expected.feasible
+    assert solution.cost == expected.cost
+    # предыдущее решение не изменяется
+    assert np.array_equal(previous.table.amounts, before)
+    if edit != 'unbalanced':
+        assert warm_start(previous.table, a2, b2, c2) is not None
+
+
+def test_warm_start_needs_same_routes():
+    a, b, c = problem(True)
+    previous = solve(a, b, c)
+    c2 = [list(row) for row in c]
+    c2[0][0] = None if c2[0][0] is not None else 7
+    assert warm_start(previous.table, a, b, c2) is None
+    assert solve(a, b, c2, previous=previous).cost == solve(a, b, c2).cost